@@ -2,7 +2,7 @@
 AI Engine admin configuration.
 """
 from django.contrib import admin
-from .models import Conversation
+from .models import Conversation, CachedAnswer
 
 
 @admin.register(Conversation)
@@ -15,9 +15,11 @@ class ConversationAdmin(admin.ModelAdmin):
         'question_preview',
         'ai_provider',
         'processing_time',
+        'cache_status',
+        'status',
         'created_at'
     ]
-    list_filter = ['ai_provider', 'created_at']
+    list_filter = ['ai_provider', 'cache_status', 'status', 'created_at']
     search_fields = ['question', 'user__email']
     readonly_fields = ['created_at', 'processing_time']
     ordering = ['-created_at']
@@ -32,4 +34,15 @@ class ConversationAdmin(admin.ModelAdmin):
         """Show question preview."""
         return obj.question[:100] + '...' if len(obj.question) > 100 else obj.question
     
-    question_preview.short_description = 'Question'
\ No newline at end of file
+    question_preview.short_description = 'Question'
+
+
+@admin.register(CachedAnswer)
+class CachedAnswerAdmin(admin.ModelAdmin):
+    """Admin for CachedAnswer model."""
+    
+    list_display = ['normalized_question', 'model', 'prompt_version', 'hits', 'last_used_at', 'expires_at']
+    list_filter = ['model', 'prompt_version']
+    search_fields = ['normalized_question']
+    readonly_fields = ['key', 'hits', 'created_at', 'last_used_at']
+    ordering = ['-last_used_at']
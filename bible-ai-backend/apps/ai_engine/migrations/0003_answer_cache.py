@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0002_conversation_user_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='cache_status',
+            field=models.CharField(choices=[('hit', 'Réponse en cache'), ('miss', 'Réponse générée'), ('disabled', 'Cache désactivé')], default='disabled', max_length=10, verbose_name='cache des réponses'),
+        ),
+        migrations.CreateModel(
+            name='CachedAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True, verbose_name='clé')),
+                ('normalized_question', models.TextField(verbose_name='question normalisée')),
+                ('model', models.CharField(max_length=100, verbose_name='modèle')),
+                ('prompt_version', models.CharField(max_length=20, verbose_name='version du prompt')),
+                ('ai_provider', models.CharField(max_length=20, verbose_name='fournisseur IA')),
+                ('response', models.JSONField(verbose_name='réponse')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='réutilisations')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='date de création')),
+                ('last_used_at', models.DateTimeField(verbose_name='dernière utilisation')),
+                ('expires_at', models.DateTimeField(verbose_name="date d'expiration")),
+            ],
+            options={
+                'verbose_name': 'réponse en cache',
+                'verbose_name_plural': 'réponses en cache',
+                'ordering': ['-last_used_at'],
+                'indexes': [models.Index(fields=['last_used_at'], name='ai_answer_lru_idx'), models.Index(fields=['expires_at'], name='ai_answer_expiry_idx')],
+            },
+        ),
+    ]
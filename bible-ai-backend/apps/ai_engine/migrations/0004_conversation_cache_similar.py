@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0003_answer_cache'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='conversation',
+            name='cache_status',
+            field=models.CharField(choices=[('hit', 'Réponse en cache'), ('similar', "Réponse d'une question proche"), ('miss', 'Réponse générée'), ('disabled', 'Cache désactivé')], default='disabled', max_length=10, verbose_name='cache des réponses'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0004_conversation_cache_similar'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='conversation',
+            name='cache_status',
+            field=models.CharField(choices=[('hit', 'Réponse en cache'), ('similar', "Réponse d'une question proche"), ('miss', 'Réponse générée'), ('shared', 'Réponse générée pour une requête simultanée'), ('disabled', 'Cache désactivé')], default='disabled', max_length=10, verbose_name='cache des réponses'),
+        ),
+    ]
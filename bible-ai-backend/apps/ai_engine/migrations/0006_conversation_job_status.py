@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_engine', '0005_conversation_cache_shared'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='error',
+            field=models.TextField(blank=True, default='', verbose_name='erreur'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='status',
+            field=models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('done', 'Terminée'), ('failed', 'Échouée')], default='done', max_length=10, verbose_name='statut'),
+        ),
+        migrations.AlterField(
+            model_name='conversation',
+            name='response',
+            field=models.JSONField(blank=True, null=True, verbose_name='réponse'),
+        ),
+    ]
@@ -8,6 +8,30 @@ from django.conf import settings
 class Conversation(models.Model):
     """Conversation history with AI."""
     
+    CACHE_HIT = 'hit'
+    CACHE_SIMILAR = 'similar'
+    CACHE_MISS = 'miss'
+    CACHE_SHARED = 'shared'
+    CACHE_DISABLED = 'disabled'
+    CACHE_STATUS_CHOICES = [
+        (CACHE_HIT, 'Réponse en cache'),
+        (CACHE_SIMILAR, "Réponse d'une question proche"),
+        (CACHE_MISS, 'Réponse générée'),
+        (CACHE_SHARED, 'Réponse générée pour une requête simultanée'),
+        (CACHE_DISABLED, 'Cache désactivé'),
+    ]
+    
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'En attente'),
+        (STATUS_RUNNING, 'En cours'),
+        (STATUS_DONE, 'Terminée'),
+        (STATUS_FAILED, 'Échouée'),
+    ]
+    
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -18,11 +42,20 @@ class Conversation(models.Model):
     )
     
     question = models.TextField('question')
-    response = models.JSONField('réponse')
+    # Vide tant qu'une question asynchrone n'a pas de réponse
+    response = models.JSONField('réponse', null=True, blank=True)
+    status = models.CharField('statut', max_length=10, choices=STATUS_CHOICES, default=STATUS_DONE)
+    error = models.TextField('erreur', blank=True, default='')
     
     # Metadata
     ai_provider = models.CharField('fournisseur IA', max_length=20, default='anthropic')
     processing_time = models.FloatField('temps de traitement (s)', null=True, blank=True)
+    cache_status = models.CharField(
+        'cache des réponses',
+        max_length=10,
+        choices=CACHE_STATUS_CHOICES,
+        default=CACHE_DISABLED
+    )
     
     created_at = models.DateTimeField('date de création', auto_now_add=True)
     
@@ -30,7 +63,44 @@ class Conversation(models.Model):
         verbose_name = 'conversation'
         verbose_name_plural = 'conversations'
         ordering = ['-created_at']
+        indexes = [
+            # Historique par utilisateur, paginé par curseur (created_at, id)
+            models.Index(fields=['user', '-created_at', '-id'], name='ai_conversation_user_idx'),
+        ]
     
     def __str__(self):
         user_info = f"User {self.user.email}" if self.user else "Anonymous"
-        return f"{user_info} - {self.question[:50]}..."
\ No newline at end of file
+        return f"{user_info} - {self.question[:50]}..."
+
+
+class CachedAnswer(models.Model):
+    """
+    AI answer reused for the same normalized question.
+    
+    `key` hashes the normalized question with the model and the prompt
+    version, so changing either stops serving older answers.
+    """
+    
+    key = models.CharField('clé', max_length=64, unique=True)
+    normalized_question = models.TextField('question normalisée')
+    model = models.CharField('modèle', max_length=100)
+    prompt_version = models.CharField('version du prompt', max_length=20)
+    ai_provider = models.CharField('fournisseur IA', max_length=20)
+    response = models.JSONField('réponse')
+    
+    hits = models.PositiveIntegerField('réutilisations', default=0)
+    created_at = models.DateTimeField('date de création', auto_now_add=True)
+    last_used_at = models.DateTimeField('dernière utilisation')
+    expires_at = models.DateTimeField("date d'expiration")
+    
+    class Meta:
+        verbose_name = 'réponse en cache'
+        verbose_name_plural = 'réponses en cache'
+        ordering = ['-last_used_at']
+        indexes = [
+            models.Index(fields=['last_used_at'], name='ai_answer_lru_idx'),
+            models.Index(fields=['expires_at'], name='ai_answer_expiry_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.normalized_question[:50]} ({self.model})"
@@ -0,0 +1,17 @@
+"""
+AI Engine pagination classes.
+"""
+from datetime import datetime
+
+from apps.bible.pagination import KeysetPagination, PageOrKeysetPagination
+
+
+class ConversationKeysetPagination(KeysetPagination):
+    """Keyset pagination on the history, most recent first."""
+    
+    ordering = ('-created_at', '-id')
+    ordering_types = (datetime, int)
+
+
+class ConversationPagination(PageOrKeysetPagination):
+    keyset_class = ConversationKeysetPagination
@@ -0,0 +1,32 @@
+"""
+Server-Sent Events for the streamed AI answers.
+
+Each event is an `event:` line and a single `data:` line holding compact
+JSON (newlines inside strings are escaped by the encoder, so the data never
+spans several lines).
+"""
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+def sse_event(event: str, data) -> bytes:
+    """Frame `data` as the Server-Sent Event `event`."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f"event: {event}\ndata: {payload}\n\n".encode('utf-8')
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Negotiates `text/event-stream`. Streamed answers bypass it
+    (`StreamingHttpResponse`); the other responses of the endpoint, such as
+    validation errors, are rendered as a single `error` event.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return sse_event('error', data)
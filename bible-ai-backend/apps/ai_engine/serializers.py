@@ -50,6 +50,9 @@ class ConversationSerializer(serializers.ModelSerializer):
             'response',
             'ai_provider',
             'processing_time',
+            'cache_status',
+            'status',
+            'error',
             'created_at',
         ]
         read_only_fields = ['id', 'created_at']
\ No newline at end of file
@@ -1,5 +1,33 @@
 # AI services
 from .ai_client import AIClient
 from .response_formatter import ResponseFormatter
+from .response_stream import STREAMED_FIELDS, ResponseStreamParser
+from .answer_cache import answer_cache_enabled, answer_key, get_cached_answer, get_similar_answer, store_answer
+from .answer_index import similarity_enabled
+from .single_flight import SingleFlightError, SingleFlightTimeout, single_flight, single_flight_enabled
+from .answering import generate_answer, lookup_answer
+from .jobs import UNFINISHED_JOB_STATUSES, JobQueueFull, expire_stale_jobs, queue_depth, submit_question
 
-__all__ = ['AIClient', 'ResponseFormatter']
\ No newline at end of file
+__all__ = [
+    'AIClient',
+    'JobQueueFull',
+    'ResponseFormatter',
+    'ResponseStreamParser',
+    'STREAMED_FIELDS',
+    'UNFINISHED_JOB_STATUSES',
+    'SingleFlightError',
+    'SingleFlightTimeout',
+    'answer_cache_enabled',
+    'answer_key',
+    'expire_stale_jobs',
+    'generate_answer',
+    'get_cached_answer',
+    'get_similar_answer',
+    'lookup_answer',
+    'queue_depth',
+    'similarity_enabled',
+    'single_flight',
+    'single_flight_enabled',
+    'store_answer',
+    'submit_question',
+]
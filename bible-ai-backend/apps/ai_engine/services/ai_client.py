@@ -1,6 +1,7 @@
 """
 AI Client for interacting with external AI APIs (Gemini/Anthropic/OpenAI).
 """
+import hashlib
 import logging
 import json
 from django.conf import settings
@@ -46,6 +47,18 @@ FORMAT DE RÉPONSE (JSON strict) :
 
 Réponds UNIQUEMENT en JSON, sans texte avant ou après."""
     
+    @classmethod
+    def prompt_version(cls) -> str:
+        """Short digest of the system prompt: changes whenever it is edited."""
+        return hashlib.sha256(cls.SYSTEM_PROMPT.encode()).hexdigest()[:12]
+    
+    @staticmethod
+    def configured_model() -> str:
+        """Provider and model that will answer, known without an API key."""
+        if settings.AI_PROVIDER == 'gemini':
+            return f"gemini:{settings.AI_MODEL_GEMINI}"
+        return settings.AI_PROVIDER
+    
     def __init__(self):
         """Initialize AI client based on provider."""
         self.provider = settings.AI_PROVIDER
@@ -79,43 +92,79 @@ Réponds UNIQUEMENT en JSON, sans texte avant ou après."""
             logger.error(f"Error getting AI response: {str(e)}")
             raise
     
-    def _get_gemini_response(self, question: str) -> dict:
-        """Get response from Google Gemini API."""
-        try:
-            # Construire le prompt complet
-            full_prompt = f"{self.SYSTEM_PROMPT}\n\nQuestion de l'utilisateur: {question}"
-            
-            # Appeler Gemini avec la nouvelle API
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=full_prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.7,
-                    top_p=0.95,
-                    max_output_tokens=2048,
-                    response_mime_type="application/json"  # Force la réponse en JSON
-                )
-            )
-            
-            # Extract JSON response
-            response_text = response.text.strip()
-            
-            # Nettoyer le texte (enlever les markdown blocks si présents)
-            if response_text.startswith('```json'):
-                response_text = response_text.replace('```json', '').replace('```', '').strip()
-            elif response_text.startswith('```'):
-                response_text = response_text.replace('```', '').strip()
-            
-            # Parse JSON
-            response_data = json.loads(response_text)
+    def stream_biblical_response(self, question: str):
+        """
+        Stream the AI response for a biblical question.
+        
+        Args:
+            question: User's question
             
-            return response_data
+        Yields:
+            str: Raw text chunks of the JSON answer, as the model generates them
+                 (see `ResponseStreamParser` and `parse_response_text`)
+        """
+        try:
+            if self.provider == 'gemini':
+                yield from self._stream_gemini_response(question)
+        
+        except Exception as e:
+            logger.error(f"Error streaming AI response: {str(e)}")
+            raise
+    
+    @staticmethod
+    def parse_response_text(response_text: str) -> dict:
+        """Parse the model's JSON answer, markdown code fences removed."""
+        response_text = response_text.strip()
+        
+        # Nettoyer le texte (enlever les markdown blocks si présents)
+        if response_text.startswith('```json'):
+            response_text = response_text.replace('```json', '').replace('```', '').strip()
+        elif response_text.startswith('```'):
+            response_text = response_text.replace('```', '').strip()
         
+        try:
+            return json.loads(response_text)
         except json.JSONDecodeError as e:
             logger.error(f"Gemini JSON parse error: {str(e)}")
             logger.error(f"Response text: {response_text}")
             raise ValueError(f"Invalid JSON response from Gemini: {str(e)}")
+    
+    def _gemini_request(self, question: str) -> dict:
+        """Arguments of a Gemini generation call for `question`."""
+        # Construire le prompt complet
+        full_prompt = f"{self.SYSTEM_PROMPT}\n\nQuestion de l'utilisateur: {question}"
+        
+        return {
+            'model': self.model_name,
+            'contents': full_prompt,
+            'config': types.GenerateContentConfig(
+                temperature=0.7,
+                top_p=0.95,
+                max_output_tokens=2048,
+                response_mime_type="application/json"  # Force la réponse en JSON
+            ),
+        }
+    
+    def _get_gemini_response(self, question: str) -> dict:
+        """Get response from Google Gemini API."""
+        try:
+            # Appeler Gemini avec la nouvelle API
+            response = self.client.models.generate_content(**self._gemini_request(question))
+            
+            # Extract and parse JSON response
+            return self.parse_response_text(response.text)
         
         except Exception as e:
             logger.error(f"Gemini API error: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    def _stream_gemini_response(self, question: str):
+        """Yield the text chunks of a streamed Google Gemini response."""
+        try:
+            for chunk in self.client.models.generate_content_stream(**self._gemini_request(question)):
+                if chunk.text:
+                    yield chunk.text
+        
+        except Exception as e:
+            logger.error(f"Gemini API streaming error: {str(e)}")
+            raise
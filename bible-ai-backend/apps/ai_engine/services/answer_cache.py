@@ -0,0 +1,118 @@
+"""
+Persistent cache of AI answers.
+
+Questions are normalized (case, accents, punctuation and whitespace folded)
+so that "Que dit la Bible sur le pardon ?" and "que dit la bible sur le
+pardon" share one answer. The cache key also covers the model and the
+prompt version: switching model or editing the prompt starts afresh.
+
+Entries live `AI_ANSWER_CACHE_TTL` seconds; beyond
+`AI_ANSWER_CACHE_MAX_ENTRIES`, the least recently served are evicted.
+
+On an exact miss, `get_similar_answer` looks for a paraphrase in the
+similarity index of `answer_index`.
+"""
+import hashlib
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from apps.ai_engine.models import CachedAnswer
+from apps.bible.services.search import fold
+from .ai_client import AIClient
+from .answer_index import get_question_index, invalidate_question_index
+
+NON_WORD = re.compile(r'[\W_]+')
+
+
+def answer_cache_enabled() -> bool:
+    return getattr(settings, 'AI_ANSWER_CACHE', True)
+
+
+def normalize_question(question: str) -> str:
+    """Fold a question for comparison: "Le pardon ?!" -> "le pardon"."""
+    return NON_WORD.sub(' ', fold(question)).strip()
+
+
+def answer_key(question: str) -> tuple:
+    """Return `(key, normalized_question)` for the configured model and prompt."""
+    normalized = normalize_question(question)
+    raw = '\x1f'.join((normalized, AIClient.configured_model(), AIClient.prompt_version()))
+    return hashlib.sha256(raw.encode()).hexdigest(), normalized
+
+
+def get_cached_answer(question: str):
+    """
+    Return the cached `{'id', 'response', 'ai_provider'}` for `question`, or
+    None. A hit refreshes the entry's LRU position.
+    """
+    key, _ = answer_key(question)
+    return _serve(CachedAnswer.objects.filter(key=key))
+
+
+def get_similar_answer(question: str, threshold: float = None):
+    """
+    Return the cached `{'id', 'response', 'ai_provider', 'similarity'}` of
+    the closest previously answered question, if its similarity reaches
+    `threshold` (default `AI_ANSWER_SIMILARITY_THRESHOLD`), or None.
+    """
+    if threshold is None:
+        threshold = settings.AI_ANSWER_SIMILARITY_THRESHOLD
+
+    match = get_question_index().nearest(normalize_question(question))
+    if match is None or match[1] < threshold:
+        return None
+
+    entry_id, similarity = match
+    entry = _serve(CachedAnswer.objects.filter(pk=entry_id))
+    if entry is not None:
+        entry['similarity'] = similarity
+    return entry
+
+
+def _serve(queryset):
+    """Fetch the unexpired entry of `queryset` and refresh its LRU position."""
+    now = timezone.now()
+    entry = queryset.filter(expires_at__gt=now).values('id', 'response', 'ai_provider').first()
+    if entry is None:
+        return None
+
+    CachedAnswer.objects.filter(pk=entry['id']).update(hits=F('hits') + 1, last_used_at=now)
+    return entry
+
+
+def store_answer(question: str, response: dict, ai_provider: str) -> CachedAnswer:
+    """Cache a validated AI `response` for `question`, then evict stale entries."""
+    key, normalized = answer_key(question)
+    now = timezone.now()
+    entry, _ = CachedAnswer.objects.update_or_create(
+        key=key,
+        defaults={
+            'normalized_question': normalized,
+            'model': AIClient.configured_model(),
+            'prompt_version': AIClient.prompt_version(),
+            'ai_provider': ai_provider,
+            'response': response,
+            'hits': 0,
+            'last_used_at': now,
+            'expires_at': now + timedelta(seconds=settings.AI_ANSWER_CACHE_TTL),
+        },
+    )
+    evict_answers(now)
+    invalidate_question_index()
+    return entry
+
+
+def evict_answers(now=None) -> int:
+    """Delete expired entries and the least recently used ones over the limit."""
+    now = now or timezone.now()
+    deleted, _ = CachedAnswer.objects.filter(expires_at__lte=now).delete()
+
+    limit = settings.AI_ANSWER_CACHE_MAX_ENTRIES
+    stale = list(CachedAnswer.objects.order_by('-last_used_at').values_list('pk', flat=True)[limit:])
+    if stale:
+        deleted += CachedAnswer.objects.filter(pk__in=stale).delete()[0]
+    return deleted
@@ -0,0 +1,190 @@
+"""
+Similarity index over the questions of the AI answer cache.
+
+Exact-key caching misses paraphrases ("comment pardonner" / "comment
+puis-je pardonner ?"). Each cached question is turned into a TF-IDF vector
+of character trigrams of its words, L2-normalised. Articles and pronouns
+are dropped, but interrogatives and negations are kept: they change the
+question, so two questions only match when they use the same ones ("où est
+né Jésus" never reuses "qui est Jésus ?", nor a negated question its
+positive form). Vectors are stored
+column-wise as NumPy posting lists (trigram -> cached questions, weights),
+so a lookup only touches the trigrams of the question and costs a
+`bincount` over their postings: well under a millisecond for a few
+thousand questions.
+
+Each worker builds its index on first use and rebuilds it when the cache
+content changed, checked at most every
+`AI_ANSWER_SIMILARITY_REFRESH_SECONDS`.
+"""
+import math
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from apps.ai_engine.models import CachedAnswer
+from apps.bible.services.search import APOSTROPHES, STOP_WORDS, TOKEN_RE, fold
+from .ai_client import AIClient
+
+NGRAM = 3
+
+# Mots qui changent le sens d'une question : gardés et comparés tels quels
+# ("né" se replie en "ne" et compte donc aussi)
+QUESTION_WORDS = frozenset("""
+combien comment laquelle lequel lesquelles lesquels ou pourquoi quand que quel
+quelle quelles quels qui quoi
+""".split())
+NEGATIONS = frozenset("aucun aucune jamais n ne ni nul nulle pas personne rien sans".split())
+GUARD_WORDS = QUESTION_WORDS | NEGATIONS
+QUESTION_STOP_WORDS = STOP_WORDS - GUARD_WORDS
+
+
+def similarity_enabled() -> bool:
+    return getattr(settings, 'AI_ANSWER_SIMILARITY', True)
+
+
+def question_tokens(question: str) -> list:
+    """Words of a question, articles and pronouns dropped: "Où est-il né ?" -> ["ou", "est", "ne"]."""
+    text = APOSTROPHES.sub(' ', fold(question))
+    return [token for token in TOKEN_RE.findall(text) if token not in QUESTION_STOP_WORDS]
+
+
+def question_guard(tokens) -> frozenset:
+    """Interrogatives and negations of a question, which a match must share."""
+    return frozenset(GUARD_WORDS.intersection(tokens))
+
+
+def question_ngrams(tokens) -> Counter:
+    """Character trigrams of question words: ["pardon"] -> {" pa", "par", ...}."""
+    grams = Counter()
+    for token in tokens:
+        padded = f' {token} '
+        grams.update(padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1))
+    return grams
+
+
+class QuestionIndex:
+    """TF-IDF trigram vectors of cached questions, queried by cosine similarity."""
+
+    def __init__(self, entries):
+        """`entries` are `(cached_answer_id, normalized_question)` pairs."""
+        self.ids = []
+        self.vocabulary = {}
+        # Groupe de chaque question selon ses mots interrogatifs et négations
+        self.guards = {}
+        doc_guards = []
+        docs, grams, counts = [], [], []
+        for doc, (entry_id, question) in enumerate(entries):
+            self.ids.append(entry_id)
+            tokens = question_tokens(question)
+            doc_guards.append(self.guards.setdefault(question_guard(tokens), len(self.guards)))
+            for gram, count in question_ngrams(tokens).items():
+                docs.append(doc)
+                grams.append(self.vocabulary.setdefault(gram, len(self.vocabulary)))
+                counts.append(count)
+
+        size = len(self.ids)
+        self.doc_guards = np.asarray(doc_guards, dtype=np.int32)
+        docs = np.asarray(docs, dtype=np.int32)
+        grams = np.asarray(grams, dtype=np.int32)
+        counts = np.asarray(counts, dtype=np.float32)
+
+        # IDF lissé : un trigramme inconnu vaut log(1 + N) + 1
+        df = np.bincount(grams, minlength=len(self.vocabulary))
+        self.idf = (np.log((1 + size) / (1 + df)) + 1).astype(np.float32)
+        self.unseen_idf = math.log(1 + size) + 1
+
+        weights = (1 + np.log(counts)) * self.idf[grams]
+        norms = np.sqrt(np.bincount(docs, weights=weights * weights, minlength=size))
+        weights /= np.maximum(norms, 1e-12)[docs]
+
+        # Listes de postings par trigramme (format CSR)
+        order = np.argsort(grams, kind='stable')
+        self.posting_docs = docs[order]
+        self.posting_weights = weights[order].astype(np.float32)
+        self.indptr = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def nearest(self, question: str):
+        """
+        Return `(cached_answer_id, similarity)` of the closest question with
+        the same interrogatives and negations, or None.
+        """
+        tokens = question_tokens(question)
+        guard = self.guards.get(question_guard(tokens))
+        if guard is None:
+            return None
+
+        docs, weights = [], []
+        norm = 0.0
+        for gram, count in question_ngrams(tokens).items():
+            idx = self.vocabulary.get(gram)
+            weight = (1 + math.log(count)) * (self.unseen_idf if idx is None else float(self.idf[idx]))
+            norm += weight * weight
+            if idx is not None:
+                start, end = self.indptr[idx], self.indptr[idx + 1]
+                docs.append(self.posting_docs[start:end])
+                weights.append(self.posting_weights[start:end] * weight)
+        if not docs:
+            return None
+
+        scores = np.bincount(np.concatenate(docs), weights=np.concatenate(weights), minlength=len(self.ids))
+        scores[self.doc_guards != guard] = 0
+        best = int(scores.argmax())
+        return self.ids[best], float(scores[best]) / math.sqrt(norm)
+
+
+_index = None
+# (modèle, version du prompt, nombre d'entrées, dernier id) à la construction
+_index_state = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _cache_state() -> tuple:
+    model, prompt_version = AIClient.configured_model(), AIClient.prompt_version()
+    state = CachedAnswer.objects.filter(model=model, prompt_version=prompt_version).aggregate(
+        count=Count('id'), last=Max('id')
+    )
+    return model, prompt_version, state['count'], state['last']
+
+
+def get_question_index() -> QuestionIndex:
+    """
+    Return this worker's index, rebuilt when an answer was added or evicted
+    since it was built (checked at most every `AI_ANSWER_SIMILARITY_REFRESH_SECONDS`).
+    """
+    global _index, _index_state, _checked_at
+
+    interval = getattr(settings, 'AI_ANSWER_SIMILARITY_REFRESH_SECONDS', 30)
+    if _index is not None and time.monotonic() - _checked_at < interval:
+        return _index
+
+    with _lock:
+        if _index is not None and time.monotonic() - _checked_at < interval:
+            return _index
+        state = _cache_state()
+        if _index is None or state != _index_state:
+            model, prompt_version, _, _ = state
+            _index = QuestionIndex(
+                CachedAnswer.objects.filter(
+                    model=model, prompt_version=prompt_version, expires_at__gt=timezone.now()
+                ).values_list('id', 'normalized_question').iterator(chunk_size=2000)
+            )
+            _index_state = state
+        _checked_at = time.monotonic()
+        return _index
+
+
+def invalidate_question_index():
+    """Force a state check on the next lookup (after storing an answer in this worker)."""
+    global _checked_at
+    _checked_at = 0.0
+
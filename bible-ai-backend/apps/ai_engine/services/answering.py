@@ -0,0 +1,60 @@
+"""
+Answering a question: the cache first, then one (coalesced) model call.
+
+Shared by the synchronous, streamed and asynchronous (job) endpoints.
+"""
+from apps.ai_engine.models import Conversation
+from .ai_client import AIClient
+from .answer_cache import answer_cache_enabled, answer_key, get_cached_answer, get_similar_answer, store_answer
+from .answer_index import similarity_enabled
+from .response_formatter import ResponseFormatter
+from .single_flight import single_flight, single_flight_enabled
+
+
+def lookup_answer(question: str):
+    """
+    Return `(cached, cache_status)`: the cached `{'response', 'ai_provider'}`
+    for `question` (exact or similar, with its `similarity`) or None.
+    """
+    cached = None
+    cache_status = Conversation.CACHE_DISABLED
+
+    # Réponse déjà connue : servie sans instancier le client IA
+    if answer_cache_enabled():
+        cached = get_cached_answer(question)
+        cache_status = Conversation.CACHE_HIT if cached else Conversation.CACHE_MISS
+        # Sinon, la réponse d'une question formulée autrement
+        if cached is None and similarity_enabled():
+            cached = get_similar_answer(question)
+            if cached is not None:
+                cache_status = Conversation.CACHE_SIMILAR
+
+    return cached, cache_status
+
+
+def generate_answer(question: str, cache_status: str):
+    """
+    Ask the model, once for all concurrent identical questions.
+
+    Returns `({'response', 'ai_provider'}, cache_status)`, the status being
+    `shared` when another request made the call. A validated answer is
+    cached when `cache_status` is a miss.
+    """
+    def generate():
+        ai_client = AIClient()
+        ai_response = ai_client.get_biblical_response(question)
+
+        if not ResponseFormatter.validate_response(ai_response):
+            raise ValueError("Invalid AI response format")
+
+        if cache_status == Conversation.CACHE_MISS:
+            store_answer(question, ai_response, ai_client.provider)
+        return {'response': ai_response, 'ai_provider': ai_client.provider}
+
+    # Questions identiques en cours : un seul appel, partagé
+    if single_flight_enabled():
+        generated, shared = single_flight(answer_key(question)[0], generate)
+        if shared:
+            cache_status = Conversation.CACHE_SHARED
+        return generated, cache_status
+    return generate(), cache_status
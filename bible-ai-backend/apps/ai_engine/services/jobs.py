@@ -0,0 +1,150 @@
+"""
+Asynchronous AI questions, run by a bounded pool of threads.
+
+`submit_question` records the question as a pending `Conversation` and
+returns at once; a thread of this process's pool makes the model call
+(`generate_answer`) and stores the answer, or the error, on the
+conversation. Clients poll the job (the conversation's `status`).
+
+No broker is involved: each web worker has its own pool of
+`AI_JOB_WORKERS` threads and accepts at most `AI_JOB_QUEUE_SIZE` unfinished
+jobs, beyond which `JobQueueFull` is raised. Jobs lost with their process
+(restart, crash) are marked failed once older than `AI_JOB_TIMEOUT`.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from apps.ai_engine.models import Conversation
+from .answering import generate_answer, lookup_answer
+from .response_formatter import ResponseFormatter
+
+logger = logging.getLogger(__name__)
+
+UNFINISHED_JOB_STATUSES = (Conversation.STATUS_PENDING, Conversation.STATUS_RUNNING)
+
+_executor = None
+_unfinished = 0
+_lock = threading.Lock()
+
+
+class JobQueueFull(Exception):
+    """Raised when this process already holds `AI_JOB_QUEUE_SIZE` unfinished jobs."""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Créé au premier usage, donc après le fork des workers gunicorn
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.AI_JOB_WORKERS,
+                thread_name_prefix='ai-job'
+            )
+        return _executor
+
+
+def queue_depth() -> int:
+    """Unfinished jobs of this process (queued or running)."""
+    return _unfinished
+
+
+def submit_question(question: str, user) -> Conversation:
+    """
+    Create the conversation of `question` and schedule its answer.
+
+    A cached answer completes the job at once, without using the pool.
+    """
+    start_time = time.time()
+
+    cached, cache_status = lookup_answer(question)
+    if cached is not None:
+        return Conversation.objects.create(
+            user=user,
+            question=question,
+            response=ResponseFormatter.format_response(cached['response'], question),
+            ai_provider=cached['ai_provider'],
+            processing_time=time.time() - start_time,
+            cache_status=cache_status,
+            status=Conversation.STATUS_DONE
+        )
+
+    if queue_depth() >= settings.AI_JOB_QUEUE_SIZE:
+        raise JobQueueFull(
+            f"Trop de questions en attente ({settings.AI_JOB_QUEUE_SIZE}), réessayez dans quelques instants."
+        )
+
+    conversation = Conversation.objects.create(
+        user=user,
+        question=question,
+        response=None,
+        ai_provider=settings.AI_PROVIDER,
+        cache_status=cache_status,
+        status=Conversation.STATUS_PENDING
+    )
+    # La tâche n'est comptée et lancée qu'une fois la conversation enregistrée :
+    # après un rollback, rien n'est réservé
+    transaction.on_commit(lambda: _schedule(conversation.pk, question, cache_status))
+    return conversation
+
+
+def _schedule(conversation_id: int, question: str, cache_status: str):
+    global _unfinished
+    with _lock:
+        _unfinished += 1
+    try:
+        _get_executor().submit(_run_job, conversation_id, question, cache_status)
+    except Exception:
+        _release()
+        raise
+
+
+def _release():
+    global _unfinished
+    with _lock:
+        _unfinished -= 1
+
+
+def _run_job(conversation_id: int, question: str, cache_status: str):
+    """Answer a pending job in a pool thread."""
+    start_time = time.time()
+    jobs = Conversation.objects.filter(pk=conversation_id)
+    try:
+        jobs.update(status=Conversation.STATUS_RUNNING)
+        generated, cache_status = generate_answer(question, cache_status)
+        jobs.update(
+            status=Conversation.STATUS_DONE,
+            response=ResponseFormatter.format_response(generated['response'], question),
+            ai_provider=generated['ai_provider'],
+            cache_status=cache_status,
+            processing_time=time.time() - start_time
+        )
+
+    except Exception as e:
+        logger.error(f"Error processing AI job {conversation_id}: {str(e)}")
+        jobs.update(
+            status=Conversation.STATUS_FAILED,
+            response=ResponseFormatter.get_fallback_response(question, error=str(e)),
+            error=str(e),
+            processing_time=time.time() - start_time
+        )
+
+    finally:
+        _release()
+        # Connexions propres à ce thread
+        connections.close_all()
+
+
+def expire_stale_jobs(queryset) -> int:
+    """Mark failed the unfinished jobs of `queryset` older than `AI_JOB_TIMEOUT`."""
+    deadline = timezone.now() - timedelta(seconds=settings.AI_JOB_TIMEOUT)
+    return queryset.filter(status__in=UNFINISHED_JOB_STATUSES, created_at__lt=deadline).update(
+        status=Conversation.STATUS_FAILED,
+        error="Tâche interrompue avant la fin (redémarrage du serveur ?)"
+    )
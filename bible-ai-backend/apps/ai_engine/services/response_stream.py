@@ -0,0 +1,203 @@
+"""
+Incremental parsing of a streamed AI answer.
+
+The model answers with the JSON object of `AIClient.SYSTEM_PROMPT`
+(`verses`, `explanation`, `practical_application`), delivered in arbitrary
+text chunks. `ResponseStreamParser.feed` turns each chunk into events as
+soon as they can be known:
+
+- `('verse', {'reference', 'text'})` when a verse object is complete;
+- `('explanation', text)` / `('practical_application', text)` with the
+  characters of these strings decoded since the previous chunk.
+
+The parser is a generator receiving one character at a time, so any split
+of the text (inside a key, an escape sequence...) is handled. It is best
+effort: on unexpected input it stops emitting events, and `result()`
+parses the whole text with `AIClient.parse_response_text`, which remains
+the authoritative answer.
+"""
+import json
+
+from .ai_client import AIClient
+
+STREAMED_FIELDS = ('explanation', 'practical_application')
+WHITESPACE = ' \t\n\r'
+ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class _Malformed(Exception):
+    pass
+
+
+class ResponseStreamParser:
+    """Events of a JSON answer fed chunk by chunk."""
+
+    def __init__(self):
+        self.chunks = []
+        self.events = []
+        # Texte brut du verset en cours de lecture
+        self._capture = None
+        # Champ en cours de diffusion et caractères pas encore émis
+        self._field = None
+        self._pending = []
+        self._parser = self._parse()
+        next(self._parser)
+
+    def feed(self, chunk: str) -> list:
+        """Consume a text chunk and return the events it completes."""
+        self.chunks.append(chunk)
+        if self._parser is not None:
+            try:
+                for char in chunk:
+                    if self._capture is not None:
+                        self._capture.append(char)
+                    self._parser.send(char)
+            except (_Malformed, StopIteration):
+                self._parser = None
+        self._flush()
+        events, self.events = self.events, []
+        return events
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.chunks)
+
+    def result(self) -> dict:
+        """The complete answer, parsed from the whole text."""
+        return AIClient.parse_response_text(self.text)
+
+    def _emit(self, event):
+        self._flush()
+        self.events.append(event)
+
+    def _flush(self):
+        if self._pending:
+            self.events.append((self._field, ''.join(self._pending)))
+            self._pending.clear()
+
+    # Chaque sous-générateur reçoit les caractères par `yield` et renvoie le
+    # premier caractère qui suit ce qu'il a lu
+
+    def _parse(self):
+        char = yield
+        # Texte ou bloc markdown avant l'objet
+        while char != '{':
+            char = yield
+        char = yield from self._whitespace((yield))
+        while char == '"':
+            key = yield from self._string()
+            char = yield from self._whitespace((yield))
+            if char != ':':
+                raise _Malformed
+            char = yield from self._whitespace((yield))
+
+            if key in STREAMED_FIELDS and char == '"':
+                yield from self._string(field=key)
+                char = yield
+            elif key == 'verses' and char == '[':
+                char = yield from self._verses()
+            else:
+                char = yield from self._skip_value(char)
+
+            char = yield from self._whitespace(char)
+            if char == ',':
+                char = yield from self._whitespace((yield))
+            elif char == '}':
+                break
+            else:
+                raise _Malformed
+
+        # Fin de l'objet : la suite (fin de bloc markdown) est ignorée
+        while True:
+            yield
+
+    def _whitespace(self, char):
+        while char in WHITESPACE:
+            char = yield
+        return char
+
+    def _string(self, field=None):
+        """Read a string after its opening quote; stream it as `field` if given."""
+        decoded = []
+        if field:
+            self._flush()
+            self._field = field
+        out = self._pending if field else decoded
+        high_surrogate = None
+        while True:
+            char = yield
+            if char == '"':
+                if high_surrogate:
+                    out.append(high_surrogate)
+                return ''.join(decoded)
+            if char == '\\':
+                char = yield
+                if char == 'u':
+                    digits = ''
+                    for _ in range(4):
+                        digits += yield
+                    try:
+                        char = chr(int(digits, 16))
+                    except ValueError:
+                        raise _Malformed
+                    if 0xD800 <= ord(char) < 0xDC00:
+                        high_surrogate = char
+                        continue
+                    if high_surrogate and 0xDC00 <= ord(char) < 0xE000:
+                        char = (high_surrogate + char).encode('utf-16', 'surrogatepass').decode('utf-16')
+                        high_surrogate = None
+                elif char in ESCAPES:
+                    char = ESCAPES[char]
+                else:
+                    raise _Malformed
+            if high_surrogate:
+                out.append(high_surrogate)
+                high_surrogate = None
+            out.append(char)
+
+    def _verses(self):
+        """Read the `verses` array, emitting each verse object once complete."""
+        char = yield from self._whitespace((yield))
+        if char == ']':
+            return (yield)
+        while True:
+            if char == '{':
+                self._capture = ['{']
+                char = yield from self._skip_value(char)
+                # Le caractère qui suit l'objet a été capturé avec lui
+                raw, self._capture = ''.join(self._capture[:-1]), None
+                try:
+                    verse = json.loads(raw)
+                except ValueError:
+                    raise _Malformed
+                if isinstance(verse, dict):
+                    self._emit(('verse', verse))
+            else:
+                char = yield from self._skip_value(char)
+            char = yield from self._whitespace(char)
+            if char == ']':
+                return (yield)
+            if char != ',':
+                raise _Malformed
+            char = yield from self._whitespace((yield))
+
+    def _skip_value(self, char):
+        """Read any value starting with `char`."""
+        if char == '"':
+            yield from self._string()
+            return (yield)
+        if char in '{[':
+            depth = 1
+            while depth:
+                char = yield
+                if char == '"':
+                    yield from self._string()
+                elif char in '{[':
+                    depth += 1
+                elif char in '}]':
+                    depth -= 1
+            return (yield)
+        # Nombre, true, false ou null
+        while char not in ',}]' and char not in WHITESPACE:
+            char = yield
+        return char
@@ -0,0 +1,145 @@
+"""
+Single-flight coalescing of identical AI questions.
+
+When many users ask the same (normalized) question at once, only one
+upstream call is made; the other requests wait for it and share its
+result.
+
+- Within a process, threads asking for the same key wait on the leader's
+  `threading.Event`.
+- Across workers, the leader holds a lock in the Django cache
+  (`cache.add`, expiring after the timeout if the worker dies) and
+  publishes the result under a key derived from its lock token; leaders of
+  other workers poll for it. This needs a shared cache (`CACHE_URL`, e.g.
+  Redis): with the default local-memory cache, coalescing stays per
+  process.
+
+Waits are bounded by a per-key timeout (`AI_SINGLE_FLIGHT_TIMEOUT` by
+default), after which `SingleFlightTimeout` is raised.
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+LOCK_PREFIX = 'ai-flight:lock:'
+RESULT_PREFIX = 'ai-flight:result:'
+POLL_MIN = 0.05
+POLL_MAX = 0.5
+
+
+class SingleFlightError(RuntimeError):
+    """Raised to the waiting requests when the shared upstream call failed."""
+
+
+class SingleFlightTimeout(SingleFlightError):
+    """Raised when the shared call did not finish within the timeout."""
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_flights = {}
+_lock = threading.Lock()
+
+
+def single_flight_enabled() -> bool:
+    return getattr(settings, 'AI_SINGLE_FLIGHT', True)
+
+
+def single_flight(key: str, compute, timeout: float = None):
+    """
+    Run `compute()` once for all concurrent callers of `key`.
+
+    Returns `(result, shared)`: `shared` is False for the caller that ran
+    `compute`, True for those that received its result. The result must be
+    picklable to be shared across workers.
+    """
+    if timeout is None:
+        timeout = settings.AI_SINGLE_FLIGHT_TIMEOUT
+    deadline = time.monotonic() + timeout
+
+    with _lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        if not flight.done.wait(timeout):
+            raise _timeout_error(timeout)
+        if flight.error is not None:
+            raise flight.error
+        return flight.result, True
+
+    try:
+        flight.result, shared = _across_workers(key, compute, timeout, deadline)
+        return flight.result, shared
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            del _flights[key]
+        flight.done.set()
+
+
+def _across_workers(key: str, compute, timeout: float, deadline: float):
+    """Coordinate this process's leader with the other workers through the cache."""
+    lock_key = LOCK_PREFIX + key
+    token = uuid.uuid4().hex
+    ttl = max(1, int(timeout))
+    poll = POLL_MIN
+
+    while True:
+        if cache.add(lock_key, token, timeout=ttl):
+            try:
+                result = compute()
+            except Exception as e:
+                cache.set(RESULT_PREFIX + token, {'error': str(e)}, timeout=ttl)
+                raise
+            else:
+                cache.set(RESULT_PREFIX + token, {'result': result}, timeout=ttl)
+                return result, False
+            finally:
+                # Non atomique : au pire, le verrou d'un nouveau leader est libéré tôt
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+
+        # Un autre worker calcule : attendre le résultat publié sous son jeton
+        owner = cache.get(lock_key)
+        while owner is not None:
+            published = cache.get(RESULT_PREFIX + owner)
+            if published is None:
+                current = cache.get(lock_key)
+                if current != owner:
+                    # Le leader publie avant de libérer son verrou : relire une fois
+                    published = cache.get(RESULT_PREFIX + owner)
+                    if published is None:
+                        # Worker arrêté sans résultat, ou verrou repris par un autre
+                        owner = current
+                        continue
+            if published is not None:
+                if 'error' in published:
+                    raise SingleFlightError(published['error'])
+                return published['result'], True
+            _check_deadline(deadline, timeout)
+            time.sleep(poll)
+            poll = min(poll * 2, POLL_MAX)
+
+        _check_deadline(deadline, timeout)
+
+
+def _check_deadline(deadline: float, timeout: float):
+    if time.monotonic() >= deadline:
+        raise _timeout_error(timeout)
+
+
+def _timeout_error(timeout: float) -> SingleFlightTimeout:
+    return SingleFlightTimeout(f"Délai dépassé en attendant la réponse partagée ({timeout:g} s)")
@@ -3,14 +3,16 @@ AI Engine URL configuration.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AIEngineViewSet, ConversationViewSet
+from .views import AIEngineViewSet, AIJobViewSet, ConversationViewSet
 
 app_name = 'ai_engine'
 
 router = DefaultRouter()
 router.register(r'conversations', ConversationViewSet, basename='conversation')
+router.register(r'jobs', AIJobViewSet, basename='job')
 
 urlpatterns = [
     path('ask/', AIEngineViewSet.as_view({'post': 'ask'}), name='ask'),
+    path('ask/stream/', AIEngineViewSet.as_view({'post': 'ask_stream'}), name='ask-stream'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
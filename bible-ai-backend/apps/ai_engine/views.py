@@ -3,18 +3,36 @@ AI Engine views.
 """
 import time
 import logging
+from django.http import StreamingHttpResponse
+from django.urls import reverse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from drf_spectacular.utils import extend_schema
+from rest_framework.renderers import JSONRenderer
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
 from .models import Conversation
 from .serializers import (
     QuestionSerializer,
     AIResponseSerializer,
     ConversationSerializer
 )
-from .services import AIClient, ResponseFormatter
+from .pagination import ConversationPagination
+from .renderers import EventStreamRenderer, sse_event
+from .services import (
+    STREAMED_FIELDS,
+    AIClient,
+    JobQueueFull,
+    ResponseFormatter,
+    ResponseStreamParser,
+    UNFINISHED_JOB_STATUSES,
+    expire_stale_jobs,
+    generate_answer,
+    lookup_answer,
+    store_answer,
+    submit_question
+)
 
 logger = logging.getLogger(__name__)
 
@@ -43,11 +61,14 @@ class AIEngineViewSet(viewsets.ViewSet):
         start_time = time.time()
         
         try:
-            ai_client = AIClient()
-            ai_response = ai_client.get_biblical_response(question)
+            cached, cache_status = lookup_answer(question)
             
-            if not ResponseFormatter.validate_response(ai_response):
-                raise ValueError("Invalid AI response format")
+            if cached is not None:
+                generated = cached
+            else:
+                generated, cache_status = generate_answer(question, cache_status)
+            ai_response = generated['response']
+            ai_provider = generated['ai_provider']
             
             formatted_response = ResponseFormatter.format_response(
                 ai_response,
@@ -61,12 +82,17 @@ class AIEngineViewSet(viewsets.ViewSet):
                 user=user,
                 question=question,
                 response=formatted_response,
-                ai_provider=ai_client.provider,
-                processing_time=processing_time
+                ai_provider=ai_provider,
+                processing_time=processing_time,
+                cache_status=cache_status
             )
             
             response_serializer = AIResponseSerializer(formatted_response)
-            return Response(response_serializer.data, status=status.HTTP_200_OK)
+            response = Response(response_serializer.data, status=status.HTTP_200_OK)
+            response['X-Answer-Cache'] = cache_status
+            if cache_status == Conversation.CACHE_SIMILAR:
+                response['X-Answer-Similarity'] = f"{cached['similarity']:.3f}"
+            return response
         
         except Exception as e:
             logger.error(f"Error processing AI request: {str(e)}")
@@ -80,22 +106,197 @@ class AIEngineViewSet(viewsets.ViewSet):
                 fallback,
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    @extend_schema(
+        tags=['AI'],
+        summary="Poser une question biblique (réponse diffusée)",
+        description=(
+            "Réponse en Server-Sent Events, au fil de la génération : `start` "
+            "({question, cache_status}), `verse` (un verset complet), `explanation` "
+            "et `practical_application` ({delta} : texte ajouté), puis `done` "
+            "(la réponse complète, comme /ai/ask/) ou `error` (réponse de secours)."
+        ),
+        request=QuestionSerializer,
+        responses={(200, 'text/event-stream'): OpenApiTypes.STR}
+    )
+    @action(detail=False, methods=['post'], url_path='ask/stream')
+    def ask_stream(self, request):
+        """Ask a biblical question and stream the answer as it is generated."""
+        question_serializer = QuestionSerializer(data=request.data)
+        if not question_serializer.is_valid():
+            return Response(
+                question_serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        question = question_serializer.validated_data['question']
+        user = request.user if request.user.is_authenticated else None
+        cached, cache_status = lookup_answer(question)
+        
+        response = StreamingHttpResponse(
+            self._answer_events(question, user, cached, cache_status),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Pas de mise en tampon par un proxy nginx
+        response['X-Accel-Buffering'] = 'no'
+        response['X-Answer-Cache'] = cache_status
+        return response
+    
+    def get_renderers(self):
+        if self.action == 'ask_stream':
+            return [EventStreamRenderer(), JSONRenderer()]
+        return super().get_renderers()
+    
+    @staticmethod
+    def _answer_events(question, user, cached, cache_status):
+        """Server-Sent Events of the answer; the conversation is saved once it is complete."""
+        start_time = time.time()
+        # Premier octet envoyé sans attendre le modèle
+        yield sse_event('start', {'question': question, 'cache_status': cache_status})
+        
+        try:
+            if cached is not None:
+                ai_response = cached['response']
+                ai_provider = cached['ai_provider']
+                for verse in ai_response['verses']:
+                    yield sse_event('verse', verse)
+                for field in STREAMED_FIELDS:
+                    yield sse_event(field, {'delta': ai_response[field]})
+            else:
+                ai_client = AIClient()
+                parser = ResponseStreamParser()
+                for chunk in ai_client.stream_biblical_response(question):
+                    for event, data in parser.feed(chunk):
+                        yield sse_event(event, data if event == 'verse' else {'delta': data})
+                
+                ai_response = parser.result()
+                ai_provider = ai_client.provider
+                
+                if not ResponseFormatter.validate_response(ai_response):
+                    raise ValueError("Invalid AI response format")
+                
+                if cache_status == Conversation.CACHE_MISS:
+                    store_answer(question, ai_response, ai_provider)
+            
+            formatted_response = ResponseFormatter.format_response(
+                ai_response,
+                question
+            )
+            
+            Conversation.objects.create(
+                user=user,
+                question=question,
+                response=formatted_response,
+                ai_provider=ai_provider,
+                processing_time=time.time() - start_time,
+                cache_status=cache_status
+            )
+            
+            yield sse_event('done', AIResponseSerializer(formatted_response).data)
+        
+        except Exception as e:
+            logger.error(f"Error streaming AI request: {str(e)}")
+            
+            yield sse_event('error', ResponseFormatter.get_fallback_response(
+                question,
+                error=str(e)
+            ))
 
 
 class ConversationViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet for conversation history."""
     serializer_class = ConversationSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = ConversationPagination
     
     def get_queryset(self):
         if self.request.user.is_authenticated:
             return Conversation.objects.filter(user=self.request.user)
         return Conversation.objects.none()
     
-    @extend_schema(tags=['AI'], summary="Historique des conversations")
+    @extend_schema(
+        tags=['AI'],
+        summary="Historique des conversations",
+        parameters=[
+            OpenApiParameter(
+                'cursor', OpenApiTypes.STR,
+                description=(
+                    "Pagination par curseur (vide pour la première page) : "
+                    "réponse {next, results}, sans comptage"
+                )
+            ),
+            OpenApiParameter('page_size', OpenApiTypes.INT, description='Conversations par page avec curseur (max 200)')
+        ]
+    )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
     
     @extend_schema(tags=['AI'], summary="Détails d'une conversation")
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
\ No newline at end of file
+        return super().retrieve(request, *args, **kwargs)
+
+
+class AIJobViewSet(viewsets.GenericViewSet):
+    """Asynchronous questions: answered in the background, then polled."""
+    serializer_class = ConversationSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    # Délai conseillé aux clients entre deux lectures d'une tâche non terminée
+    retry_after = 2
+    
+    def get_queryset(self):
+        if self.request.user.is_authenticated:
+            return Conversation.objects.filter(user=self.request.user)
+        return Conversation.objects.none()
+    
+    @extend_schema(
+        tags=['AI'],
+        summary="Poser une question biblique (asynchrone)",
+        description=(
+            "Enregistre la question et répond immédiatement (202) avec la tâche : "
+            "suivre son `status` (pending, running, done, failed) sur /ai/jobs/{id}/. "
+            "503 si trop de questions sont déjà en attente."
+        ),
+        request=QuestionSerializer,
+        responses={202: ConversationSerializer}
+    )
+    def create(self, request):
+        question_serializer = QuestionSerializer(data=request.data)
+        if not question_serializer.is_valid():
+            return Response(
+                question_serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        question = question_serializer.validated_data['question']
+        user = request.user if request.user.is_authenticated else None
+        try:
+            conversation = submit_question(question, user)
+        except JobQueueFull as e:
+            response = Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            response['Retry-After'] = '5'
+            return response
+        
+        response = Response(self.get_serializer(conversation).data, status=status.HTTP_202_ACCEPTED)
+        response['Location'] = reverse('ai_engine:job-detail', args=[conversation.pk])
+        return response
+    
+    @extend_schema(
+        tags=['AI'],
+        summary="État d'une question asynchrone",
+        description=(
+            "Répond immédiatement, sans attendre la fin de la tâche : tant qu'elle "
+            "n'est pas terminée, l'en-tête `Retry-After` indique quand relire."
+        )
+    )
+    def retrieve(self, request, pk=None):
+        conversation = self.get_object()
+        
+        if conversation.status in UNFINISHED_JOB_STATUSES:
+            if expire_stale_jobs(self.get_queryset().filter(pk=conversation.pk)):
+                conversation.refresh_from_db()
+        
+        response = Response(self.get_serializer(conversation).data)
+        if conversation.status in UNFINISHED_JOB_STATUSES:
+            response['Retry-After'] = str(self.retry_after)
+        return response
@@ -3,10 +3,27 @@ Bible admin configuration.
 """
 from django.contrib import admin
 from .models import Book, Chapter, Verse
+from .services import invalidate_corpus, get_search_backend, PostgresSearchBackend
+
+
+class CorpusAdminMixin:
+    """Bump the corpus revision whenever Bible data is edited."""
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_corpus()
+    
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_corpus()
+    
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_corpus()
 
 
 @admin.register(Book)
-class BookAdmin(admin.ModelAdmin):
+class BookAdmin(CorpusAdminMixin, admin.ModelAdmin):
     """Admin for Book model."""
     
     list_display = ['name', 'testament', 'order', 'abbreviation', 'chapter_count']
@@ -16,7 +33,7 @@ class BookAdmin(admin.ModelAdmin):
 
 
 @admin.register(Chapter)
-class ChapterAdmin(admin.ModelAdmin):
+class ChapterAdmin(CorpusAdminMixin, admin.ModelAdmin):
     """Admin for Chapter model."""
     
     list_display = ['__str__', 'book', 'number', 'verse_count']
@@ -26,16 +43,32 @@ class ChapterAdmin(admin.ModelAdmin):
 
 
 @admin.register(Verse)
-class VerseAdmin(admin.ModelAdmin):
+class VerseAdmin(CorpusAdminMixin, admin.ModelAdmin):
     """Admin for Verse model."""
     
     list_display = ['reference', 'text_preview', 'version']
-    list_filter = ['version', 'chapter__book__testament']
-    search_fields = ['text', 'chapter__book__name']
-    ordering = ['chapter__book__order', 'chapter__number', 'number']
+    list_filter = ['version', 'book__testament']
+    search_fields = ['text', 'book__name']
+    ordering = ['verse_key', 'id']
+    # Copies du chapitre, recalculées par Verse.save()
+    readonly_fields = ['book', 'chapter_number', 'verse_key']
     
     def text_preview(self, obj):
         """Show text preview."""
         return obj.text[:50] + '...' if len(obj.text) > 50 else obj.text
     
-    text_preview.short_description = 'Aperçu'
\ No newline at end of file
+    text_preview.short_description = 'Aperçu'
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('book').defer('search_vector')
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Use the indexed full-text search on PostgreSQL."""
+        backend = get_search_backend()
+        if not search_term or not isinstance(backend, PostgresSearchBackend):
+            return super().get_search_results(request, queryset, search_term)
+        
+        matches = backend.filter(queryset, search_term) | queryset.filter(
+            book__name__icontains=search_term
+        )
+        return matches, False
\ No newline at end of file
@@ -4,4 +4,11 @@ from django.apps import AppConfig
 class BibleConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.bible'
-    verbose_name = 'Bible'
\ No newline at end of file
+    verbose_name = 'Bible'
+    
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .services.search_backends import register_fold_function
+        
+        # Recherche 'database' sous SQLite : textes comparés sans casse ni accents
+        connection_created.connect(register_fold_function)
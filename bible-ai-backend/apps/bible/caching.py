@@ -0,0 +1,86 @@
+"""
+HTTP conditional caching for the Bible read endpoints.
+
+Every read endpoint is a pure function of its URL and of the corpus
+revision, so the ETag is derived from both without rendering anything:
+`If-None-Match` / `If-Modified-Since` are answered with a 304 before the
+view touches the corpus, the database or a serializer.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .services import current_revision_state
+
+# Durée de cache d'une ressource épinglée sur une révision (?rev=N)
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def corpus_etag(request, revision: int) -> str:
+    """Strong ETag for `request`'s URL at a given corpus revision."""
+    digest = hashlib.blake2b(request.get_full_path().encode(), digest_size=8).hexdigest()
+    return f'"bible-r{revision}-{digest}"'
+
+
+def conditional_corpus_response(view_method):
+    """
+    Add ETag / Last-Modified / Cache-Control to a read-only view method.
+
+    Requests pinned to the current revision with `?rev=N` are cacheable for
+    a year (`immutable`); others for `BIBLE_HTTP_MAX_AGE` seconds, after
+    which clients revalidate cheaply with the ETag. Gzipped bodies get the
+    weak form of the ETag, as Django's GZipMiddleware does.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view_method(self, request, *args, **kwargs)
+
+        revision, updated_at = current_revision_state()
+        etag = corpus_etag(request, revision)
+        last_modified = int(updated_at.timestamp()) if updated_at else None
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        if response.has_header('Content-Encoding'):
+            etag = 'W/' + etag
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+
+        if request.GET.get('rev') == str(revision):
+            patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=settings.BIBLE_HTTP_MAX_AGE)
+        return response
+
+    return wrapper
+
+
+def immutable_response(request, digest: str, make_response):
+    """
+    Serve a content-addressed resource: its digest is the ETag and, since
+    the content behind a digest never changes, it is cacheable for a year.
+    `make_response` is only called when the client copy is not current.
+    """
+    etag = f'"{digest}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = make_response()
+        if response.status_code != 200:
+            return response
+
+    if response.has_header('Content-Encoding'):
+        etag = 'W/' + etag
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    return response
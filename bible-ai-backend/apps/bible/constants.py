@@ -0,0 +1,35 @@
+"""
+Bible constants shared by the loaders and the reference parser.
+"""
+
+# Mapping des abréviations vers les noms complets en français (ordre canonique)
+BOOK_NAMES = {
+    'gn': 'Genèse', 'ex': 'Exode', 'lv': 'Lévitique', 'nb': 'Nombres', 'dt': 'Deutéronome',
+    'jos': 'Josué', 'jg': 'Juges', 'rt': 'Ruth', '1s': '1 Samuel', '2s': '2 Samuel',
+    '1r': '1 Rois', '2r': '2 Rois', '1ch': '1 Chroniques', '2ch': '2 Chroniques',
+    'esd': 'Esdras', 'ne': 'Néhémie', 'est': 'Esther', 'job': 'Job', 'ps': 'Psaumes',
+    'pr': 'Proverbes', 'ec': 'Ecclésiaste', 'ct': 'Cantique', 'es': 'Ésaïe',
+    'jr': 'Jérémie', 'lm': 'Lamentations', 'ez': 'Ézéchiel', 'dn': 'Daniel',
+    'os': 'Osée', 'jl': 'Joël', 'am': 'Amos', 'ab': 'Abdias', 'jon': 'Jonas',
+    'mi': 'Michée', 'na': 'Nahum', 'hab': 'Habacuc', 'soph': 'Sophonie',
+    'ag': 'Aggée', 'za': 'Zacharie', 'ml': 'Malachie',
+    'mt': 'Matthieu', 'mc': 'Marc', 'lc': 'Luc', 'jn': 'Jean', 'ac': 'Actes',
+    'rm': 'Romains', '1co': '1 Corinthiens', '2co': '2 Corinthiens', 'ga': 'Galates',
+    'ep': 'Éphésiens', 'ph': 'Philippiens', 'col': 'Colossiens',
+    '1th': '1 Thessaloniciens', '2th': '2 Thessaloniciens', '1tm': '1 Timothée',
+    '2tm': '2 Timothée', 'tt': 'Tite', 'phm': 'Philémon', 'heb': 'Hébreux',
+    'jc': 'Jacques', '1p': '1 Pierre', '2p': '2 Pierre', '1jn': '1 Jean',
+    '2jn': '2 Jean', '3jn': '3 Jean', 'jud': 'Jude', 'ap': 'Apocalypse'
+}
+
+# Formes alternatives courantes (traductions catholiques, abréviations usuelles)
+# qui ne se déduisent ni des noms, ni des abréviations, ni d'un préfixe unique
+BOOK_ALIASES = {
+    'isaie': 'es', 'is': 'es',
+    'qohelet': 'ec', 'qo': 'ec',
+    'cantiquedescantiques': 'ct',
+    'jb': 'job',
+}
+
+# Livres d'un seul chapitre : un nombre seul y désigne un verset (« Jude 3 »)
+SINGLE_CHAPTER_BOOKS = {'ab', 'phm', '2jn', '3jn', 'jud'}
@@ -0,0 +1,58 @@
+"""
+Compare le chemin de sérialisation DRF classique et le chemin rapide.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+
+from apps.bible.models import Chapter, Verse
+from apps.bible.renderers import BibleJSONRenderer
+from apps.bible.serializers import VerseSerializer, verse_rows
+
+
+class Command(BaseCommand):
+    help = 'Mesure VerseSerializer + JSONRenderer contre values_list + BibleJSONRenderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50, help='Répétitions par cas')
+        parser.add_argument('--query', default='Dieu', help='Terme de recherche (icontains)')
+
+    def handle(self, *args, **options):
+        chapter = Chapter.objects.annotate(size=Count('verses')).order_by('-size').first()
+        if chapter is None:
+            self.stdout.write(self.style.ERROR('❌ Aucune donnée biblique chargée.'))
+            return
+
+        verses = Verse.objects.all()
+        cases = [
+            ('Page de 20 versets', verses.filter(book_id=chapter.book_id)[20:40]),
+            (f'Chapitre complet ({chapter})', verses.filter(chapter_id=chapter.id)),
+            (f'Recherche « {options["query"]} » (50)', verses.filter(text__icontains=options['query'])[:50]),
+        ]
+
+        self.stdout.write(f'{"Cas":<40} {"DRF":>10} {"Rapide":>10} {"Gain":>7}')
+        for label, queryset in cases:
+            slow, slow_bytes = self.measure(options['repeat'], lambda: JSONRenderer().render(
+                VerseSerializer(queryset.select_related('book'), many=True).data
+            ))
+            fast, fast_bytes = self.measure(options['repeat'], lambda: BibleJSONRenderer().render(
+                verse_rows(queryset)
+            ))
+            if slow_bytes != fast_bytes:
+                self.stdout.write(self.style.ERROR(f'❌ {label} : sorties différentes'))
+                continue
+            self.stdout.write(
+                f'{label:<40} {slow * 1000:>8.2f}ms {fast * 1000:>8.2f}ms {slow / fast:>6.1f}x'
+            )
+
+    @staticmethod
+    def measure(repeat, render):
+        """Best time over `repeat` runs, with the last output."""
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            content = render()
+            best = min(best, time.perf_counter() - started)
+        return best, content
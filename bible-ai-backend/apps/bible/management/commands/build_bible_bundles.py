@@ -0,0 +1,41 @@
+"""
+Construit les paquets hors ligne (un par version) adressés par leur contenu.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.bible.services.bundles import build_bundles
+
+
+class Command(BaseCommand):
+    help = 'Construit le paquet hors ligne de chaque version (NDJSON gzip, empreinte SHA-256)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=settings.BIBLE_BUNDLE_HISTORY,
+            help='Nombre de paquets conservés par version (bases des deltas)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.stdout.write(self.style.WARNING('📦 Construction des paquets hors ligne...'))
+
+        results = build_bundles(keep=options['keep'])
+        if not results:
+            self.stdout.write(self.style.ERROR('❌ Aucune donnée biblique chargée.'))
+            return
+
+        for bundle, created in results:
+            status = 'nouveau' if created else 'inchangé'
+            self.stdout.write(
+                f'   {bundle.version} {bundle.digest[:12]} ({status}) : {bundle.verse_count} versets, '
+                f'{bundle.size / 1024:.0f} Ko → {bundle.compressed_size / 1024:.0f} Ko gzip'
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {len(results)} paquet(s) en {time.perf_counter() - started:.2f}s')
+        )
@@ -0,0 +1,55 @@
+"""
+Exporte la Bible complète (livres → chapitres → versets) en NDJSON ou JSON.
+"""
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.bible.services.export import EXPORT_FORMATS, export_stream, version_exists
+
+
+class Command(BaseCommand):
+    help = 'Exporte le corpus en flux (mémoire constante), éventuellement compressé en gzip'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', '-o',
+            default='-',
+            help='Fichier de sortie (« - » pour la sortie standard ; gzip si le nom finit par .gz)',
+        )
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson', help='Format (ndjson par défaut)')
+        parser.add_argument('--bible-version', dest='bible_version', help='Version à exporter (version par défaut si absente)')
+        parser.add_argument('--gzip', action='store_true', help='Compresse la sortie en gzip')
+
+    def handle(self, *args, **options):
+        path = options['output']
+        version = options['bible_version']
+        compress = options['gzip'] or path.endswith('.gz')
+
+        if version and not version_exists(version):
+            raise CommandError(f'Version inconnue : {version}')
+
+        started = time.perf_counter()
+        revision, chunks = export_stream(options['format'], version, compress=compress)
+
+        size = 0
+        stream = sys.stdout.buffer if path == '-' else open(path, 'wb')
+        try:
+            for chunk in chunks:
+                stream.write(chunk)
+                size += len(chunk)
+        finally:
+            if stream is not sys.stdout.buffer:
+                stream.close()
+            else:
+                stream.flush()
+
+        # Sur la sortie standard, le résumé part sur stderr pour ne pas polluer l'export
+        report = self.stderr if path == '-' else self.stdout
+        report.write(
+            self.style.SUCCESS(
+                f'✅ Révision {revision} exportée : {size / 1024 / 1024:.1f} Mo '
+                f'en {time.perf_counter() - started:.2f}s'
+            )
+        )
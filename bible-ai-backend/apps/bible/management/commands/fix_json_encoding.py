@@ -3,6 +3,9 @@ Corrige l'encodage du fichier JSON (supprime le BOM).
 """
 from django.core.management.base import BaseCommand
 import os
+import shutil
+
+COPY_CHUNK_SIZE = 1024 * 1024
 
 
 class Command(BaseCommand):
@@ -16,13 +19,14 @@ class Command(BaseCommand):
             return
         
         try:
-            # Lire avec utf-8-sig (gère le BOM)
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                content = f.read()
-            
-            # Réécrire avec utf-8 (sans BOM)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Copie par blocs (mémoire constante) : lecture en utf-8-sig (gère
+            # le BOM), écriture en utf-8 sans BOM dans un fichier temporaire
+            # qui remplace l'original une fois complet
+            temp_path = f'{file_path}.tmp'
+            with open(file_path, 'r', encoding='utf-8-sig') as source, \
+                    open(temp_path, 'w', encoding='utf-8') as target:
+                shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
+            os.replace(temp_path, file_path)
             
             self.stdout.write(
                 self.style.SUCCESS(
@@ -1,36 +1,21 @@
 """
 Charge les données bibliques depuis le fichier JSON.
 """
+from django.conf import settings
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
-from django.db import transaction
-from apps.bible.models import Book, Chapter, Verse
-import json
+from apps.bible.constants import BOOK_NAMES
+from apps.bible.models import Verse
+from apps.bible.services import invalidate_corpus
+from apps.bible.management.sync import SyncCommandMixin
+from apps.bible.services.loader import load_version
+from apps.bible.services.sources import SourceError, iter_source_books
 import os
 
 
-class Command(BaseCommand):
+class Command(SyncCommandMixin, BaseCommand):
     help = 'Charge la Bible depuis le fichier fr_apee.json'
 
-    # Mapping des abréviations vers les noms complets en français
-    BOOK_NAMES = {
-        'gn': 'Genèse', 'ex': 'Exode', 'lv': 'Lévitique', 'nb': 'Nombres', 'dt': 'Deutéronome',
-        'jos': 'Josué', 'jg': 'Juges', 'rt': 'Ruth', '1s': '1 Samuel', '2s': '2 Samuel',
-        '1r': '1 Rois', '2r': '2 Rois', '1ch': '1 Chroniques', '2ch': '2 Chroniques',
-        'esd': 'Esdras', 'ne': 'Néhémie', 'est': 'Esther', 'job': 'Job', 'ps': 'Psaumes',
-        'pr': 'Proverbes', 'ec': 'Ecclésiaste', 'ct': 'Cantique', 'es': 'Ésaïe',
-        'jr': 'Jérémie', 'lm': 'Lamentations', 'ez': 'Ézéchiel', 'dn': 'Daniel',
-        'os': 'Osée', 'jl': 'Joël', 'am': 'Amos', 'ab': 'Abdias', 'jon': 'Jonas',
-        'mi': 'Michée', 'na': 'Nahum', 'hab': 'Habacuc', 'soph': 'Sophonie',
-        'ag': 'Aggée', 'za': 'Zacharie', 'ml': 'Malachie',
-        'mt': 'Matthieu', 'mc': 'Marc', 'lc': 'Luc', 'jn': 'Jean', 'ac': 'Actes',
-        'rm': 'Romains', '1co': '1 Corinthiens', '2co': '2 Corinthiens', 'ga': 'Galates',
-        'ep': 'Éphésiens', 'ph': 'Philippiens', 'col': 'Colossiens',
-        '1th': '1 Thessaloniciens', '2th': '2 Thessaloniciens', '1tm': '1 Timothée',
-        '2tm': '2 Timothée', 'tt': 'Tite', 'phm': 'Philémon', 'heb': 'Hébreux',
-        'jc': 'Jacques', '1p': '1 Pierre', '2p': '2 Pierre', '1jn': '1 Jean',
-        '2jn': '2 Jean', '3jn': '3 Jean', 'jud': 'Jude', 'ap': 'Apocalypse'
-    }
-
     def add_arguments(self, parser):
         parser.add_argument(
             '--force',
@@ -43,25 +28,35 @@ class Command(BaseCommand):
             default='apps/bible/data/fr_apee.json',
             help='Chemin vers le fichier JSON de la Bible',
         )
+        parser.add_argument(
+            '--bible-version',
+            dest='bible_version',
+            type=str,
+            default='APEE',
+            help='Code de la version chargée (les autres versions sont conservées)',
+        )
+        parser.add_argument(
+            '--keep-indexes',
+            action='store_true',
+            help='Conserve les index secondaires pendant le chargement (sinon supprimés puis reconstruits)',
+        )
+        self.add_sync_arguments(parser)
 
     def handle(self, *args, **options):
-        self.stdout.write(self.style.WARNING('📖 Chargement de la Bible...'))
+        version = options['bible_version']
+        self.stdout.write(self.style.WARNING(f'📖 Chargement de la Bible ({version})...'))
         
-        # Vérifier si les données existent déjà
-        if Book.objects.exists():
+        # Vérifier si cette version existe déjà (livres et chapitres sont partagés)
+        if not options['sync'] and Verse.objects.filter(version=version).exists():
             if not options['force']:
                 self.stdout.write(
                     self.style.WARNING(
-                        '⚠️  Des données bibliques existent déjà.\n'
-                        'Utilisez --force pour forcer le rechargement.'
+                        f'⚠️  La version {version} est déjà chargée.\n'
+                        'Utilisez --sync pour la mettre à jour ou --force pour la recharger.'
                     )
                 )
                 return
-            
-            self.stdout.write(self.style.WARNING('🗑️  Suppression des anciennes données...'))
-            Verse.objects.all().delete()
-            Chapter.objects.all().delete()
-            Book.objects.all().delete()
+            self.stdout.write(self.style.WARNING(f'🗑️  Les versets {version} seront remplacés'))
         
         # Charger le fichier JSON
         fixture_path = options['file']
@@ -78,76 +73,44 @@ class Command(BaseCommand):
         try:
             self.stdout.write(f'📂 Lecture du fichier: {fixture_path}')
             
-            # Utiliser utf-8-sig pour gérer le BOM automatiquement
-            with open(fixture_path, 'r', encoding='utf-8-sig') as f:
-                raw_data = json.load(f)
+            # Lecture incrémentale, livre par livre (BOM géré par utf-8-sig)
+            books = (
+                self._parse_book_entry(book_entry, order)
+                for order, book_entry in enumerate(iter_source_books(fixture_path), 1)
+            )
             
-            self.stdout.write(f'🔄 Transformation de {len(raw_data)} livres...')
+            if options['sync']:
+                self.sync_books(books, version, options)
+                return
             
-            books_created = 0
-            chapters_created = 0
-            verses_created = 0
+            self.stdout.write('💾 Insertion dans la base de données...')
+            metrics = load_version(
+                books,
+                version,
+                replace=options['force'],
+                drop_indexes=not options['keep_indexes'],
+                progress=self._progress,
+            )
             
-            # Utiliser une transaction pour la performance
-            with transaction.atomic():
-                for order, book_entry in enumerate(raw_data, 1):
-                    # Récupérer les informations du livre
-                    abbrev = book_entry.get('abbrev', '').lower()
-                    book_name = self.BOOK_NAMES.get(abbrev, abbrev.upper())
-                    
-                    # Déterminer le testament (39 premiers = AT, reste = NT)
-                    testament = 'OT' if order <= 39 else 'NT'
-                    
-                    # Récupérer les chapitres
-                    chapters_data = book_entry.get('chapters', [])
-                    
-                    # Créer le livre
-                    book = Book.objects.create(
-                        name=book_name,
-                        testament=testament,
-                        order=order,
-                        abbreviation=abbrev.upper(),
-                        chapter_count=len(chapters_data)
-                    )
-                    books_created += 1
-                    
-                    self.stdout.write(f'  📖 {order}. {book.name} ({len(chapters_data)} chapitres)')
-                    
-                    # Créer les chapitres et versets
-                    for chapter_num, verses_list in enumerate(chapters_data, 1):
-                        # Créer le chapitre
-                        chapter = Chapter.objects.create(
-                            book=book,
-                            number=chapter_num,
-                            verse_count=len(verses_list)
-                        )
-                        chapters_created += 1
-                        
-                        # Créer les versets en bulk
-                        verses_to_create = [
-                            Verse(
-                                chapter=chapter,
-                                number=verse_num,
-                                text=verse_text.strip(),
-                                version='APEE'
-                            )
-                            for verse_num, verse_text in enumerate(verses_list, 1)
-                        ]
-                        
-                        Verse.objects.bulk_create(verses_to_create, batch_size=1000)
-                        verses_created += len(verses_to_create)
+            # Les workers reconstruisent leur index en mémoire
+            revision = invalidate_corpus()
             
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'\n✅ Bible chargée avec succès !\n'
-                    f'   📖 {books_created} livres\n'
-                    f'   📑 {chapters_created} chapitres\n'
-                    f'   ✍️  {verses_created} versets\n'
-                    f'   📚 Version: APEE (Assemblées Protestantes Évangéliques)'
+                    f'\n✅ Bible chargée avec succès (révision {revision}) !\n'
+                    f'   📖 {metrics.books_created} livres\n'
+                    f'   📑 {metrics.chapters_created} chapitres\n'
+                    f'   ✍️  {metrics.verses_created} versets\n'
+                    f'   📚 Version: {version}'
                 )
             )
+            self.stdout.write('\n'.join(metrics.report_lines()))
+            
+            # Paquets hors ligne de chaque version (bases des deltas clients)
+            if settings.BIBLE_BUNDLE_AUTO_BUILD:
+                call_command('build_bible_bundles', stdout=self.stdout)
         
-        except json.JSONDecodeError as e:
+        except SourceError as e:
             self.stdout.write(
                 self.style.ERROR(f'❌ Erreur JSON: {str(e)}')
             )
@@ -156,4 +119,32 @@ class Command(BaseCommand):
                 self.style.ERROR(f'❌ Erreur: {str(e)}')
             )
             import traceback
-            traceback.print_exc()
\ No newline at end of file
+            traceback.print_exc()
+    
+    def _progress(self, done):
+        self.stdout.write(f'  ✍️  {done} versets')
+    
+    def _parse_book_entry(self, book_entry, order):
+        """Convertit une entrée `{abbrev, chapters: [[texte, ...], ...]}` au format du chargeur."""
+        abbrev = book_entry.get('abbrev', '').lower()
+        chapters = book_entry.get('chapters', [])
+        
+        return {
+            'name': BOOK_NAMES.get(abbrev, abbrev.upper()),
+            # 39 premiers livres = AT, reste = NT
+            'testament': 'OT' if order <= 39 else 'NT',
+            'order': order,
+            'abbreviation': abbrev.upper(),
+            'chapter_count': len(chapters),
+            'chapters': [
+                {
+                    'number': chapter_num,
+                    'verse_count': len(verses_list),
+                    'verses': [
+                        {'number': verse_num, 'text': verse_text.strip()}
+                        for verse_num, verse_text in enumerate(verses_list, 1)
+                    ],
+                }
+                for chapter_num, verses_list in enumerate(chapters, 1)
+            ],
+        }
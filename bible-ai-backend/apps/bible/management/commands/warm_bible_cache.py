@@ -0,0 +1,33 @@
+"""
+Pré-calcule les réponses JSON des livres et chapitres dans le cache.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.bible.services import current_revision
+from apps.bible.services.rendered import warm_up
+
+
+class Command(BaseCommand):
+    help = 'Pré-rend les réponses livres/chapitres dans le cache (révision courante)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--text',
+            action='store_true',
+            help='Inclut aussi le texte complet de chaque livre (/books/{id}/text/)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        revision = current_revision()
+        
+        self.stdout.write(self.style.WARNING(f'🔥 Préchauffage du cache (révision {revision})...'))
+        count = warm_up(include_text=options['text'])
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ {count} réponses pré-rendues en {time.perf_counter() - started:.2f}s'
+            )
+        )
@@ -0,0 +1,76 @@
+"""
+Synchronisation incrémentale partagée par les commandes de chargement.
+"""
+import json
+
+from django.conf import settings
+from django.core.management import call_command
+
+from apps.bible.services import invalidate_corpus
+from apps.bible.services.loader import sync_version
+
+
+class SyncCommandMixin:
+    """Options `--sync` / `--report` et leur traitement pour une commande de chargement."""
+
+    def add_sync_arguments(self, parser):
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Synchronise la version avec le fichier (seuls les versets modifiés sont écrits, ids conservés)',
+        )
+        parser.add_argument(
+            '--report',
+            type=str,
+            help='Écrit le détail des versets insérés / modifiés / supprimés dans ce fichier JSON',
+        )
+
+    def sync_books(self, books, version, options):
+        self.stdout.write('🔍 Comparaison avec la base de données...')
+        metrics = sync_version(
+            books,
+            version,
+            progress=lambda done: self.stdout.write(f'  ✍️  {done} versets écrits'),
+        )
+        self.finish_sync([(version, metrics)], options)
+        return metrics
+
+    def finish_sync(self, results, options):
+        """Bump the revision if anything changed, write the report and print a summary per version."""
+        changed = any(_changed(metrics) for _, metrics in results)
+        # Sans changement, la révision (et donc tous les caches) reste valide
+        revision = invalidate_corpus() if changed else None
+
+        if options.get('report'):
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump({
+                    'revision': revision,
+                    'versions': [
+                        {'version': version, 'chapters': metrics.changed_chapter_ids(), **metrics.changes}
+                        for version, metrics in results
+                    ],
+                }, f, ensure_ascii=False, indent=2)
+
+        for version, metrics in results:
+            if not _changed(metrics):
+                self.stdout.write(self.style.SUCCESS(f'\n✅ La version {version} est déjà à jour.'))
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'\n✅ Version {version} synchronisée (révision {revision}) !\n'
+                        f'   ➕ {metrics.verses_created} versets ajoutés\n'
+                        f'   ✏️  {metrics.verses_updated} versets modifiés\n'
+                        f'   ➖ {metrics.verses_deleted} versets supprimés\n'
+                        f'   📑 {len(metrics.changed_chapter_ids())} chapitres touchés'
+                        f' ({metrics.books_created} livres, {metrics.chapters_created} chapitres créés)'
+                    )
+                )
+            self.stdout.write('\n'.join(metrics.report_lines()))
+
+        if changed and settings.BIBLE_BUNDLE_AUTO_BUILD:
+            call_command('build_bible_bundles', stdout=self.stdout)
+        return revision
+
+
+def _changed(metrics) -> bool:
+    return bool(metrics.rows_written or metrics.books_created or metrics.chapters_created)
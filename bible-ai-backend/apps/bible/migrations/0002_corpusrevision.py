@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bible', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorpusRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('revision', models.PositiveBigIntegerField(default=0, verbose_name='révision')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='date de mise à jour')),
+            ],
+            options={
+                'verbose_name': 'révision du corpus',
+                'verbose_name_plural': 'révisions du corpus',
+            },
+        ),
+    ]
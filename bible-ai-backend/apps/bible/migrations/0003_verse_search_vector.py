@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:21
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Recherche plein texte PostgreSQL : configuration française sans accents,
+# vecteur maintenu par trigger, index GIN (tsvector) et trigrammes (icontains).
+POSTGRES_FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'french_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION french_unaccent (COPY = french);
+            ALTER TEXT SEARCH CONFIGURATION french_unaccent
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION bible_verse_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector('french_unaccent', COALESCE(NEW.text, ''));
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS bible_verse_search_vector_trigger ON bible_verse",
+    """
+    CREATE TRIGGER bible_verse_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF text ON bible_verse
+        FOR EACH ROW EXECUTE FUNCTION bible_verse_search_vector_update()
+    """,
+    "UPDATE bible_verse SET search_vector = to_tsvector('french_unaccent', COALESCE(text, ''))",
+    "CREATE INDEX IF NOT EXISTS bible_verse_search_vector_gin ON bible_verse USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS bible_verse_text_upper_trgm ON bible_verse USING gin ((UPPER(text::text)) gin_trgm_ops)",
+]
+
+POSTGRES_BACKWARD_SQL = [
+    "DROP INDEX IF EXISTS bible_verse_text_upper_trgm",
+    "DROP INDEX IF EXISTS bible_verse_search_vector_gin",
+    "DROP TRIGGER IF EXISTS bible_verse_search_vector_trigger ON bible_verse",
+    "DROP FUNCTION IF EXISTS bible_verse_search_vector_update()",
+]
+
+
+def run_postgres_sql(statements):
+    """Run raw SQL on PostgreSQL only; other backends (SQLite) skip it."""
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bible', '0002_corpusrevision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verse',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='vecteur de recherche'),
+        ),
+        migrations.RunPython(
+            run_postgres_sql(POSTGRES_FORWARD_SQL),
+            run_postgres_sql(POSTGRES_BACKWARD_SQL),
+        ),
+    ]
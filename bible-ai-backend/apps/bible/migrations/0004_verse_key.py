@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import Least
+
+
+def populate_verse_keys(apps, schema_editor):
+    """Fill book / chapter_number / verse_key from the chapter, one UPDATE per chapter."""
+    Chapter = apps.get_model('bible', 'Chapter')
+    Verse = apps.get_model('bible', 'Verse')
+
+    chapters = Chapter.objects.values_list('id', 'book_id', 'number', 'book__order')
+    for chapter_id, book_id, number, book_order in chapters.iterator():
+        base = book_order * 1_000_000 + min(number, 999) * 1_000
+        Verse.objects.filter(chapter_id=chapter_id).update(
+            book_id=book_id,
+            chapter_number=number,
+            verse_key=base + Least(models.F('number'), models.Value(999)),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bible', '0003_verse_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verse',
+            name='book',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='verses', to='bible.book', verbose_name='livre'),
+        ),
+        migrations.AddField(
+            model_name='verse',
+            name='chapter_number',
+            field=models.IntegerField(editable=False, null=True, verbose_name='numéro de chapitre'),
+        ),
+        migrations.AddField(
+            model_name='verse',
+            name='verse_key',
+            field=models.PositiveIntegerField(editable=False, null=True, verbose_name='clé canonique'),
+        ),
+        migrations.RunPython(populate_verse_keys, migrations.RunPython.noop),
+    ]
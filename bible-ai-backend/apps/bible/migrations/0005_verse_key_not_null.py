@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Séparée de 0004 : PostgreSQL refuse un ALTER TABLE après une mise à jour
+# de clés étrangères dans la même transaction.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bible', '0004_verse_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='verse',
+            name='book',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='verses', to='bible.book', verbose_name='livre'),
+        ),
+        migrations.AlterField(
+            model_name='verse',
+            name='chapter_number',
+            field=models.IntegerField(editable=False, verbose_name='numéro de chapitre'),
+        ),
+        migrations.AlterField(
+            model_name='verse',
+            name='verse_key',
+            field=models.PositiveIntegerField(editable=False, verbose_name='clé canonique'),
+        ),
+        migrations.AlterModelOptions(
+            name='verse',
+            options={'ordering': ['verse_key', 'id'], 'verbose_name': 'verset', 'verbose_name_plural': 'versets'},
+        ),
+        migrations.AddIndex(
+            model_name='verse',
+            index=models.Index(fields=['verse_key', 'id'], name='bible_verse_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='verse',
+            index=models.Index(fields=['book', 'chapter_number', 'number'], name='bible_verse_book_chapter_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bible', '0005_verse_key_not_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorpusBundle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=10, verbose_name='version')),
+                ('digest', models.CharField(max_length=64, unique=True, verbose_name='empreinte SHA-256')),
+                ('format', models.PositiveSmallIntegerField(default=1, verbose_name='format')),
+                ('revision', models.PositiveBigIntegerField(verbose_name='révision du corpus')),
+                ('verse_count', models.PositiveIntegerField(verbose_name='nombre de versets')),
+                ('size', models.PositiveIntegerField(verbose_name='taille (octets)')),
+                ('compressed_size', models.PositiveIntegerField(verbose_name='taille compressée (octets)')),
+                ('content', models.BinaryField(verbose_name='contenu (gzip)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='date de création')),
+            ],
+            options={
+                'verbose_name': 'paquet hors ligne',
+                'verbose_name_plural': 'paquets hors ligne',
+                'ordering': ['version', '-created_at'],
+                'indexes': [models.Index(fields=['version', '-created_at'], name='bible_bundle_version_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bible', '0006_corpusbundle'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='verse',
+            index=models.Index(fields=['version', 'verse_key'], name='bible_verse_version_key_idx'),
+        ),
+    ]
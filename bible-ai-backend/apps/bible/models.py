@@ -1,7 +1,9 @@
 """
 Bible models for books, chapters, and verses.
 """
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 
 
 class Book(models.Model):
@@ -61,19 +63,138 @@ class Verse(models.Model):
     number = models.IntegerField('numéro')
     text = models.TextField('texte')
     
+    # Copies dénormalisées du chapitre pour trier et filtrer sans jointure ;
+    # renseignées par les commandes de chargement et par save().
+    book = models.ForeignKey(
+        Book,
+        on_delete=models.CASCADE,
+        related_name='verses',
+        verbose_name='livre',
+        db_index=False,
+        editable=False
+    )
+    chapter_number = models.IntegerField('numéro de chapitre', editable=False)
+    
+    # Clé canonique BBCCCVVV (livre, chapitre, verset), voir make_key()
+    verse_key = models.PositiveIntegerField('clé canonique', editable=False)
+    
     # Version de la Bible (LSG par défaut)
     version = models.CharField('version', max_length=10, default='LSG')
     
+    # Vecteur plein texte (PostgreSQL uniquement), maintenu par un trigger
+    # et indexé en GIN par la migration 0003 ; reste NULL sous SQLite.
+    search_vector = SearchVectorField('vecteur de recherche', null=True, editable=False)
+    
     class Meta:
         verbose_name = 'verset'
         verbose_name_plural = 'versets'
-        ordering = ['chapter__book__order', 'chapter__number', 'number']
+        ordering = ['verse_key', 'id']
         unique_together = ['chapter', 'number', 'version']
+        indexes = [
+            models.Index(fields=['verse_key', 'id'], name='bible_verse_key_idx'),
+            models.Index(fields=['book', 'chapter_number', 'number'], name='bible_verse_book_chapter_idx'),
+            # Lectures d'une version dans l'ordre canonique (corpus, export, plages)
+            models.Index(fields=['version', 'verse_key'], name='bible_verse_version_key_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.chapter.book.name} {self.chapter.number}:{self.number}"
+        return self.reference
+    
+    def save(self, *args, **kwargs):
+        # Recalculées à chaque enregistrement : le chapitre ou le numéro a pu changer
+        if self.chapter_id is not None:
+            chapter = self.chapter
+            self.book_id = chapter.book_id
+            self.chapter_number = chapter.number
+            self.verse_key = self.make_key(chapter.book.order, chapter.number, self.number)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'book', 'chapter_number', 'verse_key'}
+        super().save(*args, **kwargs)
     
     @property
     def reference(self):
         """Return full verse reference."""
-        return f"{self.chapter.book.name} {self.chapter.number}:{self.number}"
\ No newline at end of file
+        return f"{self.book.name} {self.chapter_number}:{self.number}"
+    
+    @staticmethod
+    def make_key(book_order, chapter_number, verse_number):
+        """
+        Pack a position into an integer that sorts in canonical order:
+        (43, 3, 16) -> 43003016. Chapters and verses are capped at 999.
+        """
+        return (
+            book_order * 1_000_000
+            + min(chapter_number, 999) * 1_000
+            + min(verse_number, 999)
+        )
+
+
+class CorpusRevision(models.Model):
+    """
+    Monotonic revision of the Bible corpus.
+    
+    Bumped every time the corpus is (re)loaded so that every worker can
+    detect that its in-memory copy is stale with a single primary key read.
+    """
+    
+    revision = models.PositiveBigIntegerField('révision', default=0)
+    updated_at = models.DateTimeField('date de mise à jour', auto_now=True)
+    
+    class Meta:
+        verbose_name = 'révision du corpus'
+        verbose_name_plural = 'révisions du corpus'
+    
+    def __str__(self):
+        return f"Révision {self.revision}"
+    
+    @classmethod
+    def current(cls):
+        """Return the current revision number (0 if never bumped)."""
+        return cls.state()[0]
+    
+    @classmethod
+    def state(cls):
+        """Return `(revision, updated_at)`, `(0, None)` if never bumped."""
+        return cls.objects.filter(pk=1).values_list('revision', 'updated_at').first() or (0, None)
+    
+    @classmethod
+    def bump(cls):
+        """Increment the revision and return the new value."""
+        cls.objects.get_or_create(pk=1)
+        cls.objects.filter(pk=1).update(
+            revision=models.F('revision') + 1,
+            updated_at=timezone.now()
+        )
+        return cls.current()
+
+
+class CorpusBundle(models.Model):
+    """
+    Content-addressed offline bundle of one Bible version.
+    
+    The bundle is the gzip of a deterministic NDJSON document; `digest` is
+    the SHA-256 of the uncompressed bytes, so identical content always has
+    the same address and clients can verify what they rebuild from a delta.
+    """
+    
+    version = models.CharField('version', max_length=10)
+    digest = models.CharField('empreinte SHA-256', max_length=64, unique=True)
+    format = models.PositiveSmallIntegerField('format', default=1)
+    revision = models.PositiveBigIntegerField('révision du corpus')
+    verse_count = models.PositiveIntegerField('nombre de versets')
+    size = models.PositiveIntegerField('taille (octets)')
+    compressed_size = models.PositiveIntegerField('taille compressée (octets)')
+    content = models.BinaryField('contenu (gzip)')
+    created_at = models.DateTimeField('date de création', auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'paquet hors ligne'
+        verbose_name_plural = 'paquets hors ligne'
+        ordering = ['version', '-created_at']
+        indexes = [
+            models.Index(fields=['version', '-created_at'], name='bible_bundle_version_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.version} {self.digest[:12]}"
@@ -0,0 +1,168 @@
+"""
+Bible pagination classes.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class SearchResultsPagination(PageNumberPagination):
+    """Pagination for search results (50 per page, like the former cap)."""
+    
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination on a unique ordering.
+    
+    Each page is `WHERE (a, b) > (last_a, last_b) ORDER BY a, b LIMIT n`:
+    no COUNT and no OFFSET, so the 500th page costs the same as the first.
+    The cursor is the opaque URL-safe encoding of the last row's position.
+    
+    Besides querysets, any sequence exposing `seek(position)` (index of the
+    first item after `position`) and `position_at(index)` can be paginated,
+    such as the in-memory corpus slices.
+    """
+    
+    # Champs de tri (préfixe '-' pour décroissant) ; le dernier doit être unique
+    ordering = ('id',)
+    # Type de la valeur de chaque champ de tri dans un curseur (int ou datetime)
+    ordering_types = (int,)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Curseur invalide.'
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        
+        if hasattr(queryset, 'seek'):
+            start = 0 if position is None else queryset.seek(position)
+            items = queryset[start:start + size + 1]
+            self.has_next = len(items) > size
+            items = items[:size]
+            self.next_position = queryset.position_at(start + size - 1) if self.has_next else None
+            return items
+        
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+        items = list(queryset.order_by(*self.ordering)[:size + 1])
+        self.has_next = len(items) > size
+        items = items[:size]
+        self.next_position = self.get_position(items[-1]) if self.has_next else None
+        return items
+    
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+    
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+    
+    def get_position(self, item) -> tuple:
+        """Position of a row: model attributes, or the leading values of a tuple."""
+        if isinstance(item, tuple):
+            return item[:len(self.ordering)]
+        return tuple(getattr(item, field.lstrip('-')) for field in self.ordering)
+    
+    def after(self, position) -> Q:
+        """Rows strictly after `position` in `ordering`, as a row-value comparison."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+    
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+    
+    def encode_cursor(self, position) -> str:
+        values = [value.isoformat() if isinstance(value, datetime) else value for value in position]
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+    
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param, '')
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            position = json.loads(raw)
+        except (binascii.Error, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return tuple(self.decode_value(value, kind) for value, kind in zip(position, self.ordering_types))
+    
+    def decode_value(self, value, kind):
+        """Check a cursor value against its ordering field's type."""
+        if kind is datetime:
+            if isinstance(value, str):
+                try:
+                    return datetime.fromisoformat(value)
+                except ValueError:
+                    pass
+        elif isinstance(value, kind) and not isinstance(value, bool):
+            return value
+        raise NotFound(self.invalid_cursor_message)
+
+
+class PageOrKeysetPagination(PageNumberPagination):
+    """
+    Page numbers by default, keyset pagination when the request has `cursor`.
+    
+    Existing clients keep the `{count, next, previous, results}` format; a
+    client opts in with `?cursor=` (empty for the first page) and then
+    follows the `next` links of the `{next, results}` responses.
+    """
+    
+    keyset_class = KeysetPagination
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+    
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class VerseKeysetPagination(KeysetPagination):
+    """Keyset pagination in canonical verse order."""
+    
+    ordering = ('verse_key', 'id')
+    ordering_types = (int, int)
+
+
+class VersePagination(PageOrKeysetPagination):
+    keyset_class = VerseKeysetPagination
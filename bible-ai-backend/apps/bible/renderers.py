@@ -0,0 +1,40 @@
+"""
+Fast JSON renderer for the Bible endpoints.
+
+Produces the same bytes as DRF's `JSONRenderer` with the default settings
+(compact, UTF-8, U+2028/U+2029 escaped) using orjson when it is installed.
+Bible payloads only hold strings and integers; anything orjson does not
+encode the same way (datetimes, lazy strings, Decimal...) is handed to
+DRF's encoder, and indented output (browsable API) uses DRF itself.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson est optionnel
+    orjson = None
+
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class BibleJSONRenderer(JSONRenderer):
+    """`JSONRenderer` backed by orjson, byte-identical for Bible payloads."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in content:
+                content = content.replace(raw, escaped)
+        return content
@@ -2,15 +2,43 @@
 Bible serializers for API endpoints.
 """
 from rest_framework import serializers
-from .models import Book, Chapter, Verse
+from .models import Book, Chapter, Verse, CorpusBundle
+
+# Champs lus par le chemin rapide (values_list) des versets
+VERSE_ROW_FIELDS = ('id', 'book__name', 'chapter_number', 'number', 'text', 'version')
+
+
+def verse_row(values) -> dict:
+    """
+    Build the `VerseSerializer` output from a `VERSE_ROW_FIELDS` tuple.
+    
+    Read-only hot paths (lists, search, lookups) fetch tuples with
+    `values_list()` and map them here instead of instantiating models and
+    walking serializer fields; the output is identical.
+    """
+    verse_id, book_name, chapter_number, number, text, version = values
+    return {
+        'id': verse_id,
+        'reference': f"{book_name} {chapter_number}:{number}",
+        'book_name': book_name,
+        'chapter_number': chapter_number,
+        'number': number,
+        'text': text,
+        'version': version,
+    }
+
+
+def verse_rows(queryset) -> list:
+    """Fast `VerseSerializer(queryset, many=True).data` equivalent."""
+    return [verse_row(values) for values in queryset.values_list(*VERSE_ROW_FIELDS)]
 
 
 class VerseSerializer(serializers.ModelSerializer):
     """Serializer for verse details."""
     
     reference = serializers.CharField(read_only=True)
-    book_name = serializers.CharField(source='chapter.book.name', read_only=True)
-    chapter_number = serializers.IntegerField(source='chapter.number', read_only=True)
+    book_name = serializers.CharField(source='book.name', read_only=True)
+    chapter_number = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Verse
@@ -87,4 +115,60 @@ class BookListSerializer(serializers.ModelSerializer):
             'order',
             'abbreviation',
             'chapter_count',
-        ]
\ No newline at end of file
+        ]
+
+class BookTextSerializer(serializers.ModelSerializer):
+    """Serializer for a whole book with every chapter and verse."""
+    
+    chapters = ChapterSerializer(many=True, read_only=True)
+    
+    class Meta:
+        model = Book
+        fields = [
+            'id',
+            'name',
+            'testament',
+            'order',
+            'abbreviation',
+            'chapter_count',
+            'chapters',
+        ]
+
+
+class VerseBatchSerializer(serializers.Serializer):
+    """Input of the batch lookup: verse ids and/or textual references."""
+    
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=1000
+    )
+    refs = serializers.ListField(
+        child=serializers.CharField(max_length=200),
+        required=False,
+        default=list,
+        max_length=100
+    )
+    
+    def validate(self, attrs):
+        if not attrs['ids'] and not attrs['refs']:
+            raise serializers.ValidationError('Fournissez au moins un identifiant ou une référence.')
+        return attrs
+
+
+class CorpusBundleSerializer(serializers.ModelSerializer):
+    """Manifest of an offline bundle (its content is served separately)."""
+    
+    class Meta:
+        model = CorpusBundle
+        fields = [
+            'version',
+            'digest',
+            'format',
+            'revision',
+            'verse_count',
+            'size',
+            'compressed_size',
+            'created_at'
+        ]
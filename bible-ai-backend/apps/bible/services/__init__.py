@@ -0,0 +1,25 @@
+# Bible services
+from .corpus import (
+    BibleCorpus,
+    get_corpus,
+    invalidate_corpus,
+    corpus_enabled,
+    available_versions,
+    default_version,
+    current_revision,
+    current_revision_state
+)
+from .search_backends import get_search_backend, PostgresSearchBackend
+
+__all__ = [
+    'BibleCorpus',
+    'get_corpus',
+    'invalidate_corpus',
+    'corpus_enabled',
+    'available_versions',
+    'default_version',
+    'current_revision',
+    'current_revision_state',
+    'get_search_backend',
+    'PostgresSearchBackend',
+]
@@ -0,0 +1,155 @@
+"""
+Offline corpus bundles and their deltas.
+
+A bundle is one Bible version as compact NDJSON, one JSON array per line:
+
+    ["h", 1, "APEE"]                                header: format, version
+    ["b", 67, "Genèse", "OT", 1, "GN"]              book: id, name, testament, order, abbreviation
+    ["c", 411, 1]                                   chapter: id, number
+    ["v", 7372, 1, "Au commencement..."]            verse: id, number, text
+
+The output is deterministic, so the SHA-256 of the bytes (`digest`) is a
+content address: rebuilding an unchanged version yields the same bundle.
+
+A delta rebuilds a target bundle from a base the client already holds. Its
+`ops` are applied in order: `[start, count]` copies base lines, a list of
+strings inserts new lines. One corrected verse costs one inserted line.
+"""
+import gzip
+import hashlib
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.bible.models import CorpusBundle, CorpusRevision, Verse
+from apps.bible.renderers import BibleJSONRenderer
+from .export import database_chapters
+
+BUNDLE_FORMAT = 1
+# Les deltas sont immuables (deux empreintes) : on les garde longtemps
+DELTA_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+
+_renderer = BibleJSONRenderer()
+
+
+def bundle_lines(version: str):
+    """Yield the lines (bytes, without newline) of a version's bundle."""
+    yield _renderer.render(['h', BUNDLE_FORMAT, version])
+
+    current_book = None
+    for book, chapter, verses in database_chapters(version):
+        if book['id'] != current_book:
+            current_book = book['id']
+            yield _renderer.render([
+                'b', book['id'], book['name'], book['testament'], book['order'], book['abbreviation']
+            ])
+        yield _renderer.render(['c', chapter['id'], chapter['number']])
+        for verse in verses:
+            yield _renderer.render(['v', verse['id'], verse['number'], verse['text']])
+
+
+def build_bundle(version: str):
+    """
+    Build the bundle of `version` and store it if its content is new.
+
+    Returns `(bundle, created)`. An unchanged bundle is only marked as the
+    latest one again, which also covers a version reverted to older content.
+    """
+    digest = hashlib.sha256()
+    chunks = []
+    verse_count = size = 0
+
+    for line in bundle_lines(version):
+        line += b'\n'
+        digest.update(line)
+        chunks.append(line)
+        size += len(line)
+        if line.startswith(b'["v"'):
+            verse_count += 1
+
+    content = gzip.compress(b''.join(chunks), compresslevel=9, mtime=0)
+    revision = CorpusRevision.current()
+    bundle, created = CorpusBundle.objects.update_or_create(
+        digest=digest.hexdigest(),
+        defaults={
+            'version': version,
+            'format': BUNDLE_FORMAT,
+            'revision': revision,
+            'verse_count': verse_count,
+            'size': size,
+            'created_at': timezone.now(),
+        },
+        create_defaults={
+            'version': version,
+            'format': BUNDLE_FORMAT,
+            'revision': revision,
+            'verse_count': verse_count,
+            'size': size,
+            'compressed_size': len(content),
+            'content': content,
+        },
+    )
+    return bundle, created
+
+
+def build_bundles(keep: int = None) -> list:
+    """Build the bundle of every loaded version and prune old ones."""
+    if keep is None:
+        keep = getattr(settings, 'BIBLE_BUNDLE_HISTORY', 10)
+
+    results = []
+    versions = Verse.objects.order_by('version').values_list('version', flat=True).distinct()
+    for version in versions:
+        results.append(build_bundle(version))
+        prune_bundles(version, keep)
+    return results
+
+
+def prune_bundles(version: str, keep: int) -> int:
+    """Delete all but the `keep` most recent bundles of a version."""
+    stale = CorpusBundle.objects.filter(version=version).order_by('-created_at').values_list('pk', flat=True)[keep:]
+    deleted, _ = CorpusBundle.objects.filter(pk__in=list(stale)).delete()
+    return deleted
+
+
+def latest_bundles(version: str = None) -> list:
+    """Most recent bundle of each version (content not loaded)."""
+    queryset = CorpusBundle.objects.defer('content').order_by('version', '-created_at')
+    if version is not None:
+        queryset = queryset.filter(version=version)
+
+    latest = {}
+    for bundle in queryset:
+        latest.setdefault(bundle.version, bundle)
+    return list(latest.values())
+
+
+def bundle_delta(base: CorpusBundle, target: CorpusBundle) -> bytes:
+    """Gzipped JSON delta rebuilding `target` from `base`, cached by digests."""
+    key = f'bible:bundle-delta:{base.digest}:{target.digest}'
+    payload = cache.get(key)
+    if payload is None:
+        payload = gzip.compress(_renderer.render({
+            'from': base.digest,
+            'to': target.digest,
+            'ops': diff_lines(_lines(base), _lines(target)),
+        }), compresslevel=9, mtime=0)
+        cache.set(key, payload, DELTA_CACHE_TIMEOUT)
+    return payload
+
+
+def diff_lines(base: list, target: list) -> list:
+    ops = []
+    matcher = SequenceMatcher(None, base, target, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2 - i1])
+        elif tag in ('replace', 'insert'):
+            ops.append([line.decode() for line in target[j1:j2]])
+    return ops
+
+
+def _lines(bundle: CorpusBundle) -> list:
+    return gzip.decompress(bundle.content).splitlines()
@@ -0,0 +1,464 @@
+"""
+In-memory, read-only index of the Bible corpus.
+
+The corpus only changes when `load_bible_data` / `download_bible` run, so each
+worker keeps a compact snapshot of books, chapters and verses and serves the
+read endpoints from it instead of joining three tables on every request.
+"""
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+from django.db.models import Count, Min
+from apps.bible.models import Book, Chapter, Verse, CorpusRevision
+from apps.bible.renderers import BibleJSONRenderer
+from .references import BookAliases
+from .search import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusSlice:
+    """
+    Lazy sequence of output rows over a contiguous range of indexes.
+
+    Rows are only built for the items actually sliced out, which is what the
+    paginator does, so a 20-item page costs 20 dicts whatever the range size.
+
+    When the indexes follow a known order, `position` maps an index to its
+    sort key and enables keyset pagination (`seek` / `position_at`).
+    """
+
+    def __init__(self, indexes: range, row_builder, position=None):
+        self.indexes = indexes
+        self.row_builder = row_builder
+        self.position = position
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.row_builder(i) for i in self.indexes[item]]
+        return self.row_builder(self.indexes[item])
+
+    def __iter__(self):
+        return (self.row_builder(i) for i in self.indexes)
+
+    def seek(self, position) -> int:
+        """Offset of the first item strictly after `position`."""
+        return bisect_right(self.indexes, tuple(position), key=self.position)
+
+    def position_at(self, offset: int) -> tuple:
+        return self.position(self.indexes[offset])
+
+
+class BibleCorpus:
+    """
+    Immutable snapshot of the Bible corpus.
+
+    Books, chapters and verses are stored in canonical order (book order,
+    chapter number, verse number) in parallel arrays. Each book knows the
+    range of its chapters and each chapter the range of its verses, so any
+    book/chapter filter is an index range instead of a query.
+    """
+
+    def __init__(self, revision: int, books, chapters, verses, updated_at=None, version=None):
+        self.revision = revision
+        self.version = version
+        self.updated_at = updated_at
+
+        # Books: small, kept as tuples (id, name, testament, order, abbreviation, chapter_count)
+        self.books = [tuple(book) for book in books]
+        self.book_index = {book[0]: idx for idx, book in enumerate(self.books)}
+        self.book_order_index = {book[3]: idx for idx, book in enumerate(self.books)}
+
+        # Chapters
+        self.chapter_ids = array('q')
+        self.chapter_books = array('i')
+        self.chapter_numbers = array('i')
+        self.chapter_verse_counts = array('i')
+        self.book_offsets = array('i', [0] * (len(self.books) + 1))
+
+        for chapter_id, book_id, number, verse_count in chapters:
+            book_idx = self.book_index[book_id]
+            self.chapter_ids.append(chapter_id)
+            self.chapter_books.append(book_idx)
+            self.chapter_numbers.append(number)
+            self.chapter_verse_counts.append(verse_count)
+            self.book_offsets[book_idx + 1] += 1
+
+        for idx in range(len(self.books)):
+            self.book_offsets[idx + 1] += self.book_offsets[idx]
+
+        self.chapter_index = {
+            chapter_id: idx for idx, chapter_id in enumerate(self.chapter_ids)
+        }
+        # (book index, chapter number) -> chapter index
+        self.chapter_lookup = {
+            (self.chapter_books[idx], self.chapter_numbers[idx]): idx
+            for idx in range(len(self.chapter_ids))
+        }
+
+        # Verses
+        self.verse_ids = array('q')
+        self.verse_keys = array('q')
+        self.verse_chapters = array('i')
+        self.verse_numbers = array('i')
+        self.verse_texts = []
+        self.verse_versions = []
+        self.chapter_offsets = array('i', [0] * (len(self.chapter_ids) + 1))
+
+        interned_versions = {}
+        for verse_id, chapter_id, number, verse_key, text, version in verses:
+            chapter_idx = self.chapter_index[chapter_id]
+            self.verse_ids.append(verse_id)
+            self.verse_keys.append(verse_key)
+            self.verse_chapters.append(chapter_idx)
+            self.verse_numbers.append(number)
+            self.verse_texts.append(text)
+            self.verse_versions.append(interned_versions.setdefault(version, version))
+            self.chapter_offsets[chapter_idx + 1] += 1
+
+        for idx in range(len(self.chapter_ids)):
+            self.chapter_offsets[idx + 1] += self.chapter_offsets[idx]
+
+        # Chapter.verse_count vaut pour toutes les versions : celui d'un
+        # instantané de version est le nombre de ses propres versets
+        if version is not None:
+            for idx in range(len(self.chapter_ids)):
+                self.chapter_verse_counts[idx] = self.chapter_offsets[idx + 1] - self.chapter_offsets[idx]
+
+        self.verse_index = {
+            verse_id: idx for idx, verse_id in enumerate(self.verse_ids)
+        }
+
+        # Lazily rendered JSON payloads, dropped together with the snapshot
+        self._rendered = {}
+        self._renderer = BibleJSONRenderer()
+
+        # Auxiliary structures (search index, reference aliases...) built on demand
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    @classmethod
+    def build(cls, revision: int, updated_at=None, version: str = None) -> 'BibleCorpus':
+        """Load the corpus of one version (all verses if None) with three flat queries."""
+        started = time.perf_counter()
+
+        books = Book.objects.order_by('order').values_list(
+            'id', 'name', 'testament', 'order', 'abbreviation', 'chapter_count'
+        )
+        chapters = Chapter.objects.order_by('book__order', 'number', 'id').values_list(
+            'id', 'book_id', 'number', 'verse_count'
+        )
+        verses = Verse.objects.order_by('verse_key', 'id').values_list(
+            'id', 'chapter_id', 'number', 'verse_key', 'text', 'version'
+        )
+        if version is not None:
+            verses = verses.filter(version=version)
+
+        corpus = cls(revision, books, chapters, verses.iterator(chunk_size=5000), updated_at, version)
+
+        logger.info(
+            "Bible corpus r%s (%s) built: %s books, %s chapters, %s verses in %.2fs",
+            revision,
+            version or '*',
+            len(corpus.books),
+            len(corpus.chapter_ids),
+            len(corpus.verse_ids),
+            time.perf_counter() - started
+        )
+        return corpus
+
+    # ─── Ranges ──────────────────────────────────────────────────────────
+
+    def book_chapter_range(self, book_idx: int) -> range:
+        return range(self.book_offsets[book_idx], self.book_offsets[book_idx + 1])
+
+    def book_verse_range(self, book_idx: int) -> range:
+        chapters = self.book_chapter_range(book_idx)
+        return range(
+            self.chapter_offsets[chapters.start],
+            self.chapter_offsets[chapters.stop]
+        )
+
+    def chapter_verse_range(self, chapter_idx: int) -> range:
+        return range(self.chapter_offsets[chapter_idx], self.chapter_offsets[chapter_idx + 1])
+
+    def key_range(self, start_key: int, end_key: int) -> range:
+        """Verse indexes whose canonical key lies in [start_key, end_key]."""
+        start = bisect_left(self.verse_keys, start_key)
+        return range(start, max(start, bisect_right(self.verse_keys, end_key)))
+
+    def testament_verse_ranges(self, testament: str) -> list:
+        """Verse index ranges of a testament, contiguous books merged."""
+        ranges = []
+        for book_idx, book in enumerate(self.books):
+            if book[2] != testament:
+                continue
+            verses = self.book_verse_range(book_idx)
+            if ranges and ranges[-1].stop == verses.start:
+                ranges[-1] = range(ranges[-1].start, verses.stop)
+            elif verses:
+                ranges.append(verses)
+        return ranges
+
+    # ─── Rows (same shape as the DRF serializers) ────────────────────────
+
+    def book_row(self, book_idx: int) -> dict:
+        book_id, name, testament, order, abbreviation, chapter_count = self.books[book_idx]
+        return {
+            'id': book_id,
+            'name': name,
+            'testament': testament,
+            'order': order,
+            'abbreviation': abbreviation,
+            'chapter_count': chapter_count,
+        }
+
+    def book_detail(self, book_idx: int) -> dict:
+        row = self.book_row(book_idx)
+        row['chapters'] = [
+            self.chapter_row(idx) for idx in self.book_chapter_range(book_idx)
+        ]
+        return row
+
+    def chapter_row(self, chapter_idx: int) -> dict:
+        return {
+            'id': self.chapter_ids[chapter_idx],
+            'book_name': self.books[self.chapter_books[chapter_idx]][1],
+            'number': self.chapter_numbers[chapter_idx],
+            'verse_count': self.chapter_verse_counts[chapter_idx],
+        }
+
+    def chapter_detail(self, chapter_idx: int) -> dict:
+        row = self.chapter_row(chapter_idx)
+        row['verses'] = [
+            self.verse_row(idx) for idx in self.chapter_verse_range(chapter_idx)
+        ]
+        return row
+
+    def verse_row(self, verse_idx: int) -> dict:
+        chapter_idx = self.verse_chapters[verse_idx]
+        book_name = self.books[self.chapter_books[chapter_idx]][1]
+        chapter_number = self.chapter_numbers[chapter_idx]
+        number = self.verse_numbers[verse_idx]
+        return {
+            'id': self.verse_ids[verse_idx],
+            'reference': f"{book_name} {chapter_number}:{number}",
+            'book_name': book_name,
+            'chapter_number': chapter_number,
+            'number': number,
+            'text': self.verse_texts[verse_idx],
+            'version': self.verse_versions[verse_idx],
+        }
+
+    def find_chapter(self, book_idx: int, number: int):
+        """Return the index of chapter `number` of a book, or None."""
+        return self.chapter_lookup.get((book_idx, number))
+
+    def derived(self, name: str, factory):
+        """Build an auxiliary structure once for this snapshot and return it."""
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    started = time.perf_counter()
+                    value = self._derived[name] = factory(self)
+                    logger.info(
+                        "Bible corpus r%s: %s built in %.2fs",
+                        self.revision,
+                        name,
+                        time.perf_counter() - started
+                    )
+        return value
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Full-text index, built on first use for this snapshot."""
+        return self.derived('search index', SearchIndex)
+
+    @property
+    def book_aliases(self) -> BookAliases:
+        """Book name lookup table including the names actually loaded."""
+        return self.derived('book aliases', lambda corpus: BookAliases(
+            (book[3], book[1], book[4]) for book in corpus.books
+        ))
+
+    # ─── Pre-rendered JSON ───────────────────────────────────────────────
+
+    def chapter_json(self, chapter_idx: int) -> bytes:
+        """Chapter detail (with all its verses) rendered once to JSON bytes."""
+        key = ('chapter', chapter_idx)
+        content = self._rendered.get(key)
+        if content is None:
+            content = self._renderer.render(self.chapter_detail(chapter_idx))
+            self._rendered[key] = content
+        return content
+
+    def book_text_json(self, book_idx: int) -> bytes:
+        """
+        Whole book with every chapter and verse, as JSON bytes.
+
+        Built by splicing the cached chapter payloads into the book header,
+        so nothing is re-serialized once the chapters have been rendered.
+        """
+        header = self._renderer.render(self.book_row(book_idx))
+        chapters = b','.join(
+            self.chapter_json(idx) for idx in self.book_chapter_range(book_idx)
+        )
+        return header[:-1] + b',"chapters":[' + chapters + b']}'
+
+    # ─── Querying ────────────────────────────────────────────────────────
+
+    def books_slice(self) -> CorpusSlice:
+        return CorpusSlice(range(len(self.books)), self.book_row)
+
+    def chapters_slice(self, book_id: int = None) -> CorpusSlice:
+        if book_id is None:
+            indexes = range(len(self.chapter_ids))
+        elif book_id in self.book_index:
+            indexes = self.book_chapter_range(self.book_index[book_id])
+        else:
+            indexes = range(0)
+        return CorpusSlice(indexes, self.chapter_row)
+
+    def verses_slice(self, book_id: int = None, chapter_id: int = None) -> CorpusSlice:
+        indexes = range(len(self.verse_ids))
+
+        if chapter_id is not None:
+            chapter_idx = self.chapter_index.get(chapter_id)
+            if chapter_idx is None:
+                indexes = range(0)
+            elif book_id is not None and self.books[self.chapter_books[chapter_idx]][0] != book_id:
+                indexes = range(0)
+            else:
+                indexes = self.chapter_verse_range(chapter_idx)
+        elif book_id is not None:
+            book_idx = self.book_index.get(book_id)
+            indexes = range(0) if book_idx is None else self.book_verse_range(book_idx)
+
+        return CorpusSlice(indexes, self.verse_row, self.verse_position)
+
+    def verse_position(self, verse_idx: int) -> tuple:
+        """Canonical sort key of a verse, `(verse_key, id)`."""
+        return self.verse_keys[verse_idx], self.verse_ids[verse_idx]
+
+    def search_slice(self, query: str) -> CorpusSlice:
+        """Ranked full-text hits, as verse rows."""
+        return CorpusSlice(self.search_index.search(query), self.verse_row)
+
+
+# Snapshots of the current revision, one per Bible version
+_corpora = {}
+# (revision, updated_at) and loaded versions [(version, verse_count)], first loaded first
+_revision_state = None
+_versions = []
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def corpus_enabled() -> bool:
+    """Whether the read endpoints should be served from memory."""
+    return getattr(settings, 'BIBLE_CORPUS_IN_MEMORY', True)
+
+
+def _refresh():
+    """
+    Re-read the revision row at most every `BIBLE_CORPUS_REFRESH_SECONDS`.
+
+    When it changed, the version list is reloaded and every snapshot is
+    dropped; they are rebuilt on first use.
+    """
+    global _corpora, _revision_state, _versions, _checked_at
+
+    interval = getattr(settings, 'BIBLE_CORPUS_REFRESH_SECONDS', 30)
+    if _revision_state is not None and time.monotonic() - _checked_at < interval:
+        return
+
+    with _lock:
+        if _revision_state is not None and time.monotonic() - _checked_at < interval:
+            return
+        state = CorpusRevision.state()
+        if _revision_state is None or _revision_state[0] != state[0]:
+            _versions = list(
+                Verse.objects.values('version')
+                .annotate(count=Count('id'), first=Min('id'))
+                .order_by('first')
+                .values_list('version', 'count')
+            )
+            _corpora = {}
+        _revision_state = state
+        _checked_at = time.monotonic()
+
+
+def available_versions() -> list:
+    """Loaded versions as `[(version, verse_count)]`, the first loaded first."""
+    _refresh()
+    return _versions
+
+
+def default_version() -> str:
+    """
+    Version served when a request does not name one: `BIBLE_DEFAULT_VERSION`
+    when it is loaded, otherwise the first loaded version.
+    """
+    configured = getattr(settings, 'BIBLE_DEFAULT_VERSION', '')
+    versions = [version for version, _ in available_versions()]
+    if configured in versions or not versions:
+        return configured or Verse._meta.get_field('version').default
+    return versions[0]
+
+
+def get_corpus(version: str = None) -> BibleCorpus:
+    """
+    Return this worker's snapshot of a version (default version if None).
+
+    The revision row is checked at most every `BIBLE_CORPUS_REFRESH_SECONDS`,
+    so between checks serving a request costs no query at all.
+    """
+    _refresh()
+    if version is None:
+        version = default_version()
+
+    corpus = _corpora.get(version)
+    if corpus is not None:
+        return corpus
+
+    with _lock:
+        corpus = _corpora.get(version)
+        if corpus is None:
+            revision, updated_at = _revision_state
+            corpus = _corpora[version] = BibleCorpus.build(revision, updated_at, version)
+        return corpus
+
+
+def current_revision() -> int:
+    """Return the corpus revision, re-read at most every refresh interval."""
+    return current_revision_state()[0]
+
+
+def current_revision_state() -> tuple:
+    """Return `(revision, updated_at)` of the corpus being served."""
+    _refresh()
+    return _revision_state
+
+
+def invalidate_corpus() -> int:
+    """
+    Bump the corpus revision after a reload.
+
+    The local snapshots are dropped on the next access; other workers pick
+    up the new revision on their next check.
+    """
+    global _checked_at
+
+    revision = CorpusRevision.bump()
+    with _lock:
+        _checked_at = 0.0
+    return revision
@@ -0,0 +1,159 @@
+"""
+Streaming export of one version of the corpus.
+
+Verses are read in canonical order, from the in-memory corpus when enabled
+or through a server-side cursor (`iterator(chunk_size=...)`) otherwise, and
+encoded a chapter at a time, so memory stays flat whatever the corpus size.
+
+Formats:
+- 'ndjson': one line per chapter, `{"book": {...}, "chapter": {...}, "verses": [...]}`
+- 'json':   `{"revision": N, "version": V, "books": [{..., "chapters": [{..., "verses": [...]}]}]}`
+"""
+import zlib
+from itertools import groupby
+
+from apps.bible.models import Book, Verse
+from apps.bible.renderers import BibleJSONRenderer
+from .corpus import get_corpus, corpus_enabled, current_revision, available_versions, default_version
+
+EXPORT_FORMATS = ('ndjson', 'json')
+
+# Taille des lots lus en base et des blocs émis
+DB_CHUNK_SIZE = 2000
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+_renderer = BibleJSONRenderer()
+
+
+def version_exists(version: str) -> bool:
+    return version in dict(available_versions())
+
+
+def export_chapters(version: str = None):
+    """
+    Return `(revision, chapters)` where `chapters` iterates over
+    `(book, chapter, verses)` dicts of `version` (the default one if None)
+    in canonical order. Chapters without verses are skipped.
+    """
+    version = version or default_version()
+    if corpus_enabled():
+        corpus = get_corpus(version)
+        return corpus.revision, _corpus_chapters(corpus)
+    return current_revision(), database_chapters(version)
+
+
+def _book(book_id, name, testament, order, abbreviation) -> dict:
+    return {
+        'id': book_id,
+        'name': name,
+        'testament': testament,
+        'order': order,
+        'abbreviation': abbreviation,
+    }
+
+
+def _verse(verse_id, number, verse_key, text, version) -> dict:
+    return {
+        'id': verse_id,
+        'number': number,
+        'verse_key': verse_key,
+        'text': text,
+        'version': version,
+    }
+
+
+def _corpus_chapters(corpus):
+    for chapter_idx, chapter_id in enumerate(corpus.chapter_ids):
+        verses = [
+            _verse(
+                corpus.verse_ids[idx], corpus.verse_numbers[idx], corpus.verse_keys[idx],
+                corpus.verse_texts[idx], corpus.verse_versions[idx]
+            )
+            for idx in corpus.chapter_verse_range(chapter_idx)
+        ]
+        if verses:
+            book = _book(*corpus.books[corpus.chapter_books[chapter_idx]][:5])
+            chapter = {'id': chapter_id, 'number': corpus.chapter_numbers[chapter_idx]}
+            yield book, chapter, verses
+
+
+def database_chapters(version):
+    books = {
+        values[0]: _book(*values)
+        for values in Book.objects.values_list('id', 'name', 'testament', 'order', 'abbreviation')
+    }
+
+    queryset = Verse.objects.order_by('verse_key', 'id')
+    if version is not None:
+        queryset = queryset.filter(version=version)
+    rows = queryset.values_list(
+        'book_id', 'chapter_id', 'chapter_number', 'id', 'number', 'verse_key', 'text', 'version'
+    ).iterator(chunk_size=DB_CHUNK_SIZE)
+
+    for (book_id, chapter_id, chapter_number), verses in groupby(rows, key=lambda row: row[:3]):
+        chapter = {'id': chapter_id, 'number': chapter_number}
+        yield books[book_id], chapter, [_verse(*row[3:]) for row in verses]
+
+
+def iter_ndjson(chapters):
+    for book, chapter, verses in chapters:
+        yield _renderer.render({'book': book, 'chapter': chapter, 'verses': verses}) + b'\n'
+
+
+def iter_json(chapters, header: dict):
+    """Nested document: chapters are grouped under their book as they come."""
+    yield _renderer.render(header)[:-1] + b',"books":['
+
+    current_book = None
+    for book, chapter, verses in chapters:
+        if book['id'] != current_book:
+            prefix = b']},' if current_book is not None else b''
+            yield prefix + _renderer.render(book)[:-1] + b',"chapters":['
+            current_book, separator = book['id'], b''
+        yield separator + _renderer.render({**chapter, 'verses': verses})
+        separator = b','
+
+    if current_book is not None:
+        yield b']}'
+    yield b']}'
+
+
+def buffered(chunks, size: int = OUTPUT_CHUNK_SIZE):
+    """Regroup small byte chunks into blocks of about `size` bytes."""
+    buffer, length = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield b''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzip_stream(chunks, level: int = 6):
+    """Gzip a byte stream on the fly (same framing as `gzip.compress`)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(output: str = 'ndjson', version: str = None, compress: bool = False):
+    """Return `(revision, chunks)`: the encoded export as an iterator of bytes."""
+    if output not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu : {output}")
+
+    version = version or default_version()
+    revision, chapters = export_chapters(version)
+    if output == 'ndjson':
+        chunks = iter_ndjson(chapters)
+    else:
+        chunks = iter_json(chapters, {'revision': revision, 'version': version})
+
+    chunks = buffered(chunks)
+    if compress:
+        chunks = gzip_stream(chunks)
+    return revision, chunks
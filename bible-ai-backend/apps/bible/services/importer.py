@@ -0,0 +1,96 @@
+"""
+Multi-version import: parsing in a process pool, writing in this process.
+
+Each source is parsed and normalised by a `sources.prepare_source` worker
+of a `ProcessPoolExecutor`, which spools its books to a temporary file.
+The calling process is the single writer: it loads the versions in the
+order given (so ids do not depend on which file parses first), as soon as
+each one is ready, in one transaction with the secondary indexes dropped
+once for all versions. The transaction only opens once the first version is
+parsed, so readers are not locked out while the workers parse.
+"""
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.db import connections, transaction
+
+from .loader import LoadMetrics, indexes_dropped, load_version, sync_version
+from .sources import iter_normalized_books, iter_prepared_books, prepare_source
+
+
+def default_workers(source_count: int) -> int:
+    return max(1, min(source_count, os.cpu_count() or 1))
+
+
+def import_versions(sources, workers: int = None, sync: bool = False, replace: bool = False,
+                    drop_indexes: bool = True, progress=None):
+    """
+    Import `sources`, a list of `(version, path)` pairs.
+
+    Each version is loaded with `load_version` (`replace` drops its old
+    verses) or, with `sync`, diffed with `sync_version`. `progress(version,
+    prepared, metrics)` is called after each version is written, `prepared`
+    being the worker's counts and parsing time (None when parsed inline).
+
+    Returns `(metrics, results)`: the overall `LoadMetrics` (index phases
+    and time spent waiting for workers) and `(version, metrics)` pairs.
+    """
+    if workers is None:
+        workers = default_workers(len(sources))
+
+    overall = LoadMetrics()
+    results = []
+
+    def write(version, books, prepared):
+        if sync:
+            metrics = sync_version(books, version)
+        else:
+            metrics = load_version(books, version, replace=replace, drop_indexes=False)
+        results.append((version, metrics))
+        overall.books_created += metrics.books_created
+        overall.chapters_created += metrics.chapters_created
+        overall.verses_created += metrics.verses_created
+        overall.verses_updated += metrics.verses_updated
+        overall.verses_deleted += metrics.verses_deleted
+        if progress is not None:
+            progress(version, prepared, metrics)
+
+    def write_all(items):
+        # Une synchronisation écrit peu : les index restent en place
+        with transaction.atomic(), indexes_dropped(overall, enabled=drop_indexes and not sync):
+            for version, books, prepared in items:
+                write(version, books, prepared)
+
+    if workers <= 1 or len(sources) <= 1:
+        write_all((version, iter_normalized_books(path), None) for version, path in sources)
+        return overall, results
+
+    with tempfile.TemporaryDirectory(prefix='bible-import-') as directory:
+        # Les workers forkés ne doivent pas hériter (ni fermer) la connexion du
+        # processus écrivain, qui se reconnecte à sa prochaine requête
+        connections.close_all()
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+        try:
+            futures = [
+                executor.submit(prepare_source, path, os.path.join(directory, f'{position}.pickle'))
+                for position, (_, path) in enumerate(sources)
+            ]
+
+            def ready():
+                for (version, _), future in zip(sources, futures):
+                    with overall.phase('attente des workers'):
+                        prepared = future.result()
+                    yield version, iter_prepared_books(prepared['spool']), prepared
+
+            # Première source prête avant d'ouvrir la transaction : le verrou
+            # des index supprimés (ACCESS EXCLUSIVE sous PostgreSQL) ne couvre
+            # que l'écriture, pas l'analyse des fichiers par les workers
+            with overall.phase('attente des workers'):
+                futures[0].result()
+            write_all(ready())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return overall, results
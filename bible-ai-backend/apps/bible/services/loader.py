@@ -0,0 +1,465 @@
+"""
+Bulk loading of one Bible version.
+
+Books are consumed from an iterable (typically the generator of
+`sources.iter_source_books`) in batches of about `COPY_BATCH_SIZE` verses,
+so memory stays bounded, and written in a single transaction:
+
+1. the secondary indexes of the verse table (B-tree, GIN, trigram) are
+   dropped, their definitions kept;
+2. for each batch, missing books and chapters are bulk-inserted (they are
+   shared between versions) and their ids read back with one query each,
+   then verses are streamed with PostgreSQL `COPY` (batched `bulk_create`
+   on other backends);
+3. the indexes are rebuilt from the saved definitions and, on PostgreSQL,
+   the table is analysed.
+
+Input books use the shape produced by the loading commands:
+
+    {'name', 'testament', 'order', 'abbreviation', 'chapter_count',
+     'chapters': [{'number', 'verse_count', 'verses': [{'number', 'text'}]}]}
+
+`sync_version` is the incremental alternative: it diffs the input against
+the version in the database and only writes the verses that changed, so
+ids stay stable.
+
+`LoadMetrics` records the duration and row count of every phase.
+"""
+import hashlib
+import io
+import time
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.db.models import Count
+
+from apps.bible.models import Book, Chapter, Verse
+
+# Lignes par commande COPY / par INSERT groupé
+COPY_BATCH_SIZE = 10_000
+BULK_BATCH_SIZE = 2_000
+DB_CHUNK_SIZE = 2_000
+# Identifiants par clause IN (limite de paramètres de SQLite)
+ID_BATCH_SIZE = 900
+
+VERSE_COLUMNS = ('chapter_id', 'book_id', 'chapter_number', 'number', 'verse_key', 'text', 'version')
+
+# Échappements du format texte de COPY
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+class LoadMetrics:
+    """Phase timings and row counts of a load."""
+
+    def __init__(self):
+        self.phases = []
+        self.books_created = 0
+        self.chapters_created = 0
+        self.verses_deleted = 0
+        self.verses_created = 0
+        self.verses_updated = 0
+        # Détail des versets touchés par une synchronisation
+        self.changes = {'inserted': [], 'updated': [], 'deleted': []}
+
+    @contextmanager
+    def phase(self, label: str):
+        """
+        Time a phase; the yielded dict accumulates its row count (`rows`).
+        A phase entered again (one per batch) adds to the same entry.
+        """
+        entry = next((entry for entry in self.phases if entry['label'] == label), None)
+        if entry is None:
+            entry = {'label': label, 'rows': 0, 'seconds': 0.0}
+            self.phases.append(entry)
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['seconds'] += time.perf_counter() - started
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(entry['seconds'] for entry in self.phases)
+
+    @property
+    def rows_written(self) -> int:
+        return self.verses_created + self.verses_updated + self.verses_deleted
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_written / self.total_seconds if self.total_seconds else 0.0
+
+    def changed_chapter_ids(self) -> list:
+        return sorted({change['chapter_id'] for changes in self.changes.values() for change in changes})
+
+    def report_lines(self, total: bool = True) -> list:
+        lines = []
+        for entry in self.phases:
+            line = f"   ⏱️  {entry['label']:<26} {entry['seconds']:7.2f}s"
+            if entry['rows'] and entry['seconds']:
+                line += f"  {entry['rows']} lignes ({entry['rows'] / entry['seconds']:,.0f}/s)"
+            lines.append(line)
+        if not total:
+            return lines
+        lines.append(
+            f"   ⏱️  {'total':<26} {self.total_seconds:7.2f}s  "
+            f"{self.rows_written} lignes écrites ({self.rows_per_second:,.0f}/s)"
+        )
+        return lines
+
+
+def load_version(books, version: str, replace: bool = False, drop_indexes: bool = True, progress=None):
+    """
+    Load `books` as `version` and return the `LoadMetrics`.
+
+    `books` may be a generator: it is consumed in batches of about
+    `COPY_BATCH_SIZE` verses. `replace` deletes the verses already loaded
+    for this version (in the same transaction). `progress(done)` is called
+    after each batch with the number of verses inserted so far.
+    """
+    metrics = LoadMetrics()
+
+    with transaction.atomic():
+        if replace:
+            with metrics.phase('suppression') as entry:
+                _, deleted = Verse.objects.filter(version=version).delete()
+                metrics.verses_deleted = deleted.get(Verse._meta.label, 0)
+                entry['rows'] = metrics.verses_deleted
+
+        with indexes_dropped(metrics, enabled=drop_indexes):
+            for batch in book_batches(books, metrics):
+                chapters, book_ids, chapter_ids = _prepare_batch(batch, metrics)
+
+                with metrics.phase('lignes des versets') as entry:
+                    rows = _verse_rows(chapters, book_ids, chapter_ids, version)
+                    entry['rows'] += len(rows)
+
+                with metrics.phase(_insert_label()) as entry:
+                    for _ in insert_verses(rows):
+                        pass
+                    entry['rows'] += len(rows)
+                    metrics.verses_created += len(rows)
+
+                if progress is not None:
+                    progress(metrics.verses_created)
+
+        if connection.vendor == 'postgresql':
+            with metrics.phase('analyse'):
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(Verse._meta.db_table)}')
+
+    return metrics
+
+
+@contextmanager
+def indexes_dropped(metrics, enabled: bool = True):
+    """
+    Drop the secondary indexes of the verse table for the duration of the
+    block and rebuild them afterwards. Must run inside a transaction: on
+    error the rollback restores them.
+    """
+    indexes = secondary_indexes(Verse._meta.db_table) if enabled else []
+    if indexes:
+        with metrics.phase(f'suppression de {len(indexes)} index'):
+            _drop_indexes(indexes)
+    yield
+    if indexes:
+        with metrics.phase(f'reconstruction de {len(indexes)} index'):
+            _create_indexes(indexes)
+
+
+def book_batches(books, metrics, size: int = COPY_BATCH_SIZE):
+    """Group books into lists of about `size` verses (reading time goes to 'lecture')."""
+    batch, count = [], 0
+    books = iter(books)
+    while True:
+        with metrics.phase('lecture') as entry:
+            book = next(books, None)
+            if book is not None:
+                entry['rows'] += 1
+        if book is None:
+            break
+        batch.append(book)
+        count += sum(len(chapter['verses']) for chapter in book['chapters'])
+        if count >= size:
+            yield batch
+            batch, count = [], 0
+    if batch:
+        yield batch
+
+
+def _prepare_batch(batch, metrics):
+    chapters = [(book['order'], chapter) for book in batch for chapter in book['chapters']]
+    with metrics.phase('livres et chapitres') as entry:
+        created = metrics.books_created + metrics.chapters_created
+        book_ids, chapter_ids = _ensure_books_and_chapters(batch, chapters, metrics)
+        entry['rows'] += metrics.books_created + metrics.chapters_created - created
+    return chapters, book_ids, chapter_ids
+
+
+def _verse_rows(chapters, book_ids, chapter_ids, version) -> list:
+    return [
+        (
+            chapter_ids[order, chapter['number']], book_ids[order], chapter['number'],
+            verse['number'], Verse.make_key(order, chapter['number'], verse['number']),
+            verse['text'], version
+        )
+        for order, chapter in chapters
+        for verse in chapter['verses']
+    ]
+
+
+def _insert_label() -> str:
+    return 'insertion (COPY)' if connection.vendor == 'postgresql' else 'insertion (bulk_create)'
+
+
+def _id_batches(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), ID_BATCH_SIZE):
+        yield ids[start:start + ID_BATCH_SIZE]
+
+
+def content_hash(book_id, chapter_number, verse_key, text) -> bytes:
+    """Digest of the stored content of a verse (everything but its identity)."""
+    payload = f'{book_id}\t{chapter_number}\t{verse_key}\t{text}'
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+
+def sync_version(books, version: str, progress=None):
+    """
+    Bring `version` in line with `books`, writing only what differs, and
+    return the `LoadMetrics` (see `metrics.changes`).
+
+    Verses are matched on (chapter, number) and compared by `content_hash`:
+    unchanged verses are not touched, changed ones are updated in place
+    (same id), new ones inserted and missing ones deleted, in a single
+    transaction. Missing books and chapters are added (chapters are shared
+    by every version and never deleted); the `verse_count` of the touched
+    chapters and the `chapter_count` of books that gained chapters are
+    recomputed. `books` is consumed in batches like in `load_version`.
+    """
+    metrics = LoadMetrics()
+    seen_chapters = set()
+
+    with transaction.atomic():
+        for batch in book_batches(books, metrics):
+            chapters, book_ids, chapter_ids = _prepare_batch(batch, metrics)
+            rows = _verse_rows(chapters, book_ids, chapter_ids, version)
+            batch_chapters = {row[0] for row in rows}
+            seen_chapters.update(batch_chapters)
+
+            with metrics.phase('comparaison') as entry:
+                incoming = {(row[0], row[3]): row for row in rows}
+                updates, deleted_ids = [], []
+                for chapter_batch in _id_batches(batch_chapters):
+                    existing = Verse.objects.filter(version=version, chapter_id__in=chapter_batch).values_list(
+                        'id', 'chapter_id', 'number', 'book_id', 'chapter_number', 'verse_key', 'text'
+                    )
+                    for verse_id, chapter_id, number, *content in existing:
+                        entry['rows'] += 1
+                        row = incoming.pop((chapter_id, number), None)
+                        if row is None:
+                            deleted_ids.append(verse_id)
+                            metrics.changes['deleted'].append(_change(verse_id, chapter_id, content[2]))
+                        elif content_hash(*row[1:3], *row[4:6]) != content_hash(*content):
+                            updates.append(Verse(
+                                id=verse_id, book_id=row[1], chapter_number=row[2], verse_key=row[4], text=row[5]
+                            ))
+                            metrics.changes['updated'].append(_change(verse_id, chapter_id, row[4]))
+
+            _apply_changes(version, deleted_ids, updates, list(incoming.values()), metrics)
+            if progress is not None:
+                progress(metrics.rows_written)
+
+        # Versets de chapitres absents de la source
+        with metrics.phase('comparaison') as entry:
+            deleted_ids = []
+            existing = Verse.objects.filter(version=version).values_list(
+                'id', 'chapter_id', 'verse_key'
+            ).iterator(chunk_size=DB_CHUNK_SIZE)
+            for verse_id, chapter_id, verse_key in existing:
+                if chapter_id not in seen_chapters:
+                    deleted_ids.append(verse_id)
+                    metrics.changes['deleted'].append(_change(verse_id, chapter_id, verse_key))
+        _apply_changes(version, deleted_ids, [], [], metrics)
+
+        _recount(version, metrics)
+
+    return metrics
+
+
+def _recount(version, metrics):
+    """Refresh the verse counts of the chapters touched and the chapter counts of the books."""
+    with metrics.phase('comptages') as entry:
+        chapters = []
+        for chapter_batch in _id_batches(metrics.changed_chapter_ids()):
+            counts = dict(
+                Verse.objects.filter(version=version, chapter_id__in=chapter_batch)
+                .order_by().values_list('chapter_id').annotate(count=Count('id'))
+            )
+            chapters.extend(
+                Chapter(id=chapter_id, verse_count=counts.get(chapter_id, 0))
+                for chapter_id in chapter_batch
+            )
+        Chapter.objects.bulk_update(chapters, ['verse_count'], batch_size=BULK_BATCH_SIZE)
+        entry['rows'] += len(chapters)
+
+        if metrics.chapters_created:
+            books = [
+                Book(id=book_id, chapter_count=count)
+                for book_id, count, chapter_count in Book.objects.annotate(
+                    count=Count('chapters')
+                ).values_list('id', 'count', 'chapter_count')
+                if count != chapter_count
+            ]
+            Book.objects.bulk_update(books, ['chapter_count'], batch_size=BULK_BATCH_SIZE)
+            entry['rows'] += len(books)
+
+
+def _apply_changes(version, deleted_ids, updates, rows, metrics):
+    if deleted_ids:
+        with metrics.phase('suppression') as entry:
+            for id_batch in _id_batches(deleted_ids):
+                Verse.objects.filter(id__in=id_batch).delete()
+            entry['rows'] += len(deleted_ids)
+            metrics.verses_deleted += len(deleted_ids)
+
+    if updates:
+        with metrics.phase('mise à jour') as entry:
+            Verse.objects.bulk_update(
+                updates, ['book', 'chapter_number', 'verse_key', 'text'], batch_size=BULK_BATCH_SIZE
+            )
+            entry['rows'] += len(updates)
+            metrics.verses_updated += len(updates)
+
+    if rows:
+        with metrics.phase(_insert_label()) as entry:
+            for _ in insert_verses(rows):
+                pass
+            entry['rows'] += len(rows)
+            metrics.verses_created += len(rows)
+
+        # Identifiants attribués aux nouveaux versets (chapitres concernés seulement)
+        inserted = {(row[0], row[3]) for row in rows}
+        for chapter_batch in _id_batches({chapter_id for chapter_id, _ in inserted}):
+            new_ids = Verse.objects.filter(version=version, chapter_id__in=chapter_batch).values_list(
+                'id', 'chapter_id', 'number', 'verse_key'
+            )
+            metrics.changes['inserted'].extend(
+                _change(verse_id, chapter_id, verse_key)
+                for verse_id, chapter_id, number, verse_key in new_ids
+                if (chapter_id, number) in inserted
+            )
+
+
+def _change(verse_id, chapter_id, verse_key) -> dict:
+    return {'id': verse_id, 'chapter_id': chapter_id, 'verse_key': verse_key}
+
+
+def _ensure_books_and_chapters(books, chapters, metrics):
+    """Insert the missing books and chapters; return their ids by order/number."""
+    orders = [book['order'] for book in books]
+    book_ids = dict(Book.objects.filter(order__in=orders).values_list('order', 'id'))
+    missing = [
+        Book(
+            name=book['name'],
+            testament=book['testament'],
+            order=book['order'],
+            abbreviation=book['abbreviation'],
+            chapter_count=book['chapter_count'],
+        )
+        for book in books if book['order'] not in book_ids
+    ]
+    if missing:
+        Book.objects.bulk_create(missing, batch_size=BULK_BATCH_SIZE)
+        book_ids = dict(Book.objects.filter(order__in=orders).values_list('order', 'id'))
+        metrics.books_created += len(missing)
+
+    def existing_chapters():
+        return {
+            (order, number): chapter_id
+            for order, number, chapter_id in Chapter.objects.filter(
+                book_id__in=book_ids.values()
+            ).values_list('book__order', 'number', 'id')
+        }
+
+    chapter_ids = existing_chapters()
+    missing = [
+        Chapter(book_id=book_ids[order], number=chapter['number'], verse_count=chapter['verse_count'])
+        for order, chapter in chapters if (order, chapter['number']) not in chapter_ids
+    ]
+    if missing:
+        Chapter.objects.bulk_create(missing, batch_size=BULK_BATCH_SIZE)
+        chapter_ids = existing_chapters()
+        metrics.chapters_created += len(missing)
+
+    return book_ids, chapter_ids
+
+
+def insert_verses(rows: list):
+    """Insert verse rows (`VERSE_COLUMNS` tuples), yielding the count done after each batch."""
+    if connection.vendor == 'postgresql':
+        table = connection.ops.quote_name(Verse._meta.db_table)
+        columns = ', '.join(connection.ops.quote_name(column) for column in VERSE_COLUMNS)
+        sql = f'COPY {table} ({columns}) FROM STDIN'
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), COPY_BATCH_SIZE):
+                batch = rows[start:start + COPY_BATCH_SIZE]
+                _copy(cursor, sql, ''.join(_copy_line(row) for row in batch))
+                yield start + len(batch)
+    else:
+        for start in range(0, len(rows), BULK_BATCH_SIZE):
+            batch = rows[start:start + BULK_BATCH_SIZE]
+            Verse.objects.bulk_create(
+                [Verse(**dict(zip(VERSE_COLUMNS, row))) for row in batch],
+                batch_size=BULK_BATCH_SIZE,
+            )
+            yield start + len(batch)
+
+
+def _copy_line(row) -> str:
+    return '\t'.join(str(value).translate(COPY_ESCAPES) for value in row) + '\n'
+
+
+def _copy(cursor, sql: str, data: str):
+    if hasattr(cursor, 'copy_expert'):
+        # psycopg2
+        cursor.copy_expert(sql, io.StringIO(data))
+    else:
+        # psycopg 3
+        with cursor.copy(sql) as copy:
+            copy.write(data)
+
+
+def secondary_indexes(table: str) -> list:
+    """`(name, definition)` of the non-unique indexes of `table`."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                "SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x "
+                "JOIN pg_class i ON i.oid = x.indexrelid "
+                "WHERE x.indrelid = %s::regclass AND NOT x.indisunique AND NOT x.indisprimary",
+                [table],
+            )
+        elif connection.vendor == 'sqlite':
+            # Les index implicites (sql NULL) portent les contraintes d'unicité
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = %s "
+                "AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%%'",
+                [table],
+            )
+        else:
+            return []
+        return cursor.fetchall()
+
+
+def _drop_indexes(indexes):
+    with connection.cursor() as cursor:
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+
+
+def _create_indexes(indexes):
+    with connection.cursor() as cursor:
+        for _, definition in indexes:
+            cursor.execute(definition)
@@ -0,0 +1,317 @@
+"""
+Verse lookups by id or by reference.
+
+Each lookup is answered from the in-memory corpus when it is enabled, and
+otherwise with a single ORM query, so callers never loop over verses.
+"""
+import hashlib
+import random
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.bible.models import Book, Chapter, Verse, CorpusRevision
+from apps.bible.serializers import VERSE_ROW_FIELDS, verse_row
+from .corpus import get_corpus, corpus_enabled, default_version
+from .references import (
+    BookAliases,
+    InvalidReference,
+    key_bounds,
+    parse_references,
+    passage_range
+)
+
+
+class TooManyVerses(InvalidReference):
+    """Raised when a lookup would return more verses than allowed."""
+
+
+def verse_values(version: str = None):
+    """Verse rows of a version (the default one if None)."""
+    return Verse.objects.filter(version=version or default_version()).values_list(*VERSE_ROW_FIELDS)
+
+
+def verses_by_ids(ids) -> tuple:
+    """
+    Return `(rows, missing_ids)` for a list of verse ids.
+
+    Rows follow the order of `ids` (duplicates included) so that clients can
+    zip them with their own lists; missing ids are reported once each. Ids
+    are unique across versions: those outside the default version's snapshot
+    are read with one query, so no other snapshot is built for them.
+    """
+    wanted = set(ids)
+    found = {}
+    if corpus_enabled():
+        corpus = get_corpus()
+        for verse_id in wanted.intersection(corpus.verse_index):
+            found[verse_id] = corpus.verse_row(corpus.verse_index[verse_id])
+        wanted.difference_update(found)
+
+    if wanted:
+        found.update(
+            (values[0], verse_row(values))
+            for values in Verse.objects.filter(id__in=wanted).values_list(*VERSE_ROW_FIELDS)
+        )
+
+    rows = [found[verse_id] for verse_id in ids if verse_id in found]
+    missing = list(dict.fromkeys(verse_id for verse_id in ids if verse_id not in found))
+    return rows, missing
+
+
+def verse_span(start_text: str, end_text: str = None, version: str = None) -> tuple:
+    """
+    Resolve a span given by references or canonical keys.
+
+    Returns `(start_key, end_key, count, rows)` where `rows` is a lazy
+    iterator of verse rows in canonical order: a slice of the corpus, or an
+    indexed `verse_key BETWEEN` scan read in chunks from the database.
+    """
+    if corpus_enabled():
+        corpus = get_corpus(version)
+        start_key, end_key = key_bounds(start_text, end_text, corpus.book_aliases)
+        indexes = corpus.key_range(start_key, end_key)
+        return start_key, end_key, len(indexes), map(corpus.verse_row, indexes)
+
+    books = Book.objects.values_list('order', 'name', 'abbreviation')
+    start_key, end_key = key_bounds(start_text, end_text, BookAliases(books))
+    queryset = verse_values(version).filter(
+        verse_key__range=(start_key, end_key)
+    ).order_by('verse_key', 'id')
+    rows = map(verse_row, queryset.iterator(chunk_size=1000))
+    return start_key, end_key, queryset.count(), rows
+
+
+def random_verse(testament: str = None, book_id: int = None, version: str = None):
+    """
+    Return a uniformly drawn verse row, or None when nothing matches.
+
+    In memory the draw is an index into the precomputed verse ranges; the
+    database fallback counts the rows and fetches one by offset on the
+    primary key, never `ORDER BY RANDOM()`.
+    """
+    if corpus_enabled():
+        corpus = get_corpus(version)
+        if book_id is not None:
+            book_idx = corpus.book_index.get(book_id)
+            if book_idx is None:
+                return None
+            ranges = [corpus.book_verse_range(book_idx)]
+        elif testament is not None:
+            ranges = corpus.testament_verse_ranges(testament)
+        else:
+            ranges = [range(len(corpus.verse_ids))]
+
+        position = _draw(sum(len(indexes) for indexes in ranges))
+        if position is None:
+            return None
+        for indexes in ranges:
+            if position < len(indexes):
+                return corpus.verse_row(indexes[position])
+            position -= len(indexes)
+
+    queryset = verse_values(version)
+    if book_id is not None:
+        queryset = queryset.filter(book_id=book_id)
+    elif testament is not None:
+        queryset = queryset.filter(book__testament=testament)
+
+    position = _draw(queryset.count())
+    if position is None:
+        return None
+    return verse_row(queryset.order_by('id')[position])
+
+
+def _draw(total: int):
+    return random.randrange(total) if total else None
+
+
+def daily_verse(day, version: str = None) -> dict:
+    """
+    Return the verse of the day for `day`, or None for an empty corpus.
+
+    The verse is derived from a hash of the date, so every worker agrees on
+    it, and the result is cached until midnight in `TIME_ZONE`.
+    """
+    version = version or default_version()
+    revision = get_corpus(version).revision if corpus_enabled() else CorpusRevision.current()
+    key = f'bible:daily:{revision}:{version}:{day.isoformat()}'
+
+    row = cache.get(key)
+    if row is None:
+        row = _compute_daily_verse(day, version)
+        if row is None:
+            return None
+        cache.set(key, row, timeout=max(seconds_until_midnight(), 60))
+    return row
+
+
+def seconds_until_midnight() -> int:
+    """Seconds left until the next local midnight (`TIME_ZONE`)."""
+    now = timezone.localtime()
+    midnight = timezone.make_aware(
+        datetime.combine(now.date() + timedelta(days=1), time.min),
+        now.tzinfo
+    )
+    return int((midnight - now).total_seconds())
+
+
+def _compute_daily_verse(day, version):
+    digest = hashlib.sha256(day.isoformat().encode()).digest()
+    seed = int.from_bytes(digest[:8], 'big')
+
+    if corpus_enabled():
+        corpus = get_corpus(version)
+        if not corpus.verse_ids:
+            return None
+        return corpus.verse_row(seed % len(corpus.verse_ids))
+
+    # Même rang canonique que le corpus en mémoire
+    queryset = verse_values(version)
+    total = queryset.count()
+    if not total:
+        return None
+    return verse_row(queryset.order_by('verse_key', 'id')[seed % total])
+
+
+def resolve_references(text: str, max_verses: int, version: str = None) -> list:
+    """
+    Resolve `;`-separated references to `[(canonical reference, rows), ...]`.
+
+    Raises `InvalidReference` for unparsable input and `TooManyVerses` when
+    the passages add up to more than `max_verses`.
+    """
+    if corpus_enabled():
+        return _resolve_in_corpus(get_corpus(version), text, max_verses)
+    return _resolve_in_database(text, max_verses, version)
+
+
+def parallel_chapter(chapter_id: int, versions: list) -> tuple:
+    """
+    Align the verses of a chapter across `versions` by canonical key.
+
+    Returns `(chapter, rows)`, `(None, [])` for an unknown chapter; see
+    `align_verses` for the rows. The verses of every version are read at
+    once (one query, or one corpus range per version), so the cost does not
+    grow with a query per version.
+    """
+    if corpus_enabled():
+        corpus = get_corpus()
+        chapter_idx = corpus.chapter_index.get(chapter_id)
+        if chapter_idx is None:
+            return None, []
+        chapter = {
+            'id': chapter_id,
+            'book_name': corpus.books[corpus.chapter_books[chapter_idx]][1],
+            'number': corpus.chapter_numbers[chapter_idx],
+        }
+
+        rows = []
+        for version in versions:
+            corpus = get_corpus(version)
+            chapter_idx = corpus.chapter_index.get(chapter_id)
+            if chapter_idx is None:
+                continue
+            rows.extend(
+                (corpus.verse_keys[idx], corpus.verse_numbers[idx], version,
+                 corpus.verse_ids[idx], corpus.verse_texts[idx])
+                for idx in corpus.chapter_verse_range(chapter_idx)
+            )
+    else:
+        values = Chapter.objects.filter(pk=chapter_id).values_list('id', 'book__name', 'number').first()
+        if values is None:
+            return None, []
+        chapter = dict(zip(('id', 'book_name', 'number'), values))
+
+        rows = Verse.objects.filter(chapter_id=chapter_id, version__in=versions).values_list(
+            'verse_key', 'number', 'version', 'id', 'text'
+        )
+    return chapter, align_verses(rows, versions)
+
+
+def align_verses(rows, versions: list) -> list:
+    """
+    Merge `(verse_key, number, version, id, text)` rows into aligned rows.
+
+    Each row is `{'verse_key', 'number', 'texts': {version: cell}}`, one per
+    key present in any version, in canonical order. A cell is `{'id', 'text'}`
+    or None when the version lacks the verse. A verse followed by a gap in its
+    version (numbers other versions have) gets `'through': last_number`, the
+    usual shape of merged verses ("16-17"); a gap at the end stays missing.
+    """
+    aligned = {}
+    for verse_key, number, version, verse_id, text in rows:
+        row = aligned.get(verse_key)
+        if row is None:
+            row = aligned[verse_key] = {
+                'verse_key': verse_key,
+                'number': number,
+                'texts': dict.fromkeys(versions),
+            }
+        row['texts'][version] = {'id': verse_id, 'text': text}
+
+    keys = sorted(aligned)
+    for version in versions:
+        previous = gap = None
+        for key in keys:
+            cell = aligned[key]['texts'][version]
+            if cell is None:
+                if previous is not None:
+                    gap = aligned[key]['number']
+            else:
+                if gap is not None:
+                    previous['through'] = gap
+                previous, gap = cell, None
+
+    return [aligned[key] for key in keys]
+
+
+def _too_many(max_verses):
+    return TooManyVerses(f'Trop de versets demandés (maximum {max_verses}).')
+
+
+def _resolve_in_corpus(corpus, text, max_verses):
+    passages = parse_references(text, corpus.book_aliases)
+
+    ranges = [passage_range(corpus, passage) for passage in passages]
+    if sum(len(indexes) for indexes in ranges) > max_verses:
+        raise _too_many(max_verses)
+
+    resolved = []
+    for passage, indexes in zip(passages, ranges):
+        book_idx = corpus.book_order_index.get(passage.book_order)
+        book_name = corpus.books[book_idx][1] if book_idx is not None else ''
+        resolved.append((
+            passage.label(book_name),
+            [corpus.verse_row(idx) for idx in indexes]
+        ))
+    return resolved
+
+
+def _resolve_in_database(text, max_verses, version):
+    """Fetch every passage with a single query, then split the rows."""
+    books = list(Book.objects.values_list('order', 'name', 'abbreviation'))
+    passages = parse_references(text, BookAliases(books))
+
+    condition = Q()
+    for passage in passages:
+        condition |= passage.as_q()
+
+    verses = list(
+        Verse.objects.filter(condition, version=version or default_version())
+        .values_list('verse_key', *VERSE_ROW_FIELDS)[:max_verses + 1]
+    )
+    if len(verses) > max_verses:
+        raise _too_many(max_verses)
+
+    names = {order: name for order, name, _ in books}
+    resolved = []
+    for passage in passages:
+        start, end = passage.key_range()
+        resolved.append((
+            passage.label(names.get(passage.book_order, '')),
+            [verse_row(values[1:]) for values in verses if start <= values[0] <= end]
+        ))
+    return resolved
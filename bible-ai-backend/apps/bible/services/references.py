@@ -0,0 +1,328 @@
+"""
+Bible reference parsing and resolution.
+
+Understands French book names, the abbreviations of `BOOK_NAMES`, accent-less
+and numbered variants ("1 Jean", "1Jn", "I Jean", "1er Jean") and unique
+prefixes ("Gen", "Matt"), followed by chapter/verse specifications:
+
+    Jean 3          whole chapter          Ps 23-25        chapter range
+    Jean 3:16       single verse           Jean 3:16-18    verse range
+    Gn 1:1-2:3      cross-chapter range    Jean 3:16,18    verse list
+    Jean 3,16       French comma style     Jean 3:16; 4:1  book carried over
+    Jude 3          verse of a single-chapter book (Abdias, Philémon, 2-3 Jean)
+"""
+import re
+from bisect import bisect_left, bisect_right
+
+from django.db.models import Q
+
+from apps.bible.constants import BOOK_NAMES, BOOK_ALIASES, SINGLE_CHAPTER_BOOKS
+from apps.bible.models import Verse
+from .search import fold
+
+DASHES = re.compile(r'[–—‐−]')
+PART_RE = re.compile(
+    r'^(?P<book>(?:[1-3]\s*(?:er|re|ère|e)?\.?\s*)?[^\W\d_][^\d]*?)?\s*(?P<spec>\d[\d\s:.,\-]*)?$'
+)
+ORDINALS = re.compile(
+    r'^(?:(?P<roman>iii|ii|i)\s+|(?P<digit>[1-3])\s*(?:er|re|ere|e)\b\.?\s*'
+    r'|(?P<word>premiere?|deuxieme|seconde?|troisieme)\s+)'
+)
+ORDINAL_WORDS = {
+    'premier': '1', 'premiere': '1', 'deuxieme': '2', 'second': '2',
+    'seconde': '2', 'troisieme': '3',
+}
+ROMAN = {'i': '1', 'ii': '2', 'iii': '3'}
+ENDPOINT_RE = re.compile(r'^(\d+)(?::(\d+))?$')
+SINGLE_CHAPTER_ORDERS = {
+    order for order, abbrev in enumerate(BOOK_NAMES, 1) if abbrev in SINGLE_CHAPTER_BOOKS
+}
+
+
+class InvalidReference(ValueError):
+    """Raised when a reference cannot be parsed."""
+
+
+def alias_key(name: str) -> str:
+    """Normalise a book name for lookup: "1 Épître de Jean" -> "1epitredejean"."""
+    name = fold(name).strip()
+    match = ORDINALS.match(name)
+    if match:
+        number = (
+            ROMAN.get(match.group('roman') or '')
+            or match.group('digit')
+            or ORDINAL_WORDS.get(match.group('word') or '')
+        )
+        name = number + name[match.end():]
+    return re.sub(r'[^a-z0-9]', '', name)
+
+
+class BookAliases:
+    """
+    Lookup table from every accepted spelling to a canonical book order.
+
+    Exact names and abbreviations win over prefixes; a prefix is only kept
+    when it designates a single book.
+    """
+
+    def __init__(self, books=()):
+        orders = {abbrev: order for order, abbrev in enumerate(BOOK_NAMES, 1)}
+        names = {alias_key(name): orders[abbrev] for abbrev, name in BOOK_NAMES.items()}
+
+        # Noms réellement chargés (peuvent différer de BOOK_NAMES)
+        for order, name, abbreviation in books:
+            names.setdefault(alias_key(name), order)
+            orders.setdefault(alias_key(abbreviation), order)
+
+        candidates = {}
+        for key, order in names.items():
+            for size in range(2, len(key)):
+                candidates.setdefault(key[:size], set()).add(order)
+
+        self.table = {
+            prefix: next(iter(matches))
+            for prefix, matches in candidates.items() if len(matches) == 1
+        }
+        self.table.update(orders)
+        self.table.update(names)
+        self.table.update({alias: orders[abbrev] for alias, abbrev in BOOK_ALIASES.items()})
+
+    def lookup(self, name: str):
+        return self.table.get(alias_key(name))
+
+
+class Passage:
+    """
+    A contiguous span of one book.
+
+    `start_chapter` is None for a whole book; verse bounds are None for whole
+    chapters.
+    """
+
+    def __init__(self, book_order, start_chapter=None, start_verse=None,
+                 end_chapter=None, end_verse=None):
+        self.book_order = book_order
+        self.start_chapter = start_chapter
+        self.start_verse = start_verse
+        self.end_chapter = end_chapter if end_chapter is not None else start_chapter
+        self.end_verse = end_verse
+
+    def __repr__(self):
+        return f"Passage({self.book_order}, {self.label('')!r})"
+
+    def label(self, book_name: str) -> str:
+        """Canonical reference text, e.g. "Jean 3:16-18"."""
+        if self.start_chapter is None:
+            return book_name
+
+        start = f"{self.start_chapter}"
+        if self.start_verse is not None:
+            start += f":{self.start_verse}"
+
+        if self.end_chapter == self.start_chapter:
+            if self.end_verse is None or self.end_verse == self.start_verse:
+                return f"{book_name} {start}"
+            return f"{book_name} {start}-{self.end_verse}"
+
+        end = f"{self.end_chapter}"
+        if self.end_verse is not None:
+            end += f":{self.end_verse}"
+        return f"{book_name} {start}-{end}"
+
+    def key_range(self) -> tuple:
+        """Inclusive `(start, end)` bounds of the passage's `verse_key`s."""
+        if self.start_chapter is None:
+            start, end = (0, 0), (999, 999)
+        else:
+            start = (self.start_chapter, self.start_verse or 0)
+            end = (self.end_chapter, self.end_verse if self.end_verse is not None else 999)
+        return Verse.make_key(self.book_order, *start), Verse.make_key(self.book_order, *end)
+
+    def as_q(self) -> Q:
+        """ORM filter matching the verses of this passage (a `verse_key` range)."""
+        return Q(verse_key__range=self.key_range())
+
+
+def _endpoint(text: str):
+    match = ENDPOINT_RE.match(text)
+    if not match:
+        raise InvalidReference(f"Spécification invalide : « {text} »")
+    number, verse = int(match.group(1)), match.group(2)
+    return number, (int(verse) if verse is not None else None)
+
+
+def _parse_spec(book_order: int, spec: str) -> list:
+    """Parse "3:16-18,20" style specifications into passages."""
+    spec = re.sub(r'\s*([:.,\-])\s*', r'\1', spec.strip())
+    if re.search(r'\s', spec):
+        raise InvalidReference(f"Spécification invalide : « {spec} »")
+
+    # Séparateur chapitre/verset : ':' sinon ',' (style français) sinon '.'
+    if ':' in spec:
+        spec = spec.replace('.', ',')
+    elif ',' in spec:
+        spec = spec.replace(',', ':').replace('.', ',')
+    else:
+        spec = spec.replace('.', ':')
+
+    passages = []
+    chapter, verse_mode = None, False
+    # Livre d'un seul chapitre : « Jude 3 » ou « Jude 3-5 » désignent des versets
+    if book_order in SINGLE_CHAPTER_ORDERS and ':' not in spec:
+        chapter, verse_mode = 1, True
+    for item in spec.split(','):
+        start_text, _, end_text = item.partition('-')
+        number, verse = _endpoint(start_text)
+
+        if verse is not None:
+            chapter, verse_mode = number, True
+            start = (number, verse)
+        elif verse_mode:
+            start = (chapter, number)
+        else:
+            chapter = number
+            start = (number, None)
+
+        end = (start[0], start[1])
+        if end_text:
+            number, verse = _endpoint(end_text)
+            if verse is not None:
+                end = (number, verse)
+                if start[1] is None:
+                    start = (start[0], 1)
+                chapter, verse_mode = number, True
+            elif start[1] is not None:
+                end = (start[0], number)
+            else:
+                end = (number, None)
+
+        if start[0] < 1 or end[0] < start[0] or (
+            end[0] == start[0] and start[1] is not None and end[1] < start[1]
+        ) or (start[1] is not None and start[1] < 1):
+            raise InvalidReference(f"Intervalle invalide : « {item} »")
+
+        passages.append(Passage(book_order, start[0], start[1], end[0], end[1]))
+    return passages
+
+
+def parse_references(text: str, aliases: BookAliases) -> list:
+    """Parse a `;`-separated list of references into passages."""
+    passages = []
+    book_order = None
+
+    for part in DASHES.sub('-', text).split(';'):
+        part = part.strip()
+        if not part:
+            continue
+
+        match = PART_RE.match(part)
+        if not match:
+            raise InvalidReference(f"Référence invalide : « {part} »")
+
+        book, spec = match.group('book'), match.group('spec')
+        if book:
+            book_order = aliases.lookup(book)
+            if book_order is None:
+                raise InvalidReference(f"Livre inconnu ou ambigu : « {book.strip()} »")
+        elif book_order is None:
+            raise InvalidReference(f"Livre manquant : « {part} »")
+
+        if spec:
+            passages.extend(_parse_spec(book_order, spec))
+        else:
+            passages.append(Passage(book_order))
+
+    if not passages:
+        raise InvalidReference("Aucune référence fournie.")
+    return passages
+
+
+def key_bounds(start_text: str, end_text: str, aliases: BookAliases) -> tuple:
+    """
+    Resolve the bounds of a span to `(start_key, end_key)` canonical keys.
+
+    Each bound is either a `verse_key` ("1001001") or a single reference
+    ("Gn 1:1"); the end may omit the book ("2:3"), which is then taken from
+    the start. A chapter or book bound covers all of it.
+    """
+    start_text = start_text.strip()
+    end_text = (end_text or '').strip() or start_text
+
+    if start_text.isdigit():
+        start_key = int(start_text)
+        start_passages = []
+    else:
+        start_passages = parse_references(start_text, aliases)
+        start_key = _bound(_single(start_passages, start_text), upper=False)
+
+    if end_text.isdigit():
+        end_key = int(end_text)
+    else:
+        text = f"{start_text};{end_text}" if start_passages else end_text
+        end_passages = parse_references(text, aliases)[len(start_passages):]
+        end_key = _bound(_single(end_passages, end_text), upper=True)
+
+    if end_key < start_key:
+        raise InvalidReference("La fin de l'intervalle précède son début.")
+    return start_key, end_key
+
+
+def _single(passages, text):
+    if len(passages) != 1:
+        raise InvalidReference(f"Une seule référence attendue : « {text} »")
+    return passages[0]
+
+
+def _bound(passage: Passage, upper: bool) -> int:
+    if passage.start_chapter is None:
+        position = (999, 999) if upper else (0, 0)
+    elif upper:
+        position = (
+            passage.end_chapter,
+            passage.end_verse if passage.end_verse is not None else 999
+        )
+    else:
+        position = (passage.start_chapter, passage.start_verse or 0)
+    return Verse.make_key(passage.book_order, *position)
+
+
+def passage_range(corpus, passage: Passage) -> range:
+    """
+    Resolve a passage to a contiguous range of corpus verse indexes.
+
+    Chapters are found through the corpus lookup table and verse bounds by
+    binary search inside the chapter; out-of-range ends are clamped to the
+    chapter/book end. Returns an empty range when nothing matches.
+    """
+    book_idx = corpus.book_order_index.get(passage.book_order)
+    if book_idx is None:
+        return range(0)
+    if passage.start_chapter is None:
+        return corpus.book_verse_range(book_idx)
+
+    start_idx = corpus.chapter_lookup.get((book_idx, passage.start_chapter))
+    if start_idx is None:
+        return range(0)
+
+    end_idx = corpus.chapter_lookup.get((book_idx, passage.end_chapter))
+    if end_idx is None:
+        end_idx = corpus.book_chapter_range(book_idx)[-1]
+
+    start_verses = corpus.chapter_verse_range(start_idx)
+    end_verses = corpus.chapter_verse_range(end_idx)
+
+    start = start_verses.start
+    if passage.start_verse is not None:
+        start = bisect_left(
+            corpus.verse_numbers, passage.start_verse, start_verses.start, start_verses.stop
+        )
+        if start == start_verses.stop:
+            return range(0)
+
+    stop = end_verses.stop
+    if passage.end_verse is not None:
+        stop = bisect_right(
+            corpus.verse_numbers, passage.end_verse, end_verses.start, end_verses.stop
+        )
+
+    return range(start, max(start, stop))
@@ -0,0 +1,191 @@
+"""
+Pre-rendered JSON payloads for the book and chapter endpoints.
+
+Payloads are rendered once to bytes (and gzip) and stored in the Django
+cache under `bible:r<revision>:<endpoint>:<params>`. Bumping the corpus
+revision on reload makes every older entry unreachable, so there is no
+explicit invalidation step; stale entries simply expire.
+"""
+import gzip
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.bible.models import Book, Chapter, Verse
+from apps.bible.renderers import BibleJSONRenderer
+from apps.bible.serializers import VERSE_ROW_FIELDS, verse_row
+from .corpus import get_corpus, corpus_enabled, current_revision, available_versions
+
+# Les petites réponses ne gagnent rien à être compressées
+GZIP_MIN_SIZE = 1024
+
+
+class RenderedPayload:
+    """JSON bytes of a response, with their gzip encoding when worth it."""
+
+    __slots__ = ('content', 'gzipped')
+
+    def __init__(self, content: bytes, gzipped: bytes = None):
+        self.content = content
+        self.gzipped = gzipped
+
+    @classmethod
+    def render(cls, content: bytes) -> 'RenderedPayload':
+        gzipped = None
+        if getattr(settings, 'BIBLE_RESPONSE_CACHE_GZIP', True) and len(content) >= GZIP_MIN_SIZE:
+            gzipped = gzip.compress(content, compresslevel=6, mtime=0)
+        return cls(content, gzipped)
+
+    def __getstate__(self):
+        return (self.content, self.gzipped)
+
+    def __setstate__(self, state):
+        self.content, self.gzipped = state
+
+
+def cache_key(endpoint: str, *params, revision: int = None) -> str:
+    if revision is None:
+        revision = current_revision()
+    suffix = ':'.join(str(param) for param in params)
+    return f'bible:r{revision}:{endpoint}:{suffix}'
+
+
+def get_rendered(endpoint: str, *params):
+    """
+    Return the `RenderedPayload` of an endpoint, or None when it does not exist.
+
+    `endpoint` names one of the `RENDERERS` below; missing objects are not
+    cached, so a 404 never hides a later load.
+    """
+    render = RENDERERS[endpoint]
+    if not getattr(settings, 'BIBLE_RESPONSE_CACHE', True):
+        content = render(*params)
+        return RenderedPayload(content) if content is not None else None
+
+    key = cache_key(endpoint, *params)
+    payload = cache.get(key)
+    if payload is None:
+        content = render(*params)
+        if content is None:
+            return None
+        payload = RenderedPayload.render(content)
+        cache.set(key, payload, timeout=settings.BIBLE_RESPONSE_CACHE_TIMEOUT)
+    return payload
+
+
+def find_chapter_id(book_id: int, number: int):
+    """Return the id of chapter `number` of a book, or None."""
+    if corpus_enabled():
+        corpus = get_corpus()
+        book_idx = corpus.book_index.get(book_id)
+        chapter_idx = corpus.find_chapter(book_idx, number) if book_idx is not None else None
+        return corpus.chapter_ids[chapter_idx] if chapter_idx is not None else None
+    return Chapter.objects.filter(book_id=book_id, number=number).values_list('id', flat=True).first()
+
+
+# Rows below are built from values_list() in the shape of the serializers
+# (BookSerializer, ChapterSerializer, BookTextSerializer).
+BOOK_FIELDS = ('id', 'name', 'testament', 'order', 'abbreviation', 'chapter_count')
+CHAPTER_FIELDS = ('id', 'book__name', 'number', 'verse_count')
+
+
+def _book_row(book_id: int):
+    values = Book.objects.filter(pk=book_id).values_list(*BOOK_FIELDS).first()
+    return None if values is None else dict(zip(BOOK_FIELDS, values))
+
+
+def _chapter_rows(queryset) -> list:
+    return [
+        {'id': chapter_id, 'book_name': book_name, 'number': number, 'verse_count': verse_count}
+        for chapter_id, book_name, number, verse_count in queryset.values_list(*CHAPTER_FIELDS)
+    ]
+
+
+def render_book(book_id: int):
+    """Book detail with its chapter list."""
+    if corpus_enabled():
+        corpus = get_corpus()
+        book_idx = corpus.book_index.get(book_id)
+        return None if book_idx is None else BibleJSONRenderer().render(corpus.book_detail(book_idx))
+
+    book = _book_row(book_id)
+    if book is None:
+        return None
+    book['chapters'] = _chapter_rows(Chapter.objects.filter(book_id=book_id))
+    return BibleJSONRenderer().render(book)
+
+
+def render_chapter(version: str, chapter_id: int):
+    """Chapter detail with all its verses in `version`."""
+    if corpus_enabled():
+        corpus = get_corpus(version)
+        chapter_idx = corpus.chapter_index.get(chapter_id)
+        return None if chapter_idx is None else corpus.chapter_json(chapter_idx)
+
+    chapters = _chapter_rows(Chapter.objects.filter(pk=chapter_id))
+    if not chapters:
+        return None
+    chapter = chapters[0]
+    chapter['verses'] = [
+        verse_row(values)
+        for values in Verse.objects.filter(chapter_id=chapter_id, version=version).values_list(*VERSE_ROW_FIELDS)
+    ]
+    # Nombre de versets de la version demandée, pas celui du chapitre
+    chapter['verse_count'] = len(chapter['verses'])
+    return BibleJSONRenderer().render(chapter)
+
+
+def render_book_text(version: str, book_id: int):
+    """Whole book in `version`, every chapter with its verses."""
+    if corpus_enabled():
+        corpus = get_corpus(version)
+        book_idx = corpus.book_index.get(book_id)
+        return None if book_idx is None else corpus.book_text_json(book_idx)
+
+    book = _book_row(book_id)
+    if book is None:
+        return None
+
+    verses = {}
+    queryset = Verse.objects.filter(book_id=book_id, version=version)
+    for values in queryset.values_list('chapter_id', *VERSE_ROW_FIELDS):
+        verses.setdefault(values[0], []).append(verse_row(values[1:]))
+
+    book['chapters'] = _chapter_rows(Chapter.objects.filter(book_id=book_id))
+    for chapter in book['chapters']:
+        chapter['verses'] = verses.get(chapter['id'], [])
+        chapter['verse_count'] = len(chapter['verses'])
+    return BibleJSONRenderer().render(book)
+
+
+RENDERERS = {
+    'book': render_book,
+    'chapter': render_chapter,
+    'book-text': render_book_text,
+}
+
+
+def warm_up(include_text: bool = False) -> int:
+    """Render every book and chapter payload (of every version) into the cache; return the count."""
+    if corpus_enabled():
+        corpus = get_corpus()
+        book_ids = [book[0] for book in corpus.books]
+        chapter_ids = list(corpus.chapter_ids)
+    else:
+        book_ids = list(Book.objects.values_list('id', flat=True))
+        chapter_ids = list(Chapter.objects.values_list('id', flat=True))
+
+    versions = [version for version, _ in available_versions()]
+    count = 0
+    for book_id in book_ids:
+        get_rendered('book', book_id)
+        count += 1
+        if include_text:
+            for version in versions:
+                get_rendered('book-text', version, book_id)
+                count += 1
+    for version in versions:
+        for chapter_id in chapter_ids:
+            get_rendered('chapter', version, chapter_id)
+            count += 1
+    return count
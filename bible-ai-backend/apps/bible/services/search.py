@@ -0,0 +1,190 @@
+"""
+Inverted full-text index over verse texts.
+
+Verse texts are folded (case, accents, ligatures, French elisions) into
+tokens; each token maps to a posting list of verse indexes in canonical
+order. Queries support AND (default), OR and "exact phrases", and hits are
+ranked with BM25.
+"""
+import math
+import re
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+
+# Mots vides français ignorés à l'indexation comme à la recherche
+STOP_WORDS = frozenset("""
+a ai au aux avec c ce ces cet cette d dans de des du elle elles en et eux il ils
+j je jusqu l la le les leur leurs lorsqu lui m ma mais me mes moi mon n ne ni nos
+notre nous on ou par pas pour puisqu qu que qui quoiqu s sa se ses si son sur t
+ta te tes toi ton tu un une vos votre vous y
+""".split())
+
+LIGATURES = str.maketrans({'œ': 'oe', 'Œ': 'oe', 'æ': 'ae', 'Æ': 'ae'})
+APOSTROPHES = re.compile(r"[’'`´]")
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents/ligatures: "Éternel" -> "eternel"."""
+    text = text.translate(LIGATURES).casefold()
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list:
+    """
+    Split a text into indexable tokens.
+
+    Apostrophes separate elided articles ("l'homme", "qu'il") from the word,
+    and the elided forms themselves are stop words.
+    """
+    text = APOSTROPHES.sub(' ', fold(text))
+    return [token for token in TOKEN_RE.findall(text) if token not in STOP_WORDS]
+
+
+def parse_query(query: str) -> list:
+    """
+    Parse a query into OR-ed clauses of AND-ed terms.
+
+    Each clause is a list of terms; a term is a tuple of tokens (a phrase when
+    it has more than one token). `OR` or `|` separate clauses:
+
+        'amour "vie eternelle" OR pardon' -> [[('amour',), ('vie', 'eternelle')], [('pardon',)]]
+    """
+    clauses = [[]]
+    for phrase, word in QUERY_RE.findall(query):
+        if word in ('OR', '|'):
+            clauses.append([])
+            continue
+        tokens = tuple(tokenize(phrase if phrase else word))
+        if tokens:
+            if word:
+                # Un mot composé ("arc-en-ciel") donne plusieurs termes
+                clauses[-1].extend((token,) for token in tokens)
+            else:
+                clauses[-1].append(tokens)
+    return [clause for clause in clauses if clause]
+
+
+class SearchIndex:
+    """Token -> posting list index built from a `BibleCorpus` snapshot."""
+
+    CACHE_SIZE = 256
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+        self.postings = {}
+        self.frequencies = {}
+        self.lengths = array('H')
+
+        for verse_idx, text in enumerate(corpus.verse_texts):
+            tokens = tokenize(text)
+            self.lengths.append(min(len(tokens), 0xFFFF))
+
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+
+            for token, count in counts.items():
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = array('i')
+                    self.frequencies[token] = array('B')
+                posting.append(verse_idx)
+                self.frequencies[token].append(min(count, 0xFF))
+
+        total = len(self.lengths)
+        average_length = (sum(self.lengths) / total) if total else 1.0
+        # Per-verse BM25 length normalisation, computed once
+        self.norms = array('d', (
+            K1 * (1 - B + B * length / average_length) for length in self.lengths
+        ))
+        self.idf = {
+            token: math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+            for token, posting in self.postings.items()
+        }
+
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def search(self, query: str) -> list:
+        """Return matching verse indexes, best first."""
+        key = query.strip()
+        with self._cache_lock:
+            hits = self._cache.get(key)
+            if hits is not None:
+                self._cache.move_to_end(key)
+                return hits
+
+        hits = self._search(parse_query(key))
+
+        with self._cache_lock:
+            self._cache[key] = hits
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return hits
+
+    def _search(self, clauses) -> list:
+        scores = {}
+        for clause in clauses:
+            matches = self._match_clause(clause)
+            if not matches:
+                continue
+            tokens = {token for term in clause for token in term}
+            for verse_idx, score in self._score(matches, tokens).items():
+                if score > scores.get(verse_idx, -1.0):
+                    scores[verse_idx] = score
+        return sorted(scores, key=lambda idx: (-scores[idx], idx))
+
+    def _match_clause(self, clause) -> set:
+        """Intersect the posting lists of a clause, shortest first."""
+        tokens = {token for term in clause for token in term}
+        postings = sorted(
+            (self.postings.get(token, ()) for token in tokens),
+            key=len
+        )
+        if not postings or not postings[0]:
+            return set()
+
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            matches.intersection_update(posting)
+            if not matches:
+                return matches
+
+        phrases = [term for term in clause if len(term) > 1]
+        if phrases:
+            matches = {
+                verse_idx for verse_idx in matches
+                if self._contains_phrases(verse_idx, phrases)
+            }
+        return matches
+
+    def _contains_phrases(self, verse_idx: int, phrases) -> bool:
+        tokens = tokenize(self.corpus.verse_texts[verse_idx])
+        for phrase in phrases:
+            size = len(phrase)
+            if not any(
+                tuple(tokens[i:i + size]) == phrase
+                for i in range(len(tokens) - size + 1)
+            ):
+                return False
+        return True
+
+    def _score(self, matches, tokens) -> dict:
+        """BM25 scores of the matching verses for a set of query tokens."""
+        norms = self.norms
+        scores = dict.fromkeys(matches, 0.0)
+        for token in tokens:
+            weight = self.idf[token] * (K1 + 1)
+            for verse_idx, tf in zip(self.postings[token], self.frequencies[token]):
+                if verse_idx in scores:
+                    scores[verse_idx] += weight * tf / (tf + norms[verse_idx])
+        return scores
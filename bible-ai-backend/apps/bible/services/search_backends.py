@@ -0,0 +1,116 @@
+"""
+Pluggable verse search backends.
+
+`BIBLE_SEARCH_BACKEND` selects the engine:
+- 'memory': inverted index held by the in-memory corpus
+- 'postgres': stored tsvector (french_unaccent) ranked with ts_rank
+- 'database': substring match through the ORM, works everywhere (SQLite
+  in local dev); case and accents are folded on SQLite and PostgreSQL
+
+A backend that cannot run in the current setup falls back to 'database'.
+"""
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Func, TextField
+from django.db.models.lookups import Contains
+
+from apps.bible.models import Verse
+from apps.bible.serializers import VERSE_ROW_FIELDS, verse_row
+from .corpus import get_corpus, corpus_enabled, default_version
+from .search import fold
+
+SEARCH_CONFIG = 'french_unaccent'
+FOLD_FUNCTION = 'bible_fold'
+
+
+class Fold(Func):
+    """`fold()` in SQL: the SQLite function registered by `register_fold_function`."""
+
+    function = FOLD_FUNCTION
+    output_field = TextField()
+
+
+def register_fold_function(sender, connection, **kwargs):
+    """`connection_created` receiver exposing `fold` to SQLite queries."""
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function(FOLD_FUNCTION, 1, fold, deterministic=True)
+
+
+class DatabaseSearchBackend:
+    """
+    Substring search through the ORM, insensitive to case and accents
+    ("eternel" finds "Éternel") like the in-memory engine.
+
+    SQLite compares the texts folded by `fold` (a full scan, as any
+    `icontains`); PostgreSQL uses `unaccent`. Other databases fall back to
+    `icontains`, which folds accents only if their collation does.
+    """
+
+    name = 'database'
+
+    def get_queryset(self, version: str = None):
+        return Verse.objects.filter(version=version or default_version())
+
+    def filter(self, queryset, query: str):
+        if connection.vendor == 'sqlite':
+            return queryset.filter(Contains(Fold('text'), fold(query)))
+        if connection.vendor == 'postgresql':
+            return queryset.filter(text__unaccent__icontains=query)
+        return queryset.filter(text__icontains=query)
+
+    def search(self, query: str, version: str = None):
+        return self.filter(self.get_queryset(version), query).values_list(*VERSE_ROW_FIELDS)
+
+    def serialize_page(self, page):
+        return [verse_row(values) for values in page]
+
+
+class PostgresSearchBackend(DatabaseSearchBackend):
+    """
+    Full-text search on the GIN-indexed `search_vector` column.
+
+    Queries use PostgreSQL "websearch" syntax, which matches the in-memory
+    engine: terms are AND-ed, `OR` for alternatives, quotes for phrases.
+    """
+
+    name = 'postgres'
+
+    def get_search_query(self, query: str):
+        return SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+
+    def filter(self, queryset, query: str):
+        return queryset.filter(search_vector=self.get_search_query(query))
+
+    def search(self, query: str, version: str = None):
+        search_query = self.get_search_query(query)
+        return (
+            self.get_queryset(version)
+            .filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', 'verse_key', 'id')
+            .values_list(*VERSE_ROW_FIELDS)
+        )
+
+
+class MemorySearchBackend:
+    """Ranked search on the corpus inverted index (rows are pre-built)."""
+
+    name = 'memory'
+
+    def search(self, query: str, version: str = None):
+        return get_corpus(version).search_slice(query)
+
+    def serialize_page(self, page):
+        return page
+
+
+def get_search_backend():
+    """Return the configured backend, or the ORM fallback when unavailable."""
+    name = getattr(settings, 'BIBLE_SEARCH_BACKEND', 'memory')
+
+    if name == 'memory' and corpus_enabled():
+        return MemorySearchBackend()
+    if name == 'postgres' and connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return DatabaseSearchBackend()
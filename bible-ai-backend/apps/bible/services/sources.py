@@ -0,0 +1,266 @@
+"""
+Incremental reading of Bible source files.
+
+A source is a JSON document holding a list of books, either at the top
+level (`[{...}, ...]`) or under a `books` / `livres` key. Books are decoded
+one at a time from a sliding text buffer with `JSONDecoder.raw_decode`, so
+memory is bounded by the largest book instead of the whole file. A UTF-8
+BOM is skipped by the `utf-8-sig` codec.
+
+`prepare_source` parses and normalises a whole source in a worker process
+of a multi-version import (see `importer`) and spools the books to a file
+that `iter_prepared_books` reads back in the writer.
+"""
+import json
+import pickle
+import time
+
+READ_SIZE = 1024 * 1024
+BOOK_KEYS = ('books', 'livres')
+WHITESPACE = ' \t\n\r'
+
+_decoder = json.JSONDecoder()
+
+
+class SourceError(ValueError):
+    """Raised when a source file is not valid JSON or holds no list of books."""
+
+
+class JSONStreamReader:
+    """Cursor over a text stream decoding one JSON value at a time."""
+
+    def __init__(self, stream, read_size: int = READ_SIZE):
+        self.stream = stream
+        self.read_size = read_size
+        self.buffer = ''
+        self.pos = 0
+        # Caractères déjà consommés et retirés du tampon (pour les erreurs)
+        self.offset = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer; False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.read_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next significant character ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            self.error(f'« {char} » attendu')
+        self.pos += 1
+
+    def error(self, message: str):
+        raise SourceError(f'{message} (caractère {self.offset + self.pos})')
+
+    def value(self):
+        """Decode the next value, reading more text until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if not self.fill():
+                    raise SourceError(f'JSON invalide : {e.msg} (caractère {self.offset + e.pos})') from e
+                continue
+            # Un nombre en fin de tampon peut être tronqué
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self):
+        """Yield the elements of the array at the cursor."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            if char not in (',', ']'):
+                self.error('« , » ou « ] » attendu')
+            self.pos += 1
+            if char == ']':
+                return
+
+
+def iter_books(stream, read_size: int = READ_SIZE):
+    """Yield the raw book entries of a source opened in text mode."""
+    reader = JSONStreamReader(stream, read_size)
+    char = reader.peek()
+
+    if char == '[':
+        yield from reader.items()
+    elif char == '{':
+        reader.pos += 1
+        if reader.peek() == '}':
+            return
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            if key in BOOK_KEYS and reader.peek() == '[':
+                yield from reader.items()
+                return
+            reader.value()
+            char = reader.peek()
+            if char not in (',', '}'):
+                reader.error('« , » ou « } » attendu')
+            reader.pos += 1
+            if char == '}':
+                return
+    else:
+        reader.error('Liste de livres attendue')
+
+
+def iter_source_books(path: str, read_size: int = READ_SIZE):
+    """Yield the raw book entries of the source file at `path`."""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        yield from iter_books(f, read_size)
+
+
+def normalize_book(book_entry: dict, order: int) -> dict:
+    """
+    Convert a raw book entry to the loader shape (see `loader`), whatever
+    the source layout: verses as strings or `{verse|verset, text|texte}`
+    dicts, chapters as lists or `{chapter|chapitre, verses|versets}` dicts.
+    """
+    # Normaliser le testament
+    testament_mapping = {
+        'AT': 'OT',
+        'OT': 'OT',
+        'NT': 'NT',
+        'Ancien Testament': 'OT',
+        'Nouveau Testament': 'NT',
+    }
+
+    # Récupérer le nom du livre
+    book_name = book_entry.get('name', 
+                book_entry.get('book', 
+                book_entry.get('livre', f'Livre {order}')))
+
+    # Récupérer le testament
+    testament_raw = book_entry.get('testament', 'AT' if order <= 39 else 'NT')
+    testament = testament_mapping.get(testament_raw, 'OT' if order <= 39 else 'NT')
+
+    # Récupérer l'abréviation
+    abbreviation = book_entry.get('abbrev', 
+                  book_entry.get('abbr', 
+                  book_entry.get('abr', book_name[:3].upper())))
+
+    # Parser les chapitres - GÈre plusieurs formats
+    chapters = []
+
+    # Format 1: liste directe de chapitres
+    if 'chapters' in book_entry:
+        chapters_raw = book_entry['chapters']
+    elif 'chapitres' in book_entry:
+        chapters_raw = book_entry['chapitres']
+    else:
+        chapters_raw = []
+
+    # Si chapters_raw est une liste de listes (format: [[v1, v2, ...], [v1, v2, ...]])
+    if isinstance(chapters_raw, list) and len(chapters_raw) > 0:
+        for chapter_idx, chapter_data in enumerate(chapters_raw, 1):
+
+            # Format A: Liste de versets directement
+            if isinstance(chapter_data, list):
+                verses = []
+                for verse_idx, verse_text in enumerate(chapter_data, 1):
+                    if isinstance(verse_text, str):
+                        verses.append({
+                            'number': verse_idx,
+                            'text': verse_text.strip()
+                        })
+                    elif isinstance(verse_text, dict):
+                        verses.append({
+                            'number': verse_text.get('verse', verse_text.get('verset', verse_idx)),
+                            'text': verse_text.get('text', verse_text.get('texte', '')).strip()
+                        })
+
+                chapters.append({
+                    'number': chapter_idx,
+                    'verse_count': len(verses),
+                    'verses': verses
+                })
+
+            # Format B: Dictionnaire avec chapter et verses
+            elif isinstance(chapter_data, dict):
+                chapter_num = chapter_data.get('chapter', chapter_data.get('chapitre', chapter_idx))
+                verses_list = chapter_data.get('verses', chapter_data.get('versets', []))
+
+                verses = []
+                for verse_idx, verse in enumerate(verses_list, 1):
+                    if isinstance(verse, str):
+                        verses.append({
+                            'number': verse_idx,
+                            'text': verse.strip()
+                        })
+                    elif isinstance(verse, dict):
+                        verses.append({
+                            'number': verse.get('verse', verse.get('verset', verse_idx)),
+                            'text': verse.get('text', verse.get('texte', '')).strip()
+                        })
+
+                chapters.append({
+                    'number': chapter_num,
+                    'verse_count': len(verses),
+                    'verses': verses
+                })
+
+    return {
+        'name': book_name,
+        'testament': testament,
+        'order': order,
+        'abbreviation': abbreviation,
+        'chapter_count': len(chapters),
+        'chapters': chapters
+    }
+
+
+def iter_normalized_books(path: str, read_size: int = READ_SIZE):
+    """Yield the books of the source at `path` in the loader shape."""
+    for order, book_entry in enumerate(iter_source_books(path, read_size), 1):
+        yield normalize_book(book_entry, order)
+
+
+def prepare_source(path: str, spool: str) -> dict:
+    """
+    Parse and normalise the source at `path` into the `spool` file, one
+    pickled book after the other. Runs in a worker process; returns the
+    counts and duration.
+    """
+    started = time.perf_counter()
+    books = verses = 0
+    with open(spool, 'wb') as f:
+        for book in iter_normalized_books(path):
+            pickle.dump(book, f, pickle.HIGHEST_PROTOCOL)
+            books += 1
+            verses += sum(len(chapter['verses']) for chapter in book['chapters'])
+    return {'spool': spool, 'books': books, 'verses': verses, 'seconds': time.perf_counter() - started}
+
+
+def iter_prepared_books(spool: str):
+    """Yield the books written by `prepare_source`."""
+    with open(spool, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
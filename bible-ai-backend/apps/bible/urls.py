@@ -3,7 +3,7 @@ Bible URL configuration.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BookViewSet, ChapterViewSet, VerseViewSet
+from .views import BookViewSet, ChapterViewSet, VerseViewSet, ReferenceResolveView, VersionListView, ExportView, BundleViewSet
 
 app_name = 'bible'
 
@@ -11,7 +11,11 @@ router = DefaultRouter()
 router.register(r'books', BookViewSet, basename='book')
 router.register(r'chapters', ChapterViewSet, basename='chapter')
 router.register(r'verses', VerseViewSet, basename='verse')
+router.register(r'bundles', BundleViewSet, basename='bundle')
 
 urlpatterns = [
+    path('resolve/', ReferenceResolveView.as_view(), name='resolve'),
+    path('versions/', VersionListView.as_view(), name='versions'),
+    path('export/', ExportView.as_view(), name='export'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,24 +1,147 @@
 """
 Bible views for API endpoints.
 """
+import gzip
+import re
+
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from django.db.models import Q
+from rest_framework.views import APIView
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import add_never_cache_headers, patch_cache_control, patch_vary_headers
+from django.utils.dateparse import parse_date
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
-from .models import Book, Chapter, Verse
+from .models import Book, Chapter, Verse, CorpusBundle
 from .serializers import (
     BookSerializer,
     BookListSerializer,
+    BookTextSerializer,
     ChapterSerializer,
     ChapterListSerializer,
-    VerseSerializer
+    VerseSerializer,
+    VerseBatchSerializer,
+    CorpusBundleSerializer,
+    VERSE_ROW_FIELDS,
+    verse_row
+)
+from .caching import conditional_corpus_response, immutable_response
+from .pagination import SearchResultsPagination, VersePagination
+from .renderers import BibleJSONRenderer
+from .services import (
+    get_corpus,
+    corpus_enabled,
+    available_versions,
+    default_version,
+    get_search_backend
+)
+from .services.bundles import bundle_delta, latest_bundles
+from .services.export import EXPORT_FORMATS, export_stream
+from .services.lookup import (
+    daily_verse,
+    parallel_chapter,
+    random_verse,
+    resolve_references,
+    seconds_until_midnight,
+    verse_span,
+    verses_by_ids
 )
+from .services.references import InvalidReference
+from .services.rendered import find_chapter_id, get_rendered
 
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+VERSION_PARAMETER = OpenApiParameter(
+    'version', OpenApiTypes.STR, description='Version biblique (version par défaut si absent)'
+)
 
-class BookViewSet(viewsets.ReadOnlyModelViewSet):
+
+def get_requested_version(request):
+    """The `?version=` requested (the default version if none), or a 404."""
+    version = request.query_params.get('version')
+    if not version:
+        return default_version()
+    if version not in dict(available_versions()):
+        raise Http404(f"Version inconnue : {version}")
+    return version
+
+
+class CorpusReadMixin:
+    """
+    Serve list/retrieve from the in-memory corpus instead of the database.
+    
+    Full-text `?search=` requests keep going through the ORM filter backends.
+    """
+    renderer_classes = [BibleJSONRenderer]
+    
+    def use_corpus(self):
+        return corpus_enabled() and 'search' not in self.request.query_params
+    
+    def get_int_param(self, name):
+        """Read an optional integer query parameter."""
+        value = self.request.query_params.get(name, None)
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({name: 'Un nombre entier est requis.'})
+    
+    def get_version(self):
+        return get_requested_version(self.request)
+    
+    def get_lookup_index(self, index):
+        """Resolve the URL pk to a corpus index or raise a 404."""
+        try:
+            idx = index.get(int(self.kwargs[self.lookup_field]))
+        except (TypeError, ValueError):
+            idx = None
+        
+        if idx is None:
+            model_name = self.queryset.model._meta.object_name
+            raise Http404(f"No {model_name} matches the given query.")
+        return idx
+    
+    def corpus_list_response(self, rows):
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(rows))
+    
+    def get_pk(self):
+        """Return the URL pk as an integer or raise a 404."""
+        try:
+            return int(self.kwargs[self.lookup_field])
+        except (TypeError, ValueError):
+            model_name = self.queryset.model._meta.object_name
+            raise Http404(f"No {model_name} matches the given query.")
+    
+    def rendered_response(self, endpoint, *params):
+        """Serve a cached pre-rendered payload (see services.rendered)."""
+        payload = get_rendered(endpoint, *params)
+        if payload is None:
+            model_name = self.queryset.model._meta.object_name
+            raise Http404(f"No {model_name} matches the given query.")
+        return self.json_bytes_response(payload.content, payload.gzipped)
+    
+    def json_bytes_response(self, content, gzipped=None):
+        """Return an already rendered JSON payload as is, gzipped if accepted."""
+        response = HttpResponse(content_type='application/json')
+        if gzipped is not None:
+            patch_vary_headers(response, ('Accept-Encoding',))
+            if ACCEPTS_GZIP.search(self.request.META.get('HTTP_ACCEPT_ENCODING', '')):
+                response['Content-Encoding'] = 'gzip'
+                content = gzipped
+        response.content = content
+        return response
+
+
+class BookViewSet(CorpusReadMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for biblical books."""
     queryset = Book.objects.all()
     permission_classes = [AllowAny]
@@ -31,19 +154,56 @@ class BookViewSet(viewsets.ReadOnlyModelViewSet):
         return BookSerializer
     
     @extend_schema(tags=['Bible'], summary="Liste des livres bibliques")
+    @conditional_corpus_response
     def list(self, request, *args, **kwargs):
+        if self.use_corpus():
+            return self.corpus_list_response(get_corpus().books_slice())
         return super().list(request, *args, **kwargs)
     
     @extend_schema(tags=['Bible'], summary="Détails d'un livre")
+    @conditional_corpus_response
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        return self.rendered_response('book', self.get_pk())
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Texte complet d'un chapitre",
+        description="Tous les versets d'un chapitre en une seule requête, sans pagination.",
+        parameters=[VERSION_PARAMETER],
+        responses={200: ChapterSerializer}
+    )
+    @action(detail=True, methods=['get'], url_path=r'chapters/(?P<chapter_number>\d+)/text')
+    @conditional_corpus_response
+    def chapter_text(self, request, pk=None, chapter_number=None):
+        """Return every verse of a chapter addressed by book and chapter number."""
+        book_id = self.get_pk()
+        chapter_id = find_chapter_id(book_id, int(chapter_number))
+        if chapter_id is None:
+            model = 'Chapter' if get_rendered('book', book_id) else 'Book'
+            raise Http404(f"No {model} matches the given query.")
+        return self.rendered_response('chapter', self.get_version(), chapter_id)
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Texte complet d'un livre",
+        description="Tous les chapitres et versets d'un livre en une seule requête, sans pagination.",
+        parameters=[VERSION_PARAMETER],
+        responses={200: BookTextSerializer}
+    )
+    @action(detail=True, methods=['get'], url_path='text')
+    @conditional_corpus_response
+    def text(self, request, pk=None):
+        """Return a whole book, chapter by chapter."""
+        return self.rendered_response('book-text', self.get_version(), self.get_pk())
 
 
-class ChapterViewSet(viewsets.ReadOnlyModelViewSet):
+class ChapterViewSet(CorpusReadMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for chapters."""
     queryset = Chapter.objects.select_related('book').all()
     permission_classes = [AllowAny]
     
+    max_parallel_versions = 10
+    
     def get_serializer_class(self):
         if self.action == 'list':
             return ChapterListSerializer
@@ -51,9 +211,9 @@ class ChapterViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_queryset(self):
         queryset = super().get_queryset()
-        book_id = self.request.query_params.get('book', None)
+        book_id = self.get_int_param('book')
         
-        if book_id:
+        if book_id is not None:
             queryset = queryset.filter(book_id=book_id)
         
         return queryset
@@ -65,31 +225,77 @@ class ChapterViewSet(viewsets.ReadOnlyModelViewSet):
             OpenApiParameter('book', OpenApiTypes.INT, description='Filtrer par livre')
         ]
     )
+    @conditional_corpus_response
     def list(self, request, *args, **kwargs):
+        if self.use_corpus():
+            rows = get_corpus().chapters_slice(book_id=self.get_int_param('book'))
+            return self.corpus_list_response(rows)
         return super().list(request, *args, **kwargs)
     
-    @extend_schema(tags=['Bible'], summary="Détails d'un chapitre")
+    @extend_schema(tags=['Bible'], summary="Détails d'un chapitre", parameters=[VERSION_PARAMETER])
+    @conditional_corpus_response
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        return self.rendered_response('chapter', self.get_version(), self.get_pk())
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Chapitre en versions parallèles",
+        description=(
+            "Versets du chapitre alignés par clé canonique dans plusieurs versions. "
+            "Une version sans le verset donne null ; un verset suivi d'une lacune "
+            "de sa version (versets fusionnés) porte `through` (dernier numéro couvert)."
+        ),
+        parameters=[
+            OpenApiParameter('versions', OpenApiTypes.STR, description='Versions séparées par des virgules (toutes par défaut)')
+        ]
+    )
+    @action(detail=True, methods=['get'])
+    @conditional_corpus_response
+    def parallel(self, request, pk=None):
+        """Return the chapter's verses aligned across versions."""
+        loaded = [version for version, _ in available_versions()]
+        requested = request.query_params.get('versions', '')
+        versions = list(dict.fromkeys(
+            version.strip() for version in requested.split(',') if version.strip()
+        )) or loaded
+        
+        if len(versions) > self.max_parallel_versions:
+            raise ValidationError({'versions': f'Au plus {self.max_parallel_versions} versions.'})
+        unknown = [version for version in versions if version not in loaded]
+        if unknown:
+            raise Http404(f"Version inconnue : {', '.join(unknown)}")
+        
+        chapter, verses = parallel_chapter(self.get_pk(), versions)
+        if chapter is None:
+            raise Http404("No Chapter matches the given query.")
+        return Response({**chapter, 'versions': versions, 'verses': verses})
 
 
-class VerseViewSet(viewsets.ReadOnlyModelViewSet):
+class VerseViewSet(CorpusReadMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for verses."""
-    queryset = Verse.objects.select_related('chapter__book').all()
+    queryset = Verse.objects.select_related('book').defer('search_vector')
     serializer_class = VerseSerializer
     permission_classes = [AllowAny]
     filter_backends = [filters.SearchFilter]
     search_fields = ['text']
+    pagination_class = VersePagination
+    
+    # Au-delà, l'intervalle doit être demandé en flux (stream=true)
+    max_range_verses = 2000
     
     def get_queryset(self):
         queryset = super().get_queryset()
         
-        book_id = self.request.query_params.get('book', None)
-        if book_id:
-            queryset = queryset.filter(chapter__book_id=book_id)
+        # Les identifiants sont uniques toutes versions confondues
+        if self.action != 'retrieve':
+            queryset = queryset.filter(version=self.get_version())
         
-        chapter_id = self.request.query_params.get('chapter', None)
-        if chapter_id:
+        book_id = self.get_int_param('book')
+        if book_id is not None:
+            queryset = queryset.filter(book_id=book_id)
+        
+        chapter_id = self.get_int_param('chapter')
+        if chapter_id is not None:
             queryset = queryset.filter(chapter_id=chapter_id)
         
         return queryset
@@ -99,24 +305,62 @@ class VerseViewSet(viewsets.ReadOnlyModelViewSet):
         summary="Liste des versets",
         parameters=[
             OpenApiParameter('book', OpenApiTypes.INT, description='Filtrer par livre'),
-            OpenApiParameter('chapter', OpenApiTypes.INT, description='Filtrer par chapitre')
+            OpenApiParameter('chapter', OpenApiTypes.INT, description='Filtrer par chapitre'),
+            VERSION_PARAMETER,
+            OpenApiParameter(
+                'cursor', OpenApiTypes.STR,
+                description=(
+                    "Pagination par curseur (vide pour la première page) : "
+                    "réponse {next, results}, sans comptage"
+                )
+            ),
+            OpenApiParameter('page_size', OpenApiTypes.INT, description='Versets par page avec curseur (max 200)')
         ]
     )
+    @conditional_corpus_response
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        if self.use_corpus():
+            rows = get_corpus(self.get_version()).verses_slice(
+                book_id=self.get_int_param('book'),
+                chapter_id=self.get_int_param('chapter')
+            )
+            return self.corpus_list_response(rows)
+        
+        # Chemin rapide : tuples values_list() au lieu d'instances + serializer ;
+        # verse_key en tête sert de position à la pagination par curseur
+        queryset = self.filter_queryset(self.get_queryset()).values_list('verse_key', *VERSE_ROW_FIELDS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response([verse_row(values[1:]) for values in page])
+        return Response([verse_row(values[1:]) for values in queryset])
     
     @extend_schema(tags=['Bible'], summary="Détails d'un verset")
+    @conditional_corpus_response
     def retrieve(self, request, *args, **kwargs):
+        if self.use_corpus():
+            rows, _ = verses_by_ids([self.get_pk()])
+            if not rows:
+                raise Http404("No Verse matches the given query.")
+            return Response(rows[0])
         return super().retrieve(request, *args, **kwargs)
     
     @extend_schema(
         tags=['Bible'],
         summary="Rechercher des versets",
+        description=(
+            "Recherche plein texte insensible à la casse et aux accents. "
+            "Les termes sont combinés en ET ; utilisez OR pour une alternative "
+            "et des guillemets pour une expression exacte."
+        ),
         parameters=[
-            OpenApiParameter('q', OpenApiTypes.STR, required=True, description='Texte à rechercher (min 3 caractères)')
+            OpenApiParameter('q', OpenApiTypes.STR, required=True, description='Texte à rechercher (min 3 caractères)'),
+            VERSION_PARAMETER,
+            OpenApiParameter('page', OpenApiTypes.INT, description='Numéro de page'),
+            OpenApiParameter('page_size', OpenApiTypes.INT, description='Résultats par page (max 200)')
         ]
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], pagination_class=SearchResultsPagination)
+    @conditional_corpus_response
     def search(self, request):
         """Search verses by text content."""
         query = request.query_params.get('q', '')
@@ -126,11 +370,370 @@ class VerseViewSet(viewsets.ReadOnlyModelViewSet):
                 'error': 'La recherche doit contenir au moins 3 caractères.'
             }, status=400)
         
-        verses = self.queryset.filter(text__icontains=query)[:50]
-        serializer = self.get_serializer(verses, many=True)
+        backend = get_search_backend()
+        page = backend.serialize_page(
+            self.paginate_queryset(backend.search(query, self.get_version()))
+        )
         
         return Response({
-            'count': len(serializer.data),
+            'count': self.paginator.page.paginator.count,
             'query': query,
-            'results': serializer.data
-        })
\ No newline at end of file
+            'next': self.paginator.get_next_link(),
+            'previous': self.paginator.get_previous_link(),
+            'results': page
+        })
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Récupérer plusieurs versets en une requête",
+        description=(
+            "Accepte jusqu'à 1000 identifiants et/ou des références. En GET : "
+            "`?ids=1,2,3&refs=Jean 3:16;Ps 23`. En POST : `{\"ids\": [...], \"refs\": [...]}`. "
+            "Les versets sont renvoyés dans l'ordre des identifiants demandés."
+        ),
+        parameters=[
+            OpenApiParameter('ids', OpenApiTypes.STR, description='Identifiants séparés par des virgules'),
+            OpenApiParameter('refs', OpenApiTypes.STR, description='Références séparées par « ; »'),
+            OpenApiParameter('version', OpenApiTypes.STR, description='Version des références (les identifiants valent pour toutes)')
+        ],
+        request=VerseBatchSerializer
+    )
+    @action(detail=False, methods=['get', 'post'])
+    @conditional_corpus_response
+    def batch(self, request):
+        """Hydrate many verses (bookmarks, highlights...) in a single lookup."""
+        if request.method == 'GET':
+            params = request.query_params
+            data = {
+                'ids': [value for value in params.get('ids', '').split(',') if value.strip()],
+                'refs': [params['refs']] if params.get('refs', '').strip() else [],
+            }
+        else:
+            data = request.data
+        
+        serializer = VerseBatchSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        ids, refs = serializer.validated_data['ids'], serializer.validated_data['refs']
+        
+        results, not_found = verses_by_ids(ids) if ids else ([], [])
+        
+        references = []
+        if refs:
+            try:
+                resolved = resolve_references(
+                    ';'.join(refs), ReferenceResolveView.max_verses, self.get_version()
+                )
+            except InvalidReference as e:
+                return Response({'error': str(e), 'refs': refs}, status=400)
+            references = [
+                {'reference': reference, 'verses': verses}
+                for reference, verses in resolved
+            ]
+        
+        return Response({
+            'count': len(results),
+            'results': results,
+            'not_found': not_found,
+            'references': references,
+        })
+
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Verset aléatoire",
+        parameters=[
+            OpenApiParameter('testament', OpenApiTypes.STR, enum=['OT', 'NT'], description='Limiter à un testament'),
+            OpenApiParameter('book', OpenApiTypes.INT, description='Limiter à un livre'),
+            VERSION_PARAMETER
+        ],
+        responses={200: VerseSerializer}
+    )
+    @action(detail=False, methods=['get'])
+    def random(self, request):
+        """Return a verse drawn uniformly, optionally within a testament or book."""
+        testament = request.query_params.get('testament') or None
+        if testament is not None and testament not in dict(Book.TESTAMENT_CHOICES):
+            raise ValidationError({'testament': 'Valeur attendue : OT ou NT.'})
+        
+        verse = random_verse(
+            testament=testament, book_id=self.get_int_param('book'), version=self.get_version()
+        )
+        if verse is None:
+            raise Http404("No Verse matches the given query.")
+        
+        response = Response(verse)
+        add_never_cache_headers(response)
+        return response
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Verset du jour",
+        description="Le même verset pour tous pendant la journée (fuseau du serveur).",
+        parameters=[
+            OpenApiParameter('date', OpenApiTypes.DATE, description="Jour voulu (par défaut aujourd'hui)"),
+            VERSION_PARAMETER
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    def daily(self, request):
+        """Return the deterministic verse of the day."""
+        day = timezone.localdate()
+        if request.query_params.get('date'):
+            try:
+                day = parse_date(request.query_params['date'])
+            except ValueError:
+                day = None
+            if day is None:
+                raise ValidationError({'date': 'Date invalide (format AAAA-MM-JJ).'})
+        
+        verse = daily_verse(day, self.get_version())
+        if verse is None:
+            raise Http404("No Verse matches the given query.")
+        
+        response = Response({'date': day.isoformat(), 'verse': verse})
+        if 'date' not in request.query_params:
+            patch_cache_control(response, public=True, max_age=seconds_until_midnight())
+        return response
+
+    @extend_schema(
+        tags=['Bible'],
+        summary="Intervalle de versets",
+        description=(
+            "Tous les versets entre deux bornes, même sur plusieurs chapitres ou livres. "
+            "Chaque borne est une référence (Gn 1:1, Gn 2, Exode) ou une clé canonique "
+            "BBCCCVVV ; `to` peut omettre le livre (from=Gn 1:1&to=2:3). Au-delà de "
+            "2000 versets, utilisez stream=true."
+        ),
+        parameters=[
+            OpenApiParameter('from', OpenApiTypes.STR, required=True, description='Début, ex. « Gn 1:1 » ou 1001001'),
+            OpenApiParameter('to', OpenApiTypes.STR, description='Fin incluse (par défaut : from)'),
+            OpenApiParameter('stream', OpenApiTypes.BOOL, description='Réponse JSON envoyée en flux, sans limite'),
+            VERSION_PARAMETER
+        ]
+    )
+    @action(detail=False, methods=['get'], url_path='range')
+    @conditional_corpus_response
+    def span(self, request):
+        """Return a contiguous span of verses from a single key range scan."""
+        start_text = request.query_params.get('from', '')
+        end_text = request.query_params.get('to', '')
+        stream = request.query_params.get('stream', '').lower() in ('1', 'true', 'yes')
+        
+        try:
+            start_key, end_key, count, rows = verse_span(start_text, end_text, self.get_version())
+        except InvalidReference as e:
+            return Response({'error': str(e), 'from': start_text, 'to': end_text}, status=400)
+        
+        header = {
+            'from': start_text,
+            'to': end_text or start_text,
+            'start_key': start_key,
+            'end_key': end_key,
+            'count': count,
+        }
+        
+        if stream:
+            return StreamingHttpResponse(
+                self._stream_json(header, 'verses', rows),
+                content_type='application/json'
+            )
+        
+        if count > self.max_range_verses:
+            return Response({
+                'error': f'Trop de versets demandés (maximum {self.max_range_verses}). Utilisez stream=true.',
+                'count': count,
+            }, status=400)
+        
+        return Response({**header, 'verses': list(rows)})
+    
+    @staticmethod
+    def _stream_json(header, key, rows, chunk_size=500):
+        """Yield `header` with a `key` list of rows appended, a chunk at a time."""
+        renderer = BibleJSONRenderer()
+        yield renderer.render(header)[:-1] + f',"{key}":['.encode()
+        
+        chunk = []
+        separator = b''
+        for row in rows:
+            chunk.append(renderer.render(row))
+            if len(chunk) == chunk_size:
+                yield separator + b','.join(chunk)
+                chunk, separator = [], b','
+        if chunk:
+            yield separator + b','.join(chunk)
+        yield b']}'
+
+
+class ReferenceResolveView(APIView):
+    """Resolve textual references ("Jean 3:16-18; Ps 23") to verses."""
+    permission_classes = [AllowAny]
+    renderer_classes = [BibleJSONRenderer]
+    
+    # Garde-fou contre « Psaumes » ou une liste de livres entiers
+    max_verses = 1000
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Résoudre des références bibliques",
+        description=(
+            "Accepte les noms français, les abréviations (Gn, Jn, 1Co...), "
+            "les intervalles (Jean 3:16-18, Gn 1:1-2:3), les listes (Jean 3:16,18) "
+            "et plusieurs références séparées par « ; »."
+        ),
+        parameters=[
+            OpenApiParameter('ref', OpenApiTypes.STR, required=True, description='Références, ex. « Jean 3:16-18; Ps 23 »'),
+            VERSION_PARAMETER
+        ]
+    )
+    @conditional_corpus_response
+    def get(self, request):
+        text = request.query_params.get('ref', '')
+        
+        try:
+            resolved = resolve_references(text, self.max_verses, get_requested_version(request))
+        except InvalidReference as e:
+            return Response({'error': str(e), 'ref': text}, status=400)
+        
+        return Response({
+            'ref': text,
+            'count': sum(len(verses) for _, verses in resolved),
+            'passages': [
+                {'reference': reference, 'verses': verses}
+                for reference, verses in resolved if verses
+            ],
+            'not_found': [reference for reference, verses in resolved if not verses],
+        })
+
+
+class VersionListView(APIView):
+    """Loaded Bible versions."""
+    permission_classes = [AllowAny]
+    renderer_classes = [BibleJSONRenderer]
+    
+    @extend_schema(tags=['Bible'], summary="Versions disponibles")
+    @conditional_corpus_response
+    def get(self, request):
+        default = default_version()
+        return Response([
+            {'version': version, 'verse_count': count, 'default': version == default}
+            for version, count in available_versions()
+        ])
+
+
+class ExportView(APIView):
+    """Stream one version of the corpus as NDJSON or nested JSON."""
+    permission_classes = [AllowAny]
+    renderer_classes = [BibleJSONRenderer]
+    
+    content_types = {
+        'ndjson': 'application/x-ndjson',
+        'json': 'application/json',
+    }
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Exporter une version complète de la Bible",
+        description=(
+            "Flux livre → chapitre → versets, en NDJSON (une ligne par chapitre) "
+            "ou en JSON imbriqué ; compressé en gzip à la volée si le client l'accepte."
+        ),
+        parameters=[
+            OpenApiParameter('output', OpenApiTypes.STR, enum=list(EXPORT_FORMATS), description='Format (ndjson par défaut)'),
+            VERSION_PARAMETER
+        ]
+    )
+    @conditional_corpus_response
+    def get(self, request):
+        output = request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({'output': f"Formats possibles : {', '.join(EXPORT_FORMATS)}."})
+        
+        version = get_requested_version(request)
+        compress = bool(ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+        revision, chunks = export_stream(output, version, compress=compress)
+        
+        response = StreamingHttpResponse(chunks, content_type=self.content_types[output])
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        
+        filename = f"bible-r{revision}-{version}.{output}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class BundleViewSet(viewsets.ViewSet):
+    """Offline bundles: manifests, full content and deltas between bundles."""
+    permission_classes = [AllowAny]
+    renderer_classes = [BibleJSONRenderer]
+    lookup_field = 'digest'
+    lookup_value_regex = '[0-9a-f]{64}'
+    
+    def get_bundle(self, digest):
+        bundle = CorpusBundle.objects.filter(digest=digest).first()
+        if bundle is None:
+            raise Http404(f"Paquet inconnu : {digest}")
+        return bundle
+    
+    def gzip_bytes_response(self, gzipped, content_type):
+        """Return stored gzip bytes as is, or decompressed if not accepted."""
+        response = HttpResponse(content_type=content_type)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if ACCEPTS_GZIP.search(self.request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            response['Content-Encoding'] = 'gzip'
+            response.content = gzipped
+        else:
+            response.content = gzip.decompress(gzipped)
+        return response
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Paquets hors ligne disponibles",
+        description="Manifeste du paquet le plus récent de chaque version (empreinte SHA-256, tailles).",
+        parameters=[
+            OpenApiParameter('version', OpenApiTypes.STR, description='Filtrer par version')
+        ],
+        responses={200: CorpusBundleSerializer(many=True)}
+    )
+    def list(self, request):
+        bundles = latest_bundles(request.query_params.get('version') or None)
+        response = Response(CorpusBundleSerializer(bundles, many=True).data)
+        patch_cache_control(response, public=True, max_age=settings.BIBLE_HTTP_MAX_AGE)
+        return response
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Télécharger un paquet hors ligne",
+        description="Contenu NDJSON complet du paquet, immuable (adressé par son empreinte)."
+    )
+    def retrieve(self, request, digest=None):
+        return immutable_response(request, digest, lambda: self.gzip_bytes_response(
+            self.get_bundle(digest).content, 'application/x-ndjson'
+        ))
+    
+    @extend_schema(
+        tags=['Bible'],
+        summary="Delta entre deux paquets",
+        description=(
+            "Opérations reconstruisant ce paquet à partir du paquet `from` détenu "
+            "par le client : [début, nombre] copie des lignes, une liste de chaînes "
+            "insère de nouvelles lignes."
+        ),
+        parameters=[
+            OpenApiParameter('from', OpenApiTypes.STR, required=True, description='Empreinte du paquet détenu')
+        ]
+    )
+    @action(detail=True, methods=['get'])
+    def delta(self, request, digest=None):
+        base_digest = request.query_params.get('from', '')
+        if not re.fullmatch(self.lookup_value_regex, base_digest):
+            raise ValidationError({'from': 'Empreinte SHA-256 attendue.'})
+        
+        def make_response():
+            target = self.get_bundle(digest)
+            base = self.get_bundle(base_digest)
+            if base.version != target.version:
+                raise ValidationError({'from': 'Les deux paquets doivent être de la même version.'})
+            return self.gzip_bytes_response(bundle_delta(base, target), 'application/json')
+        
+        return immutable_response(request, f'{base_digest[:32]}{digest[:32]}', make_response)
@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party
     'rest_framework',
@@ -77,6 +78,14 @@ DATABASES = {
     'default': env.db('DATABASE_URL', default='sqlite:///db.sqlite3')
 }
 
+# Cache (mémoire locale par défaut, partagé entre workers avec CACHE_URL=redis://...)
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://bible')
+}
+if CACHES['default']['BACKEND'].endswith('LocMemCache'):
+    # Assez d'entrées pour tous les chapitres et livres pré-rendus
+    CACHES['default'].setdefault('OPTIONS', {})['MAX_ENTRIES'] = 5000
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -188,6 +197,32 @@ SPECTACULAR_SETTINGS = {
     ],
 }
 
+# Bible Corpus (index en mémoire pour les endpoints de lecture)
+BIBLE_CORPUS_IN_MEMORY = env.bool('BIBLE_CORPUS_IN_MEMORY', default=True)
+BIBLE_CORPUS_REFRESH_SECONDS = env.int('BIBLE_CORPUS_REFRESH_SECONDS', default=30)
+
+# Version servie sans ?version= ; si elle n'est pas chargée, la première chargée
+BIBLE_DEFAULT_VERSION = env('BIBLE_DEFAULT_VERSION', default='')
+
+# Moteur de recherche des versets : 'memory' (index inversé en mémoire),
+# 'postgres' (tsvector + pg_trgm) ou 'database' (sous-chaîne sans casse ni
+# accents sous SQLite/PostgreSQL, icontains ailleurs)
+BIBLE_SEARCH_BACKEND = env('BIBLE_SEARCH_BACKEND', default='memory')
+
+# Cache des réponses JSON pré-rendues (livres, chapitres), indexé par la
+# révision du corpus : un rechargement rend les anciennes entrées caduques
+BIBLE_RESPONSE_CACHE = env.bool('BIBLE_RESPONSE_CACHE', default=True)
+BIBLE_RESPONSE_CACHE_TIMEOUT = env.int('BIBLE_RESPONSE_CACHE_TIMEOUT', default=60 * 60 * 24)
+BIBLE_RESPONSE_CACHE_GZIP = env.bool('BIBLE_RESPONSE_CACHE_GZIP', default=True)
+
+# Cache HTTP (secondes) des réponses Bible ; revalidées ensuite par ETag
+BIBLE_HTTP_MAX_AGE = env.int('BIBLE_HTTP_MAX_AGE', default=300)
+
+# Paquets hors ligne : reconstruits après chaque chargement ; les derniers
+# sont conservés comme bases des deltas envoyés aux clients
+BIBLE_BUNDLE_AUTO_BUILD = env.bool('BIBLE_BUNDLE_AUTO_BUILD', default=True)
+BIBLE_BUNDLE_HISTORY = env.int('BIBLE_BUNDLE_HISTORY', default=10)
+
 # AI Configuration
 AI_PROVIDER = env('AI_PROVIDER', default='gemini')
 GEMINI_API_KEY = env('GEMINI_API_KEY', default='')
@@ -197,6 +232,33 @@ GEMINI_API_KEY = env('GEMINI_API_KEY', default='')
 AI_MAX_VERSES = 5
 AI_MODEL_GEMINI = 'gemini-2.5-flash'
 
+# Cache persistant des réponses IA, indexé par la question normalisée, le
+# modèle et la version du prompt ; entrées expirées après le TTL et les moins
+# récemment servies évincées au-delà de MAX_ENTRIES
+AI_ANSWER_CACHE = env.bool('AI_ANSWER_CACHE', default=True)
+AI_ANSWER_CACHE_TTL = env.int('AI_ANSWER_CACHE_TTL', default=60 * 60 * 24 * 30)
+AI_ANSWER_CACHE_MAX_ENTRIES = env.int('AI_ANSWER_CACHE_MAX_ENTRIES', default=5000)
+
+# Réutilisation de la réponse d'une question proche (similarité cosinus des
+# trigrammes TF-IDF, entre 0 et 1) ; index reconstruit par worker quand le
+# cache change, vérifié au plus toutes les REFRESH_SECONDS
+AI_ANSWER_SIMILARITY = env.bool('AI_ANSWER_SIMILARITY', default=True)
+AI_ANSWER_SIMILARITY_THRESHOLD = env.float('AI_ANSWER_SIMILARITY_THRESHOLD', default=0.75)
+AI_ANSWER_SIMILARITY_REFRESH_SECONDS = env.int('AI_ANSWER_SIMILARITY_REFRESH_SECONDS', default=30)
+
+# Une seule requête à Gemini pour une même question posée simultanément : les
+# autres attendent son résultat (au plus TIMEOUT secondes) ; entre workers, via
+# un verrou dans le cache Django (partagé seulement avec CACHE_URL, ex. Redis)
+AI_SINGLE_FLIGHT = env.bool('AI_SINGLE_FLIGHT', default=True)
+AI_SINGLE_FLIGHT_TIMEOUT = env.int('AI_SINGLE_FLIGHT_TIMEOUT', default=60)
+
+# Questions asynchrones (/ai/jobs/) : threads par worker web, tâches non
+# terminées acceptées par worker, et délai au-delà duquel une tâche perdue
+# (redémarrage) est marquée en échec
+AI_JOB_WORKERS = env.int('AI_JOB_WORKERS', default=4)
+AI_JOB_QUEUE_SIZE = env.int('AI_JOB_QUEUE_SIZE', default=32)
+AI_JOB_TIMEOUT = env.int('AI_JOB_TIMEOUT', default=300)
+
 
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
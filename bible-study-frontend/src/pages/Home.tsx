@@ -27,7 +27,7 @@ export const Home = () => {
   useEffect(() => {
     const loadVerseOfTheDay = async () => {
       try {
-        const verse = await bibleService.getRandomVerse();
+        const verse = await bibleService.getDailyVerse();
         setVerseOfTheDay(verse);
       } catch (error) {
         console.error('Error loading verse:', error);
@@ -98,7 +98,7 @@ export const Reader = () => {
       if (ch) {
         setSelectedChapter(ch);
         setView('reading');
-        loadVerses(selectedBook.id, ch.id);
+        loadVerses(selectedBook.id, (ch as any).number);
       }
     }
   }, [chapters]);
@@ -118,10 +118,10 @@ export const Reader = () => {
   };
 
   // ── Load verses ─────────────────────────────────────────────────────────────
-  const loadVerses = async (bookId: number, chapterId: number) => {
+  const loadVerses = async (bookId: number, chapterNumber: number) => {
     setLoading(true);
     try {
-      const data: any = await bibleService.getVerses(bookId, chapterId);
+      const data: any = await bibleService.getChapterVerses(bookId, chapterNumber);
       const list = Array.isArray(data) ? data : (data.results || []);
       setVerses(list);
     } catch (e) {
@@ -142,7 +142,7 @@ export const Reader = () => {
     setSelectedChapter(chapter);
     setView('reading');
     if (selectedBook) {
-      loadVerses(selectedBook.id, chapter.id);
+      loadVerses(selectedBook.id, (chapter as any).number);
     }
   };
 
@@ -27,6 +27,22 @@ const fetchAllPages = async <T>(url: string): Promise<T[]> => {
   return results;
 };
 
+// ─── Helper: parcourt une endpoint paginée par curseur (sans comptage) ───────
+const fetchAllCursorPages = async <T>(url: string, pageSize = 200): Promise<T[]> => {
+  let results: T[] = [];
+  const separator = url.includes('?') ? '&' : '?';
+  let next: string | null = `${url}${separator}cursor=&page_size=${pageSize}`;
+
+  // `next` est une URL absolue renvoyée par l'API (le curseur est opaque)
+  while (next) {
+    const response: { data: { results: T[]; next: string | null } } = await apiClient.get(next);
+    results = results.concat(response.data.results);
+    next = response.data.next;
+  }
+
+  return results;
+};
+
 export const bibleService = {
   // Récupère les 66 livres (paginated → on récupère tout)
   async getBooks(): Promise<Book[]> {
@@ -50,7 +66,15 @@ export const bibleService = {
       url += `?${params.join('&')}`;
     }
 
-    return fetchAllPages<Verse>(url);
+    return fetchAllCursorPages<Verse>(url);
+  },
+
+  // Récupère tous les versets d'un chapitre en une seule requête (sans pagination)
+  async getChapterVerses(bookId: number, chapterNumber: number): Promise<Verse[]> {
+    const response = await apiClient.get<{ verses: Verse[] }>(
+      `/bible/books/${bookId}/chapters/${chapterNumber}/text/`
+    );
+    return response.data.verses;
   },
 
   // Recherche de versets par mot-clé
@@ -61,18 +85,25 @@ export const bibleService = {
     return response.data;
   },
 
-  // Verset aléatoire — récupère la première page puis pioche au hasard
+  // Verset aléatoire — tiré au sort côté serveur parmi tout le corpus
   async getRandomVerse(): Promise<Verse | null> {
     try {
-      const response = await apiClient.get<{ results: Verse[] }>('/bible/verses/');
-      const verses = response.data.results;
-      if (verses.length === 0) return null;
-
-      const randomIndex = Math.floor(Math.random() * verses.length);
-      return verses[randomIndex];
+      const response = await apiClient.get<Verse>('/bible/verses/random/');
+      return response.data;
     } catch (error) {
       console.error('Error fetching random verse:', error);
       return null;
     }
   },
+
+  // Verset du jour — identique pour tous les utilisateurs pendant la journée
+  async getDailyVerse(): Promise<Verse | null> {
+    try {
+      const response = await apiClient.get<{ date: string; verse: Verse }>('/bible/verses/daily/');
+      return response.data.verse;
+    } catch (error) {
+      console.error('Error fetching daily verse:', error);
+      return null;
+    }
+  },
 };
\ No newline at end of file